@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Batch Excel to PDF conversion
+Converts every workbook in one or more directories or glob patterns across a
+bounded pool of worker processes, recording finished workbooks in a JSON
+manifest so an interrupted run can be resumed.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from excel_to_pdf import BACKENDS, convert_workbook
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+
+
+def find_workbooks(inputs):
+    """
+    Expand directories, glob patterns and file paths into a list of workbooks
+
+    Args:
+        inputs (list): Directories, glob patterns or Excel file paths
+
+    Returns:
+        list: Sorted, de-duplicated absolute paths of Excel files
+    """
+    found = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = [os.path.join(item, name) for name in os.listdir(item)]
+        else:
+            candidates = glob.glob(item, recursive=True)
+
+        for path in candidates:
+            name = os.path.basename(path)
+            # Skip Excel lock files such as ~$Report.xlsx
+            if name.lower().endswith(EXCEL_EXTENSIONS) and not name.startswith('~$') and os.path.isfile(path):
+                found.add(os.path.abspath(path))
+
+    return sorted(found)
+
+
+def file_signature(path):
+    """Size and modification time identifying one version of a file"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class JobManifest:
+    """
+    JSON record of the workbooks a batch run has finished
+    """
+
+    def __init__(self, manifest_path):
+        """
+        Load an existing manifest or start a new one
+
+        Args:
+            manifest_path (str): Path of the JSON manifest file
+        """
+        self.manifest_path = manifest_path
+        self.workbooks = {}
+
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                self.workbooks = json.load(f).get('workbooks', {})
+
+    def is_done(self, workbook_path):
+        """Check whether this exact version of a workbook was already converted"""
+        entry = self.workbooks.get(workbook_path)
+        return entry is not None and entry['signature'] == file_signature(workbook_path)
+
+    def mark_done(self, workbook_path, result):
+        """Record a converted workbook and save the manifest immediately"""
+        self.workbooks[workbook_path] = {
+            'signature': file_signature(workbook_path),
+            'output_dir': result['output_dir'],
+            'sheets': [{'sheet': sheet, 'pdf': pdf} for sheet, pdf in zip(result['sheets'], result['pdfs'])],
+            'rows': result['rows'],
+            'seconds': round(result['seconds'], 3),
+            'completed': time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self.save()
+
+    def save(self):
+        """Write the manifest atomically so a crash never leaves it half-written"""
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'workbooks': self.workbooks}, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+
+def _output_dirs(workbooks, output_dir):
+    """Give each workbook its own output subdirectory, named after the file"""
+    dirs = {}
+    used = set()
+    for path in workbooks:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name = stem
+        counter = 1
+        while name in used:
+            name = f"{stem}_{counter}"
+            counter += 1
+        used.add(name)
+        dirs[path] = os.path.join(output_dir, name)
+    return dirs
+
+
+def convert_job(workbook_path, output_dir, backend, cache_dir):
+    """
+    Convert one workbook in a worker process, keeping its per-sheet output quiet
+
+    Returns:
+        dict: convert_workbook details plus 'output_dir', 'seconds' and the
+            'errors' printed while converting
+    """
+    start = time.perf_counter()
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        result = convert_workbook(workbook_path, output_dir, backend=backend,
+                                  cache_dir=cache_dir, overwrite=True)
+    result['output_dir'] = output_dir
+    result['seconds'] = time.perf_counter() - start
+    result['errors'] = [line for line in log.getvalue().splitlines() if line.startswith("✗")]
+    return result
+
+
+def convert_directory(inputs, output_dir, backend='canvas', workers=None, manifest_path=None,
+                      cache_dir=None):
+    """
+    Convert many workbooks to PDF across a pool of worker processes
+
+    Workbooks already listed in the manifest with the same size and
+    modification time are skipped. A workbook is only listed once all of its
+    sheets converted. Sheets are also cached by content, so a workbook that
+    was interrupted or had failed sheets only renders the sheets it had not
+    finished.
+
+    Args:
+        inputs (list): Directories, glob patterns or Excel file paths
+        output_dir (str): Root directory; each workbook gets a subdirectory
+        backend (str): Conversion backend name (see excel_to_pdf.BACKENDS)
+        workers (int): Number of worker processes (default: CPU count)
+        manifest_path (str): Job manifest path (default: <output_dir>/batch_manifest.json)
+        cache_dir (str): Sheet cache directory (default: <output_dir>/.pdf_cache)
+
+    Returns:
+        dict: Throughput summary with files, sheets, rows, failures and seconds
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = JobManifest(manifest_path or os.path.join(output_dir, 'batch_manifest.json'))
+    cache_dir = cache_dir or os.path.join(output_dir, '.pdf_cache')
+
+    workbooks = find_workbooks(inputs)
+    pending = [path for path in workbooks if not manifest.is_done(path)]
+    output_dirs = _output_dirs(workbooks, output_dir)
+
+    print(f"Found {len(workbooks)} workbooks, {len(workbooks) - len(pending)} already converted")
+
+    summary = {'files': 0, 'sheets': 0, 'rows': 0, 'failed': 0, 'seconds': 0.0}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(convert_job, path, output_dirs[path], backend, cache_dir): path
+            for path in pending
+        }
+
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                summary['failed'] += 1
+                print(f"✗ Error converting {os.path.basename(path)}: {str(e)}")
+                continue
+
+            summary['sheets'] += len(result['sheets'])
+            summary['rows'] += result['rows']
+
+            # A workbook with failed sheets stays pending so the next run retries
+            # it; its finished sheets then come from the sheet cache
+            if result['errors']:
+                summary['failed'] += 1
+                print(f"✗ {os.path.basename(path)}: {len(result['errors'])} sheets failed, "
+                      f"{len(result['sheets'])} converted in {result['seconds']:.2f}s")
+                for error in result['errors']:
+                    print(f"    {error}")
+                continue
+
+            manifest.mark_done(path, result)
+            summary['files'] += 1
+            print(f"✓ {os.path.basename(path)}: {len(result['sheets'])} sheets, "
+                  f"{result['rows']:,} rows in {result['seconds']:.2f}s")
+
+    summary['seconds'] = time.perf_counter() - start
+    elapsed = max(summary['seconds'], 1e-9)
+
+    print(f"\nConverted {summary['files']} files, {summary['sheets']} sheets, "
+          f"{summary['rows']:,} rows in {summary['seconds']:.2f}s")
+    print(f"Throughput: {summary['files'] / elapsed:.2f} files/s, "
+          f"{summary['sheets'] / elapsed:.2f} sheets/s, {summary['rows'] / elapsed:,.0f} rows/s")
+    if summary['failed']:
+        print(f"Failed: {summary['failed']} files (they will be retried on the next run)")
+
+    return summary
+
+
+def main():
+    """Command line entry point for batch conversion"""
+    parser = argparse.ArgumentParser(description="Convert a directory or glob of Excel files to PDF")
+    parser.add_argument("inputs", nargs="+", help="Directories, glob patterns or Excel files")
+    parser.add_argument("-o", "--output-dir", default="pdf_output", help="Root output directory")
+    parser.add_argument("-b", "--backend", default="canvas", choices=sorted(BACKENDS),
+                        help="Conversion backend")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--manifest", default=None, help="Job manifest path")
+    parser.add_argument("--cache-dir", default=None, help="Sheet cache directory")
+    args = parser.parse_args()
+
+    print("Batch Excel to PDF Converter")
+    print("=" * 50)
+
+    convert_directory(args.inputs, args.output_dir, backend=args.backend, workers=args.workers,
+                      manifest_path=args.manifest, cache_dir=args.cache_dir)
+
+
+if __name__ == "__main__":
+    main()
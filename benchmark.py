@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for PyTools
+Generates workbooks and PDF corpora of a configurable size, times the Excel
+converters and the PDF merge and split operations, and writes wall time, peak
+memory and throughput to a JSON file that can be compared across commits.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+# Benchmark case -> (module, function, unit of work)
+CASES = {
+    'excel_to_pdf_matplotlib': ('excel_to_pdf', 'excel_to_pdf_matplotlib', 'rows'),
+    'excel_to_pdf_reportlab': ('excel_to_pdf', 'excel_to_pdf_reportlab', 'rows'),
+    'excel_to_pdf_canvas': ('excel_to_pdf', 'excel_to_pdf_canvas', 'rows'),
+    'merge_pdfs': ('pdf_operations', 'merge_pdfs', 'pages'),
+    'split_pdf': ('pdf_operations', 'split_pdf', 'pages'),
+    'split_pdfs': ('pdf_operations', 'split_pdfs', 'pages'),
+}
+
+# A regression is reported when a case gets this much slower than the baseline
+REGRESSION_THRESHOLD = 0.10
+
+
+def generate_workbook(path, rows, cols, sheets, seed=0):
+    """
+    Write a workbook of random mixed-type data
+
+    Columns cycle through integers, floats, short text and dates, like a
+    typical export.
+
+    Args:
+        path (str): Path of the .xlsx file to create
+        rows (int): Data rows per sheet
+        cols (int): Columns per sheet
+        sheets (int): Number of sheets
+        seed (int): Random seed, so runs with the same sizes get the same data
+
+    Returns:
+        str: Path of the created workbook
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    words = np.array(['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel'])
+
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for sheet in range(sheets):
+            data = {}
+            for col in range(cols):
+                kind = col % 4
+                if kind == 0:
+                    data[f'Id_{col}'] = rng.integers(0, 1_000_000, rows)
+                elif kind == 1:
+                    data[f'Amount_{col}'] = rng.normal(1000, 250, rows).round(2)
+                elif kind == 2:
+                    data[f'Name_{col}'] = rng.choice(words, rows)
+                else:
+                    data[f'Date_{col}'] = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D')
+            pd.DataFrame(data).to_excel(writer, sheet_name=f'Sheet_{sheet + 1}', index=False)
+
+    return path
+
+
+def generate_pdf_corpus(directory, files, pages):
+    """
+    Write a set of text PDFs for the merge and split benchmarks
+
+    Args:
+        directory (str): Directory to write the PDFs to
+        files (int): Number of PDF files
+        pages (int): Pages per file
+
+    Returns:
+        list: Paths of the created PDF files
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for file_index in range(files):
+        path = os.path.join(directory, f'document_{file_index + 1:04d}.pdf')
+        pdf_canvas = canvas.Canvas(path, pagesize=A4)
+        for page in range(pages):
+            pdf_canvas.setFont('Helvetica-Bold', 16)
+            pdf_canvas.drawString(72, 770, f'Document {file_index + 1}, page {page + 1}')
+            pdf_canvas.setFont('Helvetica', 10)
+            for line in range(40):
+                pdf_canvas.drawString(72, 740 - line * 16,
+                                      f'Line {line + 1}: the quick brown fox jumps over the lazy dog {page * 40 + line}')
+            pdf_canvas.showPage()
+        pdf_canvas.save()
+        paths.append(path)
+    return paths
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported"""
+    # ru_maxrss survives exec, so a child started from a big parent would
+    # report the parent's peak; VmHWM starts afresh with the new program
+    try:
+        with open('/proc/self/status', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_case(case, inputs, output_dir):
+    """
+    Run one benchmark case in this process and report its measurements
+
+    Called in a fresh interpreter per run, so peak RSS covers only this case.
+
+    Args:
+        case (str): Name from CASES
+        inputs (dict): 'workbook', 'pdfs' and the sizes they were generated with
+        output_dir (str): Directory for the case's output files
+
+    Returns:
+        dict: wall_seconds, peak_rss_mb, baseline_rss_mb, items and output_bytes
+    """
+    module_name, function_name, unit = CASES[case]
+    function = getattr(__import__(module_name), function_name)
+    baseline_rss = _peak_rss_mb()
+
+    log = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        if unit == 'rows':
+            outputs = function(inputs['workbook'], output_dir)
+            items = inputs['rows'] * inputs['sheets']
+        elif case == 'merge_pdfs':
+            outputs = [function(inputs['pdfs'], output_dir)]
+            items = inputs['pages'] * inputs['files']
+        elif case == 'split_pdfs':
+            # Peak RSS covers the coordinating process, not its workers
+            summary = function(inputs['pdfs'], output_dir)
+            outputs = [path for paths in summary['files'].values() for path in paths]
+            items = inputs['pages'] * inputs['files']
+        else:
+            outputs = []
+            for path in inputs['pdfs']:
+                outputs.extend(function(path, output_dir))
+            items = inputs['pages'] * inputs['files']
+    wall_seconds = time.perf_counter() - start
+
+    output_bytes = 0
+    for root, _, filenames in os.walk(output_dir):
+        output_bytes += sum(os.path.getsize(os.path.join(root, name)) for name in filenames)
+
+    errors = [line for line in log.getvalue().splitlines() if line.startswith(('✗', 'Error'))]
+    return {
+        'wall_seconds': wall_seconds,
+        'peak_rss_mb': _peak_rss_mb(),
+        'baseline_rss_mb': baseline_rss,
+        'items': items,
+        'outputs': len([path for path in outputs if path]),
+        'output_bytes': output_bytes,
+        'errors': errors,
+    }
+
+
+def _measure(case, inputs, work_dir, run):
+    """Run a case in a fresh interpreter and return its measurements"""
+    output_dir = os.path.join(work_dir, 'out', f'{case}_{run}')
+    os.makedirs(output_dir, exist_ok=True)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--run-case', case,
+         '--inputs', json.dumps(inputs), '--output-dir', output_dir],
+        cwd=here, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _git_commit():
+    """Short hash of the checked-out commit, or None outside a git checkout"""
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                   cwd=os.path.dirname(os.path.abspath(__file__)),
+                                   capture_output=True, text=True)
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def run_benchmarks(cases=None, rows=1000, cols=8, sheets=3, files=20, pages=25, repeat=3,
+                   work_dir=None):
+    """
+    Generate inputs and run the benchmark cases
+
+    Each run of each case happens in a fresh interpreter. The fastest run's
+    wall time and the highest peak RSS across runs are reported.
+
+    Args:
+        cases (list): Names from CASES to run (default: all)
+        rows (int): Data rows per generated sheet
+        cols (int): Columns per generated sheet
+        sheets (int): Sheets in the generated workbook
+        files (int): PDF files in the generated corpus
+        pages (int): Pages per generated PDF
+        repeat (int): Runs per case
+        work_dir (str): Directory for generated inputs and outputs (default: a
+            temporary directory that is removed afterwards)
+
+    Returns:
+        dict: Run metadata, configuration and one result per case
+    """
+    cases = cases or list(CASES)
+    config = {'rows': rows, 'cols': cols, 'sheets': sheets, 'files': files, 'pages': pages}
+
+    with contextlib.ExitStack() as stack:
+        if work_dir is None:
+            work_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix='pytools_bench_'))
+        os.makedirs(work_dir, exist_ok=True)
+
+        inputs = dict(config)
+        if any(CASES[case][2] == 'rows' for case in cases):
+            print(f"Generating workbook: {sheets} sheets x {rows:,} rows x {cols} columns...")
+            inputs['workbook'] = generate_workbook(os.path.join(work_dir, 'benchmark.xlsx'),
+                                                   rows, cols, sheets)
+        if any(CASES[case][2] == 'pages' for case in cases):
+            print(f"Generating PDF corpus: {files} files x {pages} pages...")
+            inputs['pdfs'] = generate_pdf_corpus(os.path.join(work_dir, 'corpus'), files, pages)
+
+        results = []
+        for case in cases:
+            try:
+                runs = [_measure(case, inputs, work_dir, run) for run in range(repeat)]
+            except RuntimeError as e:
+                print(f"✗ {case}: {str(e)}")
+                results.append({'case': case, 'error': str(e)})
+                continue
+
+            best = min(runs, key=lambda run: run['wall_seconds'])
+            unit = CASES[case][2]
+            peak_rss = [run['peak_rss_mb'] for run in runs if run['peak_rss_mb'] is not None]
+            result = {
+                'case': case,
+                'wall_seconds': round(best['wall_seconds'], 4),
+                'wall_seconds_runs': [round(run['wall_seconds'], 4) for run in runs],
+                'peak_rss_mb': round(max(peak_rss), 1) if peak_rss else None,
+                'baseline_rss_mb': round(best['baseline_rss_mb'], 1) if best['baseline_rss_mb'] else None,
+                'items': best['items'],
+                'unit': unit,
+                'throughput': round(best['items'] / max(best['wall_seconds'], 1e-9), 1),
+                'output_bytes': best['output_bytes'],
+                'errors': best['errors'],
+            }
+            results.append(result)
+
+            rss = f"{result['peak_rss_mb']:.0f} MB" if result['peak_rss_mb'] is not None else "n/a"
+            print(f"✓ {case}: {result['wall_seconds']:.2f}s, {result['throughput']:,.0f} {unit}/s, "
+                  f"peak RSS {rss}")
+            for error in result['errors']:
+                print(f"    {error}")
+
+    return {
+        'commit': _git_commit(),
+        'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': config,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare_results(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """
+    Print how each case changed against a baseline run
+
+    Args:
+        baseline (dict): Earlier output of run_benchmarks
+        current (dict): Newer output of run_benchmarks
+        threshold (float): Relative slowdown reported as a regression
+
+    Returns:
+        list: Names of cases that regressed
+    """
+    if baseline.get('config') != current.get('config'):
+        print("Warning: baseline was run with a different configuration")
+
+    old_results = {result['case']: result for result in baseline.get('results', [])}
+    regressions = []
+
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} ({baseline.get('timestamp')}):")
+    for result in current['results']:
+        old = old_results.get(result['case'])
+        if old is None or 'error' in old or 'error' in result:
+            continue
+
+        change = result['wall_seconds'] / max(old['wall_seconds'], 1e-9) - 1
+        marker = "✗" if change > threshold else "✓"
+        line = f"{marker} {result['case']}: {old['wall_seconds']:.2f}s -> {result['wall_seconds']:.2f}s ({change:+.1%})"
+        if old.get('peak_rss_mb') and result.get('peak_rss_mb'):
+            line += f", peak RSS {old['peak_rss_mb']:.0f} -> {result['peak_rss_mb']:.0f} MB"
+        print(line)
+
+        if change > threshold:
+            regressions.append(result['case'])
+
+    return regressions
+
+
+def main():
+    """Command line entry point for the benchmarks"""
+    parser = argparse.ArgumentParser(description="Benchmark Excel conversion and PDF operations")
+    parser.add_argument("cases", nargs="*", help=f"Cases to run: {', '.join(CASES)} (default: all)")
+    parser.add_argument("--rows", type=int, default=1000, help="Data rows per sheet")
+    parser.add_argument("--cols", type=int, default=8, help="Columns per sheet")
+    parser.add_argument("--sheets", type=int, default=3, help="Sheets per workbook")
+    parser.add_argument("--files", type=int, default=20, help="PDF files in the merge/split corpus")
+    parser.add_argument("--pages", type=int, default=25, help="Pages per corpus PDF")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Runs per case; the fastest counts")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare against")
+    parser.add_argument("--work-dir", default=None, help="Keep generated inputs and outputs here")
+    # Internal: run a single case in this process
+    parser.add_argument("--run-case", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--inputs", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--output-dir", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(_run_case(args.run_case, json.loads(args.inputs), args.output_dir)))
+        return
+
+    unknown = [case for case in args.cases if case not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    print("PyTools Benchmarks")
+    print("=" * 50)
+
+    report = run_benchmarks(args.cases, args.rows, args.cols, args.sheets, args.files, args.pages,
+                            args.repeat, args.work_dir)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare_results(baseline, report):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
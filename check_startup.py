@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Startup time check
+Imports each entry point in a fresh interpreter with -X importtime and fails
+when it takes longer than its budget or loads a heavy dependency that should
+only be imported once an operation needs it.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Dependencies that take a noticeable part of a second to import
+HEAVY_MODULES = ('pandas', 'numpy', 'matplotlib', 'reportlab', 'PyPDF2', 'google.generativeai')
+
+# Entry point -> (code that imports it, budget in milliseconds, modules it must not load)
+STARTUP_BUDGETS = {
+    'main': ("import main", 150, HEAVY_MODULES),
+    'excel_to_pdf': ("import excel_to_pdf", 1000, ('matplotlib', 'PyPDF2', 'google.generativeai')),
+    'pdf_daemon': ("import pdf_daemon", 150, HEAVY_MODULES),
+    'pdf_index': ("import pdf_index", 150, HEAVY_MODULES),
+    'gemini-assistant': (
+        "import importlib.util; "
+        "spec = importlib.util.spec_from_file_location('gemini_assistant', 'gemini-assistant.py'); "
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))",
+        150, HEAVY_MODULES,
+    ),
+}
+
+
+def measure_imports(code):
+    """
+    Run code in a fresh interpreter and collect its -X importtime report
+
+    Args:
+        code (str): Python code that performs the imports
+
+    Returns:
+        list: (module, depth, cumulative microseconds) per imported module,
+            where depth 0 means the module was imported by the code itself
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                               cwd=here, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    timings = []
+    for line in completed.stderr.splitlines():
+        # Lines look like "import time:  self | cumulative |   nested.module",
+        # with two spaces of indentation per level of nesting
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2][1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        timings.append((name.strip(), depth, int(fields[1])))
+    return timings
+
+
+def check_startup(names=None, repeat=3):
+    """
+    Check entry points against their startup budgets
+
+    Args:
+        names (list): Entry points from STARTUP_BUDGETS to check (default: all)
+        repeat (int): Fresh interpreter runs per entry point; the fastest counts
+
+    Returns:
+        bool: True if every entry point is within its budget
+    """
+    all_ok = True
+    for name in names or STARTUP_BUDGETS:
+        code, budget_ms, forbidden = STARTUP_BUDGETS[name]
+
+        try:
+            runs = [measure_imports(code) for _ in range(repeat)]
+        except RuntimeError as e:
+            print(f"✗ {name}: import failed: {str(e)}")
+            all_ok = False
+            continue
+
+        # Modules imported directly by the code; nested imports are inside their times
+        totals = [sum(us for _, depth, us in timings if depth == 0) for timings in runs]
+        best = runs[totals.index(min(totals))]
+        total_ms = min(totals) / 1000
+
+        imported = {module for module, _, _ in best}
+        loaded = [module for module in forbidden if module in imported]
+
+        if total_ms <= budget_ms and not loaded:
+            print(f"✓ {name}: {total_ms:.0f} ms (budget {budget_ms} ms)")
+            continue
+
+        all_ok = False
+        print(f"✗ {name}: {total_ms:.0f} ms (budget {budget_ms} ms)")
+        if loaded:
+            print(f"    imports heavy modules at startup: {', '.join(loaded)}")
+
+        slowest = sorted(((us, module) for module, depth, us in best if depth <= 1), reverse=True)
+        for us, module in slowest[:5]:
+            print(f"    {us / 1000:8.1f} ms  {module}")
+
+    return all_ok
+
+
+def main():
+    """Command line entry point for the startup check"""
+    parser = argparse.ArgumentParser(description="Check entry point import times against their budgets")
+    parser.add_argument("names", nargs="*",
+                        help=f"Entry points to check: {', '.join(STARTUP_BUDGETS)} (default: all)")
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+                        help="Runs per entry point; the fastest one is used")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.names if name not in STARTUP_BUDGETS]
+    if unknown:
+        parser.error(f"unknown entry point(s): {', '.join(unknown)}")
+
+    print("Startup Time Check")
+    print("=" * 50)
+
+    sys.exit(0 if check_startup(args.names, args.repeat) else 1)
+
+
+if __name__ == "__main__":
+    main()
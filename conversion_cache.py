@@ -0,0 +1,205 @@
+"""
+Content-hash cache for sheet-to-PDF conversions.
+
+Each rendered sheet PDF is stored as <key>.pdf in the cache directory, where
+the key is a hash of the sheet's cell contents, the sheet name and the
+renderer options. The file system is the index (a file's mtime is its last
+use), so several processes can share one cache directory safely.
+"""
+
+import filecmp
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+# Bump when the renderers change in a way that should invalidate cached PDFs
+CACHE_FORMAT_VERSION = 3
+
+# Default size limit of a cache directory (500 MB)
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+
+class ConversionCache:
+    """
+    On-disk cache of rendered sheet PDFs with size-based LRU eviction
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir (str): Directory holding cached PDFs and run manifests
+            max_bytes (int): Total size of cached PDFs to keep before evicting
+                the least recently used ones
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.entries = []
+        os.makedirs(os.path.join(cache_dir, "manifests"), exist_ok=True)
+
+    def sheet_key(self, df, sheet_name, render_options):
+        """
+        Compute the cache key of a sheet
+
+        Args:
+            df (pd.DataFrame): Sheet data
+            sheet_name (str): Name of the sheet (it appears in the rendered title)
+            render_options (dict): Backend name and style options of the renderer
+
+        Returns:
+            str: Hex digest identifying the rendered PDF
+        """
+        digest = hashlib.sha256()
+        header = {
+            'version': CACHE_FORMAT_VERSION,
+            'sheet': sheet_name,
+            'options': render_options,
+            'columns': [str(column) for column in df.columns],
+            'dtypes': [str(dtype) for dtype in df.dtypes],
+        }
+        digest.update(json.dumps(header, sort_keys=True, default=str).encode('utf-8'))
+
+        try:
+            row_hashes = pd.util.hash_pandas_object(df, index=False).values
+            digest.update(row_hashes.tobytes())
+        except TypeError:
+            # Unhashable cell values; fall back to their text form
+            digest.update(df.to_csv(index=False).encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def fetch(self, key, output_path):
+        """
+        Place the cached PDF for a key at output_path
+
+        The output is left untouched when it already holds the same bytes,
+        otherwise the cached file is copied over it.
+
+        Args:
+            key (str): Cache key from sheet_key
+            output_path (str): Where the sheet PDF should end up
+
+        Returns:
+            bool: True on a cache hit, False if the key is not cached
+        """
+        entry_path = self._entry_path(key)
+        if not os.path.exists(entry_path):
+            return False
+
+        if not (os.path.exists(output_path) and filecmp.cmp(entry_path, output_path, shallow=False)):
+            shutil.copyfile(entry_path, output_path)
+
+        # Mark as recently used for eviction
+        os.utime(entry_path)
+        return True
+
+    def store(self, key, pdf_path):
+        """
+        Add a freshly rendered PDF to the cache and evict old entries if needed
+
+        Args:
+            key (str): Cache key from sheet_key
+            pdf_path (str): Path of the rendered PDF
+        """
+        # Copy to a temporary name first so readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+        os.close(fd)
+        shutil.copyfile(pdf_path, temp_path)
+        os.replace(temp_path, self._entry_path(key))
+        self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used PDFs until the cache fits in max_bytes
+
+        Returns:
+            int: Number of evicted entries
+        """
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".pdf"):
+                path = os.path.join(self.cache_dir, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # Evicted by another process
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            evicted += 1
+
+        return evicted
+
+    def record(self, sheet_name, key, hit, output_path):
+        """Note the outcome of one sheet for the run manifest"""
+        self.entries.append({
+            'sheet': sheet_name,
+            'key': key,
+            'status': 'hit' if hit else 'miss',
+            'output': output_path,
+        })
+
+    def manifest_path(self, workbook_path):
+        """
+        Path of a workbook's run manifest
+
+        The name carries a hash of the workbook's resolved path, so workbooks
+        with the same name in different directories keep separate manifests.
+
+        Args:
+            workbook_path (str): Workbook the manifest describes
+
+        Returns:
+            str: <cache_dir>/manifests/<workbook name>-<path hash>.json
+        """
+        resolved = os.path.realpath(workbook_path)
+        path_hash = hashlib.sha256(resolved.encode('utf-8', 'surrogateescape')).hexdigest()[:12]
+        return os.path.join(self.cache_dir, "manifests",
+                            f"{os.path.basename(resolved)}-{path_hash}.json")
+
+    def write_manifest(self, workbook_path):
+        """
+        Write the hits and misses of the current run and start a new one
+
+        Args:
+            workbook_path (str): Workbook the recorded sheets came from
+
+        Returns:
+            str: Path of the manifest file
+        """
+        hits = sum(1 for entry in self.entries if entry['status'] == 'hit')
+        manifest = {
+            'workbook': os.path.realpath(workbook_path),
+            'finished': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'hits': hits,
+            'misses': len(self.entries) - hits,
+            'sheets': self.entries,
+        }
+
+        manifest_path = self.manifest_path(workbook_path)
+        temp_path = f"{manifest_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, manifest_path)
+
+        print(f"Cache: {manifest['hits']} hit(s), {manifest['misses']} miss(es)")
+        self.entries = []
+        return manifest_path
@@ -1,25 +1,772 @@
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.backends.backend_pdf as pdf_backend
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, Frame
+from reportlab.platypus.doctemplate import LayoutError
+from reportlab.pdfgen import canvas
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
+import io
 import os
-import sys
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
 
-def excel_to_pdf_matplotlib(excel_file_path, output_dir=None):
+from conversion_cache import ConversionCache
+from instrumentation import StageTimer, emit, record_stages, stage
+
+# matplotlib is imported inside the functions that draw with it, so ReportLab
+# and canvas conversions don't pay its import time
+
+# Table styling shared by the ReportLab renderers
+_REPORTLAB_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.green),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+# Default window size for paginated matplotlib output
+MATPLOTLIB_ROWS_PER_PAGE = 30
+MATPLOTLIB_COLS_PER_PAGE = 10
+
+# Figure reused for every page of paginated matplotlib output in this process
+_paginated_figure = None
+
+# Layout of the canvas renderer: one font size and one row height for every cell
+_CANVAS_FONT_SIZE = 8
+_CANVAS_ROW_HEIGHT = 12
+_CANVAS_PADDING = 3
+
+# Code points (strings x padded length) measured per NumPy block when sizing columns
+_MEASURE_BLOCK_CHARS = 1 << 20
+
+# Fixed row heights used by the streaming renderer (font size * 1.2 leading + padding)
+_STREAMING_HEADER_HEIGHT = 30
+_STREAMING_ROW_HEIGHT = 18
+
+def open_workbook(excel_file_path):
     """
-    Convert Excel file to PDF using matplotlib (better for data visualization)
+    Open an Excel workbook once so every sheet can be parsed from the same handle.
+    
+    Args:
+        excel_file_path (str, bytes or file-like): Path to the Excel file, its
+            raw bytes, or a binary file object positioned at its start
+    
+    Returns:
+        pd.ExcelFile: Opened workbook (use as a context manager to close it)
+    """
+    if isinstance(excel_file_path, (bytes, bytearray, memoryview)):
+        excel_file_path = io.BytesIO(excel_file_path)
+    return pd.ExcelFile(excel_file_path)
+
+def load_excel_sheets(excel_file_path):
+    """
+    Parse every sheet of an Excel workbook in a single pass.
+    
+    Args:
+        excel_file_path (str): Path to the Excel file
+    
+    Returns:
+        dict: Mapping of sheet name to DataFrame, in workbook order
+    """
+    with open_workbook(excel_file_path) as excel_file:
+        return excel_file.parse(sheet_name=None)
+
+def iter_excel_sheets(excel_file, observer=None):
+    """
+    Lazily parse an Excel workbook one sheet at a time.
+    
+    The workbook is opened once and each sheet is parsed from that handle on
+    demand, so only the current sheet is held in memory. Sheets that fail to
+    parse are reported and skipped.
+    
+    Args:
+        excel_file (str or pd.ExcelFile): Path to the Excel file, or an already opened workbook
+        observer (callable): Receives a 'parse' stage per sheet (optional)
+    
+    Yields:
+        tuple: (sheet_name, DataFrame, parse time in seconds)
+    """
+    if not isinstance(excel_file, pd.ExcelFile):
+        with open_workbook(excel_file) as opened:
+            yield from iter_excel_sheets(opened, observer)
+        return
+    
+    for sheet_name in excel_file.sheet_names:
+        start = time.perf_counter()
+        try:
+            with stage(observer, 'parse', sheet=sheet_name):
+                df = excel_file.parse(sheet_name=sheet_name)
+        except Exception as e:
+            print(f"✗ Error reading sheet '{sheet_name}': {str(e)}")
+            continue
+        yield sheet_name, df, time.perf_counter() - start
+
+def _unique_output_path(output_dir, sheet_name, reserved=None, overwrite=False):
+    """
+    Build a PDF path for a sheet that does not overwrite an existing file.
+    
+    Args:
+        output_dir (str): Directory the PDF will be written to
+        sheet_name (str): Name of the sheet being converted
+        reserved (set): Paths already handed out in this run but possibly not
+            written yet; the chosen path is added to it (optional)
+        overwrite (bool): Reuse the plain sheet name even if a file from an
+            earlier run exists; only names reserved in this run get a suffix
+    
+    Returns:
+        str: Output path for the sheet
+    """
+    if reserved is None:
+        reserved = set()
+    
+    safe_sheet_name = "".join(c for c in sheet_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    output_filename = f"{safe_sheet_name}.pdf"
+    output_path = os.path.join(output_dir, output_filename)
+    
+    # Ensure unique filename
+    counter = 1
+    while (not overwrite and os.path.exists(output_path)) or output_path in reserved:
+        output_filename = f"{safe_sheet_name}_{counter}.pdf"
+        output_path = os.path.join(output_dir, output_filename)
+        counter += 1
+    
+    reserved.add(output_path)
+    return output_path
+
+class _GlyphWidths(dict):
+    """Character widths of one font in 1/1000 em, each measured on first use"""
+    
+    def __init__(self, font_name):
+        super().__init__()
+        self.font_name = font_name
+        # Lookup table for Latin-1 code points, used for vectorized measuring
+        self.latin1 = np.array([0.0] + [self[chr(code)] for code in range(1, 256)])
+    
+    def __missing__(self, char):
+        width = stringWidth(char, self.font_name, 1000)
+        self[char] = width
+        return width
+
+@lru_cache(maxsize=None)
+def _glyph_widths(font_name):
+    """Return the per-process glyph width table of a font"""
+    return _GlyphWidths(font_name)
+
+def _text_width(text, font_name, font_size):
+    """Width of a string in points, using the cached glyph widths"""
+    widths = _glyph_widths(font_name)
+    return sum(map(widths.__getitem__, text)) * font_size / 1000
+
+def _format_column(series):
+    """
+    Convert a column to the text shown in its cells in one vectorized pass.
+    
+    Args:
+        series (pd.Series): Column of a sheet
+    
+    Returns:
+        pd.Series: Cell text, with empty strings for missing values
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        text = series.dt.strftime('%Y-%m-%d %H:%M:%S')
+    else:
+        text = series.astype(str)
+    return text.where(series.notna(), '')
+
+def _format_table(df):
+    """Format a sheet's header and every column as cell text"""
+    header = [str(column) for column in df.columns]
+    columns = [_format_column(df.iloc[:, i]) for i in range(len(header))]
+    return header, columns
+
+def _max_text_width(texts, font_name, font_size):
+    """
+    Width in points of the widest string in a column of cell text.
+    
+    Distinct strings are grouped by length (up to the next power of two),
+    packed into fixed-width code point arrays and their widths summed through
+    the font's glyph table with NumPy, so no per-cell stringWidth calls are
+    made and one long cell does not pad the short ones. Text outside Latin-1
+    is measured per string.
+    
+    Args:
+        texts (pd.Series): Cell text of one column
+        font_name (str): Font the text is drawn in
+        font_size (float): Font size in points
+    
+    Returns:
+        float: Width of the widest string
+    """
+    glyphs = _glyph_widths(font_name)
+    distinct = pd.unique(texts.to_numpy(dtype=object))
+    widest = 0.0
+    
+    lengths = np.fromiter(map(len, distinct), dtype=np.int64, count=len(distinct))
+    length_classes = np.ceil(np.log2(np.maximum(lengths, 1))).astype(np.int64)
+    
+    # Measure each length class in blocks to bound the size of the code point array
+    for length_class in np.unique(length_classes):
+        strings = distinct[length_classes == length_class]
+        block_size = max(1, _MEASURE_BLOCK_CHARS >> int(length_class))
+        for start in range(0, len(strings), block_size):
+            block = np.asarray(strings[start:start + block_size], dtype=str)
+            code_points = block.view(np.uint32).reshape(len(block), -1)
+            if code_points.size == 0:
+                continue
+            if code_points.max() < 256:
+                widest = max(widest, glyphs.latin1[code_points].sum(axis=1).max())
+            else:
+                widest = max(widest, max(sum(map(glyphs.__getitem__, text)) for text in block))
+    
+    return widest * font_size / 1000
+
+def _measure_column_widths(header, columns, header_font, body_font, padding):
+    """
+    Compute the natural width of every column from its header and cell text.
+    
+    Args:
+        header (list): Header text of each column
+        columns (list): Cell text of each column (pd.Series)
+        header_font (tuple): (font name, size) of the header row
+        body_font (tuple): (font name, size) of the body rows
+        padding (float): Horizontal padding added to each column
+    
+    Returns:
+        list: Column widths in points
+    """
+    return [max(_text_width(name, *header_font), _max_text_width(texts, *body_font)) + padding
+            for name, texts in zip(header, columns)]
+
+@lru_cache(maxsize=None)
+def _reportlab_row_heights():
+    """Measure the header and body row heights of single-line cells in the shared table style"""
+    table = Table([['Xg'], ['Xg']])
+    table.setStyle(_REPORTLAB_TABLE_STYLE)
+    table.wrap(1000, 1000)
+    return table._rowHeights[0], table._rowHeights[1]
+
+def _matplotlib_sheet_figure(df, sheet_name):
+    """Draw a whole sheet as a matplotlib table on a new figure"""
+    from matplotlib.figure import Figure
+    
+    # Create figure and axis (no pyplot state, so this is safe in worker processes)
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+    ax.axis('tight')
+    ax.axis('off')
+    
+    # Create table
+    table = ax.table(cellText=df.values, colLabels=df.columns, cellLoc='center', loc='center')
+    table.auto_set_font_size(False)
+    table.set_fontsize(9)
+    table.scale(1.2, 1.5)
+    
+    # Style the table
+    for i in range(len(df.columns)):
+        table[(0, i)].set_facecolor('#4CAF50')
+        table[(0, i)].set_text_props(weight='bold', color='white')
+    
+    # Add title
+    ax.set_title(f'Sheet: {sheet_name}', fontsize=16, fontweight='bold', pad=20)
+    return fig
+
+def _render_matplotlib_sheet(df, sheet_name, output_path):
+    """Draw a sheet as a matplotlib table and save it as a PDF; returns page count and stage timings"""
+    timer = StageTimer()
+    with timer.stage('layout'):
+        fig = _matplotlib_sheet_figure(df, sheet_name)
+    with timer.stage('render'):
+        fig.savefig(output_path, format='pdf', bbox_inches='tight', dpi=300)
+    return timer.result(pages=1)
+
+def _draw_matplotlib_sheet(pdf, df, sheet_name):
+    """Add a sheet as a single page to an open PdfPages document"""
+    fig = _matplotlib_sheet_figure(df, sheet_name)
+    pdf.savefig(fig, bbox_inches='tight', dpi=300)
+
+def _get_paginated_figure():
+    """Return this process's reusable A4-landscape figure for paginated output"""
+    from matplotlib.figure import Figure
+    
+    global _paginated_figure
+    if _paginated_figure is None:
+        _paginated_figure = Figure(figsize=(11.69, 8.27))
+    return _paginated_figure
+
+def _draw_matplotlib_paginated_sheet(pdf, df, sheet_name,
+                                     rows_per_page=MATPLOTLIB_ROWS_PER_PAGE,
+                                     cols_per_page=MATPLOTLIB_COLS_PER_PAGE):
+    """
+    Add a sheet to an open PdfPages document, one page per row/column window.
+    
+    Pages run across the column windows of a block of rows before moving down
+    to the next block. One figure is cleared and redrawn for every page, and
+    the table is placed in a fixed box so no tight-bbox layout pass is needed.
+    
+    Args:
+        pdf (PdfPages): Document to add the pages to
+        df (pd.DataFrame): Sheet data
+        sheet_name (str): Name of the sheet
+        rows_per_page (int): Data rows per page
+        cols_per_page (int): Columns per page
+    """
+    fig = _get_paginated_figure()
+    row_starts = range(0, len(df), rows_per_page)
+    col_starts = range(0, len(df.columns), cols_per_page)
+    total_pages = len(row_starts) * len(col_starts)
+    
+    try:
+        page = 0
+        for row_start in row_starts:
+            for col_start in col_starts:
+                page += 1
+                window = df.iloc[row_start:row_start + rows_per_page,
+                                 col_start:col_start + cols_per_page]
+                
+                fig.clear()
+                ax = fig.add_axes([0.03, 0.03, 0.94, 0.87])
+                ax.axis('off')
+                
+                # Keep row height constant so a short last page is not stretched
+                height = (len(window) + 1) / (rows_per_page + 1)
+                table = ax.table(cellText=window.values, colLabels=window.columns,
+                                 cellLoc='center', bbox=[0, 1 - height, 1, height])
+                table.auto_set_font_size(False)
+                table.set_fontsize(8)
+                
+                # Style the table
+                for i in range(len(window.columns)):
+                    table[(0, i)].set_facecolor('#4CAF50')
+                    table[(0, i)].set_text_props(weight='bold', color='white')
+                
+                fig.suptitle(f"Sheet: {sheet_name} - rows {row_start + 1}-{row_start + len(window)}, "
+                             f"columns {col_start + 1}-{col_start + len(window.columns)} "
+                             f"(page {page} of {total_pages})",
+                             fontsize=12, fontweight='bold')
+                pdf.savefig(fig)
+    finally:
+        fig.clear()
+
+def _render_matplotlib_paginated_sheet(df, sheet_name, output_path,
+                                       rows_per_page=MATPLOTLIB_ROWS_PER_PAGE,
+                                       cols_per_page=MATPLOTLIB_COLS_PER_PAGE):
+    """Draw a sheet as a multi-page PDF, one page per row/column window; returns page count and stage timings"""
+    from matplotlib.backends.backend_pdf import PdfPages
+    
+    timer = StageTimer()
+    with timer.stage('render'):
+        with PdfPages(output_path) as pdf:
+            _draw_matplotlib_paginated_sheet(pdf, df, sheet_name, rows_per_page, cols_per_page)
+            pages = pdf.get_pagecount()
+    return timer.result(pages=pages)
+
+@lru_cache(maxsize=None)
+def _reportlab_title_style():
+    """Build the sheet title style once per process instead of a new stylesheet per sheet"""
+    styles = getSampleStyleSheet()
+    return ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        spaceAfter=30,
+        alignment=1  # Center alignment
+    )
+
+def _reportlab_sheet_story(df, sheet_name):
+    """Build the title and table flowables of a sheet"""
+    story = []
+    
+    # Add title
+    title = Paragraph(f"Sheet: {sheet_name}", _reportlab_title_style())
+    story.append(title)
+    story.append(Spacer(1, 20))
+    
+    # Format cell text column by column and size the columns from cached font metrics
+    header, columns = _format_table(df)
+    col_widths = _measure_column_widths(header, columns, ('Helvetica-Bold', 12), ('Helvetica', 10), 12)
+    table_data = [header] + [list(row) for row in zip(*(texts.tolist() for texts in columns))]
+    
+    # Single-line cells all have the same height, so skip per-cell row measurement
+    row_heights = None
+    if not any(texts.str.contains('\n', regex=False).any() for texts in columns) and \
+            not any('\n' in name for name in header):
+        header_height, body_height = _reportlab_row_heights()
+        row_heights = [header_height] + [body_height] * len(df)
+    
+    # Create table
+    table = Table(table_data, colWidths=col_widths, rowHeights=row_heights)
+    
+    # Style the table
+    table.setStyle(_REPORTLAB_TABLE_STYLE)
+    
+    story.append(table)
+    return story
+
+def _render_reportlab_sheet(df, sheet_name, output_path):
+    """Lay out a sheet as a ReportLab table and build it into a PDF; returns page count and stage timings"""
+    timer = StageTimer()
+    with timer.stage('layout'):
+        story = _reportlab_sheet_story(df, sheet_name)
+    
+    # Create PDF document
+    doc = SimpleDocTemplate(output_path, pagesize=A4)
+    
+    # Build PDF
+    with timer.stage('render'):
+        doc.build(story)
+    return timer.result(pages=doc.page)
+
+def _draw_story(pdf_canvas, story):
+    """
+    Lay out flowables onto a canvas page by page, as SimpleDocTemplate would.
+    
+    Uses the same 1 inch margins as SimpleDocTemplate. Flowables that do not
+    fit the rest of a page are split, and the last page is finished.
+    
+    Args:
+        pdf_canvas (canvas.Canvas): Canvas positioned at the top of a fresh page
+        story (list): Flowables to draw; consumed in the process
+    """
+    page_width, page_height = pdf_canvas._pagesize
+    frame = Frame(inch, inch, page_width - 2 * inch, page_height - 2 * inch)
+    page_used = False
+    
+    while story:
+        flowable = story.pop(0)
+        if frame.add(flowable, pdf_canvas):
+            page_used = True
+            continue
+        
+        # Split across the page break when possible, otherwise start a new page
+        parts = frame.split(flowable, pdf_canvas)
+        if parts:
+            story[0:0] = parts
+            continue
+        if not page_used:
+            raise LayoutError(f"{flowable.identity()} is too large for the page")
+        
+        pdf_canvas.showPage()
+        frame = Frame(inch, inch, page_width - 2 * inch, page_height - 2 * inch)
+        page_used = False
+        story.insert(0, flowable)
+    
+    pdf_canvas.showPage()
+
+def _draw_reportlab_sheet(pdf_canvas, df, sheet_name):
+    """Draw a sheet's title and table onto a shared canvas, starting on a new page"""
+    _draw_story(pdf_canvas, _reportlab_sheet_story(df, sheet_name))
+
+def _cap_column_widths(widths, available_width):
+    """Limit the widest columns to a common cap so the total fits the available width"""
+    remaining = available_width
+    ordered = sorted(widths)
+    cap = ordered[-1]
+    for i, width in enumerate(ordered):
+        share = remaining / (len(ordered) - i)
+        if width > share:
+            cap = share
+            break
+        remaining -= width
+    return [min(width, cap) for width in widths]
+
+def _draw_canvas_sheet(pdf_canvas, df, sheet_name):
+    """
+    Draw a sheet directly onto a ReportLab canvas as a plain grid.
+    
+    Column widths are computed once per sheet and every row has the same
+    height, so pages are filled without any flowable layout. Each page is
+    drawn with one text object, one header fill and one grid call.
+    
+    Args:
+        pdf_canvas (canvas.Canvas): Canvas to draw on; a new page is started after each page of rows
+        df (pd.DataFrame): Sheet data
+        sheet_name (str): Name of the sheet, used for the title on its first page
+    
+    Returns:
+        int: Number of data rows drawn
+    """
+    page_width, page_height = pdf_canvas._pagesize
+    margin = inch / 2
+    available_width = page_width - 2 * margin
+    
+    # Precompute cell text and column widths once for the whole sheet
+    header, columns = _format_table(df)
+    # Rows have a fixed height, so line breaks in a cell are flattened to spaces
+    header = pd.Series(header, dtype=object).str.replace(r'\s*[\r\n]+\s*', ' ', regex=True).tolist()
+    columns = [texts.str.replace(r'\s*[\r\n]+\s*', ' ', regex=True) for texts in columns]
+    widths = _measure_column_widths(header, columns, ('Helvetica-Bold', _CANVAS_FONT_SIZE),
+                                    ('Helvetica', _CANVAS_FONT_SIZE), 2 * _CANVAS_PADDING)
+    
+    total_width = sum(widths)
+    if total_width > available_width:
+        # Narrow only the widest columns and cut text that no longer fits
+        capped = _cap_column_widths(widths, available_width)
+        for i, (natural, width) in enumerate(zip(widths, capped)):
+            if width < natural:
+                scale = width / natural
+                columns[i] = columns[i].str.slice(0, max(1, int(columns[i].str.len().max() * scale)))
+                header[i] = header[i][:max(1, int(len(header[i]) * scale))]
+        widths = capped
+        total_width = sum(widths)
+    
+    columns = [texts.tolist() for texts in columns]
+    
+    left = (page_width - total_width) / 2
+    col_edges = [left]
+    for width in widths:
+        col_edges.append(col_edges[-1] + width)
+    
+    # Baseline of the text inside a row, measured from the row's top edge
+    baseline = _CANVAS_PADDING + _CANVAS_FONT_SIZE * 0.75
+    
+    row_count = len(df)
+    row = 0
+    first_page = True
+    while row < row_count or first_page:
+        top = page_height - margin
+        if first_page:
+            pdf_canvas.setFont('Helvetica-Bold', 14)
+            pdf_canvas.drawCentredString(page_width / 2, top - 14, f"Sheet: {sheet_name}")
+            top -= 30
+        
+        page_rows = min(row_count - row, int((top - margin) // _CANVAS_ROW_HEIGHT) - 1)
+        
+        # Header background
+        pdf_canvas.setFillColor(colors.lightgrey)
+        pdf_canvas.rect(left, top - _CANVAS_ROW_HEIGHT, total_width, _CANVAS_ROW_HEIGHT, fill=1, stroke=0)
+        pdf_canvas.setFillColor(colors.black)
+        
+        # All cell text of the page goes into a single text object, drawn a
+        # column at a time as lines spaced one row apart so no per-cell
+        # positioning or width measurement is needed
+        text = pdf_canvas.beginText()
+        text.setFont('Helvetica-Bold', _CANVAS_FONT_SIZE, _CANVAS_ROW_HEIGHT)
+        for x, name in zip(col_edges, header):
+            text.setTextOrigin(x + _CANVAS_PADDING, top - baseline)
+            text.textLine(name)
+        
+        text.setFont('Helvetica', _CANVAS_FONT_SIZE, _CANVAS_ROW_HEIGHT)
+        for x, values in zip(col_edges, columns):
+            text.setTextOrigin(x + _CANVAS_PADDING, top - _CANVAS_ROW_HEIGHT - baseline)
+            for value in values[row:row + page_rows]:
+                text.textLine(value)
+        pdf_canvas.drawText(text)
+        
+        pdf_canvas.setLineWidth(0.25)
+        pdf_canvas.grid(col_edges, [top - i * _CANVAS_ROW_HEIGHT for i in range(page_rows + 2)])
+        pdf_canvas.showPage()
+        
+        row += page_rows
+        first_page = False
+    
+    return row_count
+
+def _render_canvas_sheet(df, sheet_name, output_path):
+    """Draw a sheet straight onto a ReportLab canvas and save it as a PDF; returns page count and stage timings"""
+    timer = StageTimer()
+    pdf_canvas = canvas.Canvas(output_path, pagesize=A4)
+    with timer.stage('render'):
+        _draw_canvas_sheet(pdf_canvas, df, sheet_name)
+    pages = pdf_canvas.getPageNumber() - 1
+    with timer.stage('write'):
+        pdf_canvas.save()
+    return timer.result(pages=pages)
+
+def iter_excel_rows(excel_file_path):
+    """
+    Stream the rows of every sheet without loading whole sheets into memory.
+    
+    The workbook is opened once in openpyxl read-only mode. Rows are produced
+    lazily as the sheet XML is read, so memory use does not depend on the
+    number of rows. Fully blank rows are skipped, and every row is padded or
+    cut to the width of the header (read-only rows drop blank trailing cells).
+    
+    Args:
+        excel_file_path (str): Path to the .xlsx file
+    
+    Yields:
+        tuple: (sheet_name, header row, iterator over the remaining rows);
+            the header is None for an empty sheet
+    """
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(excel_file_path, read_only=True, data_only=True)
+    try:
+        for worksheet in workbook.worksheets:
+            # Some writers store wrong dimensions; make iter_rows read every row
+            worksheet.reset_dimensions()
+            rows = (["" if value is None else value for value in row]
+                    for row in worksheet.iter_rows(values_only=True)
+                    if any(value is not None for value in row))
+            header = next(rows, None)
+            if header is not None:
+                width = len(header)
+                rows = (row[:width] + [""] * (width - len(row)) for row in rows)
+            yield worksheet.title, header, rows
+    finally:
+        workbook.close()
+
+def _fit_column_widths(table_data, available_width):
+    """Size columns to their widest header/body text, shrunk to fit the page width"""
+    widths = []
+    for col in range(len(table_data[0])):
+        header_width = _text_width(str(table_data[0][col]), 'Helvetica-Bold', 12)
+        body_width = max((_text_width(str(row[col]), 'Helvetica', 10) for row in table_data[1:]), default=0)
+        widths.append(max(header_width, body_width) + 12)  # 6pt padding each side
+    
+    total_width = sum(widths)
+    if total_width > available_width:
+        widths = [width * available_width / total_width for width in widths]
+    return widths
+
+def _draw_streamed_sheet(pdf_canvas, sheet_name, header, rows, rows_per_page=None):
+    """
+    Draw a streamed sheet onto a canvas as one fixed-size LongTable per page.
+    
+    Only the rows of the page being drawn are held in memory. Column widths
+    are fixed from the first page so every page lines up.
+    
+    Args:
+        pdf_canvas (canvas.Canvas): Canvas to draw on; a new page is started after each block
+        sheet_name (str): Name of the sheet, used for the title on its first page
+        header (list): Header row, repeated at the top of every page
+        rows (iterator): Remaining rows of the sheet
+        rows_per_page (int): Rows per page, capped to what fits on the page (optional)
+    
+    Returns:
+        int: Number of data rows drawn
+    """
+    page_width, page_height = pdf_canvas._pagesize
+    frame_width = page_width - 2 * inch
+    title_height = 70
+    
+    col_widths = None
+    rows_drawn = 0
+    first_page = True
+    
+    while True:
+        top = page_height - inch
+        if first_page:
+            # Title block, matching the Heading1 title of the regular renderer
+            pdf_canvas.setFont('Helvetica-Bold', 16)
+            pdf_canvas.drawCentredString(page_width / 2, top - 20, f"Sheet: {sheet_name}")
+            top -= title_height
+        
+        capacity = int((top - inch - _STREAMING_HEADER_HEIGHT) // _STREAMING_ROW_HEIGHT)
+        page_rows = list(islice(rows, min(rows_per_page or capacity, capacity)))
+        if not page_rows and not first_page:
+            break
+        
+        table_data = [header] + page_rows
+        if col_widths is None:
+            col_widths = _fit_column_widths(table_data, frame_width)
+        
+        table = LongTable(table_data, colWidths=col_widths, repeatRows=1,
+                          rowHeights=[_STREAMING_HEADER_HEIGHT] + [_STREAMING_ROW_HEIGHT] * len(page_rows))
+        table.setStyle(_REPORTLAB_TABLE_STYLE)
+        table_width, table_height = table.wrapOn(pdf_canvas, frame_width, top - inch)
+        table.drawOn(pdf_canvas, (page_width - table_width) / 2, top - table_height)
+        pdf_canvas.showPage()
+        
+        rows_drawn += len(page_rows)
+        first_page = False
+    
+    return rows_drawn
+
+# Sheet renderers by backend name, for convert_workbook and the batch tools
+BACKENDS = {
+    'matplotlib': _render_matplotlib_sheet,
+    'matplotlib-paginated': _render_matplotlib_paginated_sheet,
+    'reportlab': _render_reportlab_sheet,
+    'canvas': _render_canvas_sheet,
+}
+
+def _render_options(render_sheet):
+    """Describe a renderer and its style options for cache keys"""
+    if isinstance(render_sheet, partial):
+        return {'renderer': render_sheet.func.__name__, **render_sheet.keywords}
+    return {'renderer': render_sheet.__name__}
+
+def _collect_sheet_result(sheet_name, output_path, render, result, row_count, cache=None, cache_key=None,
+                          observer=None):
+    """Run or wait for a sheet render, report the outcome and cache the new PDF"""
+    try:
+        rendered = render()
+        _record_sheet(result, sheet_name, output_path, row_count)
+        print(f"✓ Created PDF: {os.path.basename(output_path)}")
+        
+        if observer is not None:
+            _report_sheet(observer, sheet_name, row_count, rendered, os.path.getsize(output_path))
+        
+        if cache is not None:
+            with stage(observer, 'cache', sheet=sheet_name):
+                cache.store(cache_key, output_path)
+            cache.record(sheet_name, cache_key, False, output_path)
+        
+    except Exception as e:
+        print(f"✗ Error processing sheet '{sheet_name}': {str(e)}")
+
+def _report_sheet(observer, sheet_name, row_count, rendered, output_bytes):
+    """Send a converted sheet's stage timings and row, page and byte counts to an observer"""
+    if rendered:
+        record_stages(observer, rendered['stages'], sheet=sheet_name)
+        emit(observer, 'pages', count=rendered['pages'], sheet=sheet_name)
+    emit(observer, 'rows', count=row_count, sheet=sheet_name)
+    emit(observer, 'bytes', count=output_bytes, sheet=sheet_name)
+
+def _record_sheet(result, sheet_name, output_path, row_count):
+    """Add a converted sheet to a conversion result"""
+    result['pdfs'].append(output_path)
+    result['sheets'].append(sheet_name)
+    result['rows'] += row_count
+
+def _convert_workbook(excel_file_path, output_dir, render_sheet, workers=None, cache_dir=None,
+                      overwrite=False, observer=None):
+    """
+    Parse a workbook once and render each non-empty sheet to its own PDF.
+    
+    With more than one worker, sheets are rendered in a process pool while the
+    next sheets are still being parsed. Output paths are reserved up front in
+    sheet order, so filenames and the returned list are the same as a serial run.
+    
+    With a cache directory, each sheet is looked up by a hash of its contents
+    and the renderer options; unchanged sheets are copied from the cache instead
+    of being rendered, and outputs keep their plain names across runs instead of
+    gaining _1, _2 suffixes.
     
     Args:
         excel_file_path (str): Path to the Excel file
         output_dir (str): Directory to save PDF files (optional)
+        render_sheet (callable): Module-level function called as
+            render_sheet(df, sheet_name, output_path), returning a dict of
+            'pages' and 'stages' (stage name -> seconds)
+        workers (int): Number of worker processes; None or 1 renders serially
+        cache_dir (str): Directory of the conversion cache (optional)
+        overwrite (bool): Replace PDFs left by earlier runs instead of adding
+            a numeric suffix (always on with a cache)
+        observer (callable): Receives stage timings and row, page and byte
+            counts (see instrumentation) (optional)
     
     Returns:
-        list: List of created PDF file paths
+        dict: 'pdfs' (created PDF paths), 'sheets' (their sheet names), 'rows'
+            (data rows converted), 'parse_seconds' and 'render_seconds'
     """
     if output_dir is None:
         output_dir = os.path.dirname(excel_file_path) or '.'
@@ -27,72 +774,436 @@ def excel_to_pdf_matplotlib(excel_file_path, output_dir=None):
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    # Read all sheets from Excel file
-    excel_file = pd.ExcelFile(excel_file_path)
-    created_pdfs = []
+    result = {'pdfs': [], 'sheets': [], 'rows': 0, 'parse_seconds': 0.0, 'render_seconds': 0.0}
+    reserved_paths = set()
+    start = time.perf_counter()
     
-    print(f"Processing Excel file: {os.path.basename(excel_file_path)}")
-    print(f"Found {len(excel_file.sheet_names)} sheets: {excel_file.sheet_names}")
+    cache = ConversionCache(cache_dir) if cache_dir else None
+    render_options = _render_options(render_sheet)
+    overwrite = overwrite or cache is not None
     
-    for sheet_name in excel_file.sheet_names:
-        try:
-            # Read the sheet
-            df = pd.read_excel(excel_file_path, sheet_name=sheet_name)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    # Sheets submitted to the pool but not yet collected, oldest first
+    pending = deque()
+    
+    try:
+        with open_workbook(excel_file_path) as excel_file:
+            print(f"Processing Excel file: {os.path.basename(excel_file_path)}")
+            print(f"Found {len(excel_file.sheet_names)} sheets: {excel_file.sheet_names}")
             
+            for sheet_name, df, sheet_parse_seconds in iter_excel_sheets(excel_file, observer):
+                result['parse_seconds'] += sheet_parse_seconds
+                
+                if df.empty:
+                    print(f"Sheet '{sheet_name}' is empty, skipping...")
+                    continue
+                
+                output_path = _unique_output_path(output_dir, sheet_name, reserved_paths, overwrite)
+                
+                cache_key = None
+                if cache is not None:
+                    with stage(observer, 'cache', sheet=sheet_name):
+                        cache_key = cache.sheet_key(df, sheet_name, render_options)
+                        hit = cache.fetch(cache_key, output_path)
+                    if hit:
+                        cache.record(sheet_name, cache_key, True, output_path)
+                        _record_sheet(result, sheet_name, output_path, len(df))
+                        print(f"✓ Reused cached PDF: {os.path.basename(output_path)}")
+                        if observer is not None:
+                            _report_sheet(observer, sheet_name, len(df), None, os.path.getsize(output_path))
+                        continue
+                
+                if executor is None:
+                    _collect_sheet_result(sheet_name, output_path,
+                                          lambda: render_sheet(df, sheet_name, output_path),
+                                          result, len(df), cache, cache_key, observer)
+                    continue
+                
+                pending.append((sheet_name, output_path, len(df), cache_key,
+                                executor.submit(render_sheet, df, sheet_name, output_path)))
+                
+                # Bound the number of parsed sheets waiting in the pool
+                if len(pending) >= workers * 2:
+                    done_name, done_path, done_rows, done_key, future = pending.popleft()
+                    _collect_sheet_result(done_name, done_path, future.result, result, done_rows,
+                                          cache, done_key, observer)
+        
+        while pending:
+            done_name, done_path, done_rows, done_key, future = pending.popleft()
+            _collect_sheet_result(done_name, done_path, future.result, result, done_rows,
+                                  cache, done_key, observer)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    result['render_seconds'] = time.perf_counter() - start - result['parse_seconds']
+    print(f"Parse time: {result['parse_seconds']:.2f}s, render time: {result['render_seconds']:.2f}s")
+    
+    if cache is not None:
+        cache.write_manifest(excel_file_path)
+    return result
+
+def excel_to_pdf_matplotlib(excel_file_path, output_dir=None, workers=None, paginate=False,
+                            rows_per_page=MATPLOTLIB_ROWS_PER_PAGE, cols_per_page=MATPLOTLIB_COLS_PER_PAGE,
+                            cache_dir=None, combined=False, observer=None):
+    """
+    Convert Excel file to PDF using matplotlib (better for data visualization)
+    
+    Args:
+        excel_file_path (str): Path to the Excel file
+        output_dir (str): Directory to save PDF files (optional)
+        workers (int): Number of processes to render sheets with (optional)
+        paginate (bool): Split each sheet into pages of rows_per_page x cols_per_page
+            cells instead of drawing the whole sheet on one page
+        rows_per_page (int): Data rows per page when paginating
+        cols_per_page (int): Columns per page when paginating
+        cache_dir (str): Reuse PDFs of unchanged sheets from this cache directory (optional)
+        combined (bool): Write all sheets into one PDF named after the workbook,
+            with a bookmark per sheet (workers and cache_dir are not used)
+        observer (callable): Receives stage timings and row, page and byte
+            counts (see instrumentation) (optional)
+    
+    Returns:
+        list: List of created PDF file paths
+    """
+    if combined:
+        if paginate:
+            draw_sheet = partial(_draw_matplotlib_paginated_sheet,
+                                 rows_per_page=rows_per_page, cols_per_page=cols_per_page)
+        else:
+            draw_sheet = _draw_matplotlib_sheet
+        output_path = _combined_output_path(excel_file_path, output_dir)
+        return _convert_workbook_combined(excel_file_path, output_path, draw_sheet, True, observer)['pdfs']
+    
+    if paginate:
+        render_sheet = partial(_render_matplotlib_paginated_sheet,
+                               rows_per_page=rows_per_page, cols_per_page=cols_per_page)
+    else:
+        render_sheet = _render_matplotlib_sheet
+    return _convert_workbook(excel_file_path, output_dir, render_sheet, workers, cache_dir,
+                             observer=observer)['pdfs']
+
+def excel_to_pdf_reportlab(excel_file_path, output_dir=None, workers=None, cache_dir=None, combined=False,
+                           observer=None):
+    """
+    Convert Excel file to PDF using ReportLab (better for text-heavy data)
+    
+    Args:
+        excel_file_path (str): Path to the Excel file
+        output_dir (str): Directory to save PDF files (optional)
+        workers (int): Number of processes to render sheets with (optional)
+        cache_dir (str): Reuse PDFs of unchanged sheets from this cache directory (optional)
+        combined (bool): Write all sheets into one PDF named after the workbook,
+            with a bookmark per sheet (workers and cache_dir are not used)
+        observer (callable): Receives stage timings and row, page and byte
+            counts (see instrumentation) (optional)
+    
+    Returns:
+        list: List of created PDF file paths
+    """
+    if combined:
+        output_path = _combined_output_path(excel_file_path, output_dir)
+        return convert_workbook_combined(excel_file_path, output_path, 'reportlab', observer)['pdfs']
+    
+    return _convert_workbook(excel_file_path, output_dir, _render_reportlab_sheet, workers, cache_dir,
+                             observer=observer)['pdfs']
+
+def excel_to_pdf_canvas(excel_file_path, output_dir=None, workers=None, cache_dir=None, combined=False,
+                        observer=None):
+    """
+    Convert Excel file to PDF by drawing tables directly on a ReportLab canvas
+    (fastest, plain styling; best for large data dumps)
+    
+    Args:
+        excel_file_path (str): Path to the Excel file
+        output_dir (str): Directory to save PDF files (optional)
+        workers (int): Number of processes to render sheets with (optional)
+        cache_dir (str): Reuse PDFs of unchanged sheets from this cache directory (optional)
+        combined (bool): Write all sheets into one PDF named after the workbook,
+            with a bookmark per sheet (workers and cache_dir are not used)
+        observer (callable): Receives stage timings and row, page and byte
+            counts (see instrumentation) (optional)
+    
+    Returns:
+        list: List of created PDF file paths
+    """
+    if combined:
+        output_path = _combined_output_path(excel_file_path, output_dir)
+        return convert_workbook_combined(excel_file_path, output_path, 'canvas', observer)['pdfs']
+    
+    return _convert_workbook(excel_file_path, output_dir, _render_canvas_sheet, workers, cache_dir,
+                             observer=observer)['pdfs']
+
+def convert_workbook(excel_file_path, output_dir=None, backend='reportlab', workers=None,
+                     cache_dir=None, overwrite=False, combined=False, observer=None):
+    """
+    Convert Excel file to PDF with a backend chosen by name and return details of the run
+    
+    Args:
+        excel_file_path (str): Path to the Excel file
+        output_dir (str): Directory to save PDF files (optional)
+        backend (str): One of BACKENDS
+        workers (int): Number of processes to render sheets with (optional)
+        cache_dir (str): Reuse PDFs of unchanged sheets from this cache directory (optional)
+        overwrite (bool): Replace PDFs from earlier runs instead of adding a numeric suffix
+        combined (bool): Write all sheets into one PDF named after the workbook,
+            with a bookmark per sheet (workers and cache_dir are not used)
+        observer (callable): Receives stage timings and row, page and byte
+            counts (see instrumentation) (optional)
+    
+    Returns:
+        dict: 'pdfs' (created PDF paths), 'sheets' (their sheet names), 'rows'
+            (data rows converted), 'parse_seconds' and 'render_seconds'
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+    
+    if combined:
+        output_path = _combined_output_path(excel_file_path, output_dir, overwrite)
+        return convert_workbook_combined(excel_file_path, output_path, backend, observer)
+    
+    return _convert_workbook(excel_file_path, output_dir, BACKENDS[backend], workers, cache_dir, overwrite,
+                             observer)
+
+def convert_workbook_to_buffers(workbook, backend='reportlab', output_factory=None, observer=None):
+    """
+    Convert an in-memory Excel workbook to in-memory PDFs, without touching the disk
+    
+    Args:
+        workbook (bytes or file-like): Workbook contents, or a binary file object
+        backend (str): One of BACKENDS
+        output_factory (callable): Called as output_factory(sheet_name) to get a
+            writable binary stream for each sheet's PDF; by default each sheet
+            is written to a new io.BytesIO (optional)
+        observer (callable): Receives stage timings and row, page and byte
+            counts (see instrumentation) (optional)
+    
+    Returns:
+        list: (sheet_name, stream) pairs in sheet order; BytesIO buffers are
+            rewound to the start
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+    
+    render_sheet = BACKENDS[backend]
+    outputs = []
+    
+    with open_workbook(workbook) as excel_file:
+        for sheet_name, df, _ in iter_excel_sheets(excel_file, observer):
             if df.empty:
                 print(f"Sheet '{sheet_name}' is empty, skipping...")
                 continue
             
-            # Create figure and axis
-            fig, ax = plt.subplots(figsize=(12, 8))
-            ax.axis('tight')
-            ax.axis('off')
-            
-            # Create table
-            table = ax.table(cellText=df.values, colLabels=df.columns, cellLoc='center', loc='center')
-            table.auto_set_font_size(False)
-            table.set_fontsize(9)
-            table.scale(1.2, 1.5)
-            
-            # Style the table
-            for i in range(len(df.columns)):
-                table[(0, i)].set_facecolor('#4CAF50')
-                table[(0, i)].set_text_props(weight='bold', color='white')
-            
-            # Add title
-            plt.title(f'Sheet: {sheet_name}', fontsize=16, fontweight='bold', pad=20)
-            
-            # Generate output filename
-            safe_sheet_name = "".join(c for c in sheet_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            output_filename = f"{safe_sheet_name}.pdf"
-            output_path = os.path.join(output_dir, output_filename)
-            
-            # Ensure unique filename
-            counter = 1
-            while os.path.exists(output_path):
-                output_filename = f"{safe_sheet_name}_{counter}.pdf"
-                output_path = os.path.join(output_dir, output_filename)
-                counter += 1
-            
-            # Save as PDF
-            plt.savefig(output_path, bbox_inches='tight', dpi=300)
-            plt.close()
+            try:
+                stream = output_factory(sheet_name) if output_factory else io.BytesIO()
+                rendered = render_sheet(df, sheet_name, stream)
+                if observer is not None:
+                    _report_sheet(observer, sheet_name, len(df), rendered, stream.tell())
+                if isinstance(stream, io.BytesIO):
+                    stream.seek(0)
+                outputs.append((sheet_name, stream))
+                
+            except Exception as e:
+                print(f"✗ Error processing sheet '{sheet_name}': {str(e)}")
+    
+    return outputs
+
+def excel_to_pdf_matplotlib_buffers(workbook, output_factory=None, paginate=False, observer=None):
+    """
+    Convert an in-memory Excel workbook to PDFs using matplotlib, without touching the disk
+    
+    Args:
+        workbook (bytes or file-like): Workbook contents, or a binary file object
+        output_factory (callable): Returns a writable stream for a sheet name (optional)
+        paginate (bool): Split each sheet into pages of rows and columns
+        observer (callable): Receives stage timings and counts (optional)
+    
+    Returns:
+        list: (sheet_name, stream) pairs in sheet order
+    """
+    backend = 'matplotlib-paginated' if paginate else 'matplotlib'
+    return convert_workbook_to_buffers(workbook, backend, output_factory, observer)
+
+def excel_to_pdf_reportlab_buffers(workbook, output_factory=None, observer=None):
+    """
+    Convert an in-memory Excel workbook to PDFs using ReportLab, without touching the disk
+    
+    Args:
+        workbook (bytes or file-like): Workbook contents, or a binary file object
+        output_factory (callable): Returns a writable stream for a sheet name (optional)
+        observer (callable): Receives stage timings and counts (optional)
+    
+    Returns:
+        list: (sheet_name, stream) pairs in sheet order
+    """
+    return convert_workbook_to_buffers(workbook, 'reportlab', output_factory, observer)
+
+# Sheet drawers by backend name, for writing many sheets into one document
+COMBINED_DRAWERS = {
+    'matplotlib': _draw_matplotlib_sheet,
+    'matplotlib-paginated': _draw_matplotlib_paginated_sheet,
+    'reportlab': _draw_reportlab_sheet,
+    'canvas': _draw_canvas_sheet,
+}
+
+def _write_with_outline(pdf_data, output, bookmarks):
+    """
+    Write a finished PDF with an outline (bookmarks) added by PyPDF2.
+    
+    Args:
+        pdf_data (bytes): The PDF as written, without an outline
+        output (str or file-like): Path or writable binary stream for the result
+        bookmarks (list): (title, page_index) pairs in document order
+    """
+    from PyPDF2 import PdfReader, PdfWriter
+    
+    reader = PdfReader(io.BytesIO(pdf_data))
+    writer = PdfWriter()
+    writer.append_pages_from_reader(reader)
+    if reader.metadata:
+        writer.add_metadata(reader.metadata)
+    for title, page_index in bookmarks:
+        writer.add_outline_item(title, page_index)
+    writer.page_mode = '/UseOutlines'
+    
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, 'wb') as f:
+            writer.write(f)
+    else:
+        writer.write(output)
+
+def _convert_workbook_combined(workbook, output, draw_sheet, matplotlib_document, observer=None):
+    """
+    Parse a workbook once and draw every non-empty sheet into a single PDF.
+    
+    Sheets are drawn one after another into one open document, each starting
+    on a new page with an outline entry pointing at it, so no per-sheet PDFs
+    are written and nothing is read back to merge them.
+    
+    Args:
+        workbook (str, bytes or file-like): Workbook path, contents or binary file object
+        output (str or file-like): Path or writable binary stream for the PDF
+        draw_sheet (callable): Called as draw_sheet(document, df, sheet_name)
+        matplotlib_document (bool): Draw into a matplotlib PdfPages document
+            instead of a ReportLab canvas
+        observer (callable): Receives stage timings and row, page and byte
+            counts (see instrumentation) (optional)
+    
+    Returns:
+        dict: 'pdfs' (the output path, if one was given), 'sheets' (sheet names
+            in document order), 'rows' (data rows converted), 'parse_seconds'
+            and 'render_seconds'
+    """
+    result = {'pdfs': [], 'sheets': [], 'rows': 0, 'parse_seconds': 0.0, 'render_seconds': 0.0}
+    bookmarks = []
+    start = time.perf_counter()
+    
+    if matplotlib_document:
+        from matplotlib.backends.backend_pdf import PdfPages
+        # matplotlib has no outline API; the bookmarks are added once the PDF is written
+        rendered = io.BytesIO()
+        document = PdfPages(rendered)
+    else:
+        document = canvas.Canvas(output, pagesize=A4)
+    
+    with open_workbook(workbook) as excel_file:
+        if isinstance(workbook, (str, os.PathLike)):
+            print(f"Processing Excel file: {os.path.basename(workbook)} (combined)")
+        print(f"Found {len(excel_file.sheet_names)} sheets: {excel_file.sheet_names}")
+        
+        for sheet_name, df, sheet_parse_seconds in iter_excel_sheets(excel_file, observer):
+            result['parse_seconds'] += sheet_parse_seconds
             
-            created_pdfs.append(output_path)
-            print(f"✓ Created PDF: {output_filename}")
+            if df.empty:
+                print(f"Sheet '{sheet_name}' is empty, skipping...")
+                continue
             
-        except Exception as e:
-            print(f"✗ Error processing sheet '{sheet_name}': {str(e)}")
+            try:
+                with stage(observer, 'render', sheet=sheet_name):
+                    if matplotlib_document:
+                        first_page = document.get_pagecount()
+                        draw_sheet(document, df, sheet_name)
+                        bookmarks.append((sheet_name, first_page))
+                        pages = document.get_pagecount() - first_page
+                    else:
+                        first_page = document.getPageNumber()
+                        key = f"sheet{len(result['sheets'])}"
+                        document.bookmarkPage(key)
+                        draw_sheet(document, df, sheet_name)
+                        document.addOutlineEntry(sheet_name, key, level=0)
+                        pages = document.getPageNumber() - first_page
+                
+                result['sheets'].append(sheet_name)
+                result['rows'] += len(df)
+                print(f"✓ Added sheet: {sheet_name}")
+                emit(observer, 'pages', count=pages, sheet=sheet_name)
+                emit(observer, 'rows', count=len(df), sheet=sheet_name)
+                
+            except Exception as e:
+                print(f"✗ Error processing sheet '{sheet_name}': {str(e)}")
+                # Don't let the next sheet draw over a half-finished page
+                if not matplotlib_document and document._code:
+                    document.showPage()
     
-    return created_pdfs
+    with stage(observer, 'write'):
+        if matplotlib_document:
+            document.close()
+            _write_with_outline(rendered.getvalue(), output, bookmarks)
+        else:
+            document.showOutline()
+            document.save()
+    
+    result['pdfs'] = [output] if isinstance(output, (str, os.PathLike)) else []
+    if observer is not None:
+        emit(observer, 'bytes', count=os.path.getsize(output) if result['pdfs'] else output.tell())
+    result['render_seconds'] = time.perf_counter() - start - result['parse_seconds']
+    print(f"Parse time: {result['parse_seconds']:.2f}s, render time: {result['render_seconds']:.2f}s")
+    return result
 
-def excel_to_pdf_reportlab(excel_file_path, output_dir=None):
+def convert_workbook_combined(workbook, output, backend='reportlab', observer=None):
     """
-    Convert Excel file to PDF using ReportLab (better for text-heavy data)
+    Convert every sheet of an Excel workbook into one PDF with a bookmark per sheet
+    
+    Args:
+        workbook (str, bytes or file-like): Workbook path, contents or binary file object
+        output (str or file-like): Path or writable binary stream for the PDF
+        backend (str): One of COMBINED_DRAWERS
+        observer (callable): Receives stage timings and counts (optional)
+    
+    Returns:
+        dict: 'pdfs' (the output path, if one was given), 'sheets', 'rows',
+            'parse_seconds' and 'render_seconds'
+    """
+    if backend not in COMBINED_DRAWERS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from: {', '.join(COMBINED_DRAWERS)}")
+    
+    return _convert_workbook_combined(workbook, output, COMBINED_DRAWERS[backend],
+                                      backend.startswith('matplotlib'), observer)
+
+def _combined_output_path(excel_file_path, output_dir, overwrite=False):
+    """Pick a PDF path named after the workbook for combined output"""
+    if output_dir is None:
+        output_dir = os.path.dirname(excel_file_path) or '.'
+    
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+    
+    return _unique_output_path(output_dir, Path(excel_file_path).stem, overwrite=overwrite)
+
+def excel_to_pdf_reportlab_streaming(excel_file_path, output_dir=None, rows_per_page=None, observer=None):
+    """
+    Convert Excel file to PDF using ReportLab, streaming rows for very large sheets
+    
+    Rows are read in page-sized chunks through openpyxl read-only mode and
+    drawn as fixed-size tables with the header repeated on every page, so
+    memory stays bounded whatever the row count. Only .xlsx files are supported.
     
     Args:
         excel_file_path (str): Path to the Excel file
         output_dir (str): Directory to save PDF files (optional)
+        rows_per_page (int): Data rows per page, capped to what fits on A4 (optional)
+        observer (callable): Receives stage timings and counts; reading rows is
+            part of the 'render' stage since it is interleaved with drawing (optional)
     
     Returns:
         list: List of created PDF file paths
@@ -103,96 +1214,81 @@ def excel_to_pdf_reportlab(excel_file_path, output_dir=None):
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    # Read all sheets from Excel file
-    excel_file = pd.ExcelFile(excel_file_path)
     created_pdfs = []
+    reserved_paths = set()
+    start = time.perf_counter()
+    total_rows = 0
     
-    print(f"Processing Excel file: {os.path.basename(excel_file_path)}")
-    print(f"Found {len(excel_file.sheet_names)} sheets: {excel_file.sheet_names}")
+    print(f"Processing Excel file: {os.path.basename(excel_file_path)} (streaming)")
     
-    for sheet_name in excel_file.sheet_names:
+    for sheet_name, header, rows in iter_excel_rows(excel_file_path):
+        if header is None:
+            print(f"Sheet '{sheet_name}' is empty, skipping...")
+            continue
+        
+        output_path = _unique_output_path(output_dir, sheet_name, reserved_paths)
         try:
-            # Read the sheet
-            df = pd.read_excel(excel_file_path, sheet_name=sheet_name)
-            
-            if df.empty:
-                print(f"Sheet '{sheet_name}' is empty, skipping...")
-                continue
-            
-            # Generate output filename
-            safe_sheet_name = "".join(c for c in sheet_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            output_filename = f"{safe_sheet_name}.pdf"
-            output_path = os.path.join(output_dir, output_filename)
-            
-            # Ensure unique filename
-            counter = 1
-            while os.path.exists(output_path):
-                output_filename = f"{safe_sheet_name}_{counter}.pdf"
-                output_path = os.path.join(output_dir, output_filename)
-                counter += 1
-            
-            # Create PDF document
-            doc = SimpleDocTemplate(output_path, pagesize=A4)
-            styles = getSampleStyleSheet()
-            story = []
-            
-            # Add title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=16,
-                spaceAfter=30,
-                alignment=1  # Center alignment
-            )
-            title = Paragraph(f"Sheet: {sheet_name}", title_style)
-            story.append(title)
-            story.append(Spacer(1, 20))
-            
-            # Convert DataFrame to list of lists for table
-            table_data = [df.columns.tolist()] + df.values.tolist()
-            
-            # Create table
-            table = Table(table_data)
-            
-            # Style the table
-            table_style = TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.green),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ])
-            table.setStyle(table_style)
-            
-            story.append(table)
-            
-            # Build PDF
-            doc.build(story)
+            pdf_canvas = canvas.Canvas(output_path, pagesize=A4)
+            with stage(observer, 'render', sheet=sheet_name):
+                sheet_rows = _draw_streamed_sheet(pdf_canvas, sheet_name, header, rows, rows_per_page)
+            pages = pdf_canvas.getPageNumber() - 1
+            with stage(observer, 'write', sheet=sheet_name):
+                pdf_canvas.save()
             
+            total_rows += sheet_rows
             created_pdfs.append(output_path)
-            print(f"✓ Created PDF: {output_filename}")
+            print(f"✓ Created PDF: {os.path.basename(output_path)} ({sheet_rows:,} rows)")
+            if observer is not None:
+                _report_sheet(observer, sheet_name, sheet_rows, {'pages': pages, 'stages': {}},
+                              os.path.getsize(output_path))
             
         except Exception as e:
             print(f"✗ Error processing sheet '{sheet_name}': {str(e)}")
     
+    elapsed = time.perf_counter() - start
+    print(f"Streamed {total_rows:,} rows in {elapsed:.2f}s")
     return created_pdfs
 
+# Menu choices a conversion daemon can run, and their backends
+DAEMON_CHOICES = {"1": 'matplotlib', "2": 'reportlab', "4": 'canvas'}
+
+def _convert_in_daemon(excel_file_path, output_dir, backend, cache_dir, combined, workers=None):
+    """Convert in a running daemon (see pdf_daemon); returns the created PDFs, or None if none is running"""
+    from pdf_daemon import DaemonNotRunning, submit_job
+    
+    try:
+        result = submit_job('convert', excel_file=excel_file_path, output_dir=output_dir, backend=backend,
+                            cache_dir=cache_dir, combined=combined, workers=workers)
+    except DaemonNotRunning:
+        return None
+    return result['pdfs']
+
 def main():
     """Main function to handle user input and process Excel files"""
+    parser = argparse.ArgumentParser(description="Convert each sheet of an Excel file to PDF")
+    parser.add_argument("excel_file", nargs="?", help="Path to the Excel file")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Render sheets in parallel with this many processes")
+    parser.add_argument("-p", "--paginate", action="store_true",
+                        help="Split large sheets over multiple pages (Matplotlib method)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Reuse PDFs of unchanged sheets from this cache directory")
+    parser.add_argument("-c", "--combined", action="store_true",
+                        help="Write all sheets into one PDF with a bookmark per sheet")
+    parser.add_argument("-O", "--optimize", action="store_true",
+                        help="Recompress the PDFs and write them with object and xref streams")
+    parser.add_argument("--compression-level", type=int, default=6, choices=range(1, 10), metavar="1-9",
+                        help="zlib level for --optimize (default: 6)")
+    parser.add_argument("-L", "--linearize", action="store_true",
+                        help="Write the PDFs linearized for fast web view (e.g. the --combined file)")
+    args = parser.parse_args()
+    
     print("Excel to PDF Converter")
     print("=" * 50)
     
     # Get Excel file path
-    if len(sys.argv) > 1:
-        excel_file_path = sys.argv[1]
+    if args.excel_file:
+        excel_file_path = args.excel_file
     else:
         excel_file_path = input("Enter the path to your Excel file: ").strip()
     
@@ -214,22 +1310,53 @@ def main():
     print("\nChoose conversion method:")
     print("1. Matplotlib (better for data visualization)")
     print("2. ReportLab (better for text-heavy data)")
+    print("3. ReportLab streaming (very large sheets, .xlsx only)")
+    print("4. Canvas (fastest, plain styling for large data dumps)")
     
-    choice = input("Enter your choice (1 or 2): ").strip()
+    choice = input("Enter your choice (1-4): ").strip()
     
     try:
-        if choice == "1":
-            created_pdfs = excel_to_pdf_matplotlib(excel_file_path, output_dir)
-        elif choice == "2":
-            created_pdfs = excel_to_pdf_reportlab(excel_file_path, output_dir)
-        else:
-            print("Invalid choice. Using Matplotlib as default.")
-            created_pdfs = excel_to_pdf_matplotlib(excel_file_path, output_dir)
+        # A running daemon converts with workers that are already warm
+        created_pdfs = None
+        if choice in DAEMON_CHOICES:
+            backend = 'matplotlib-paginated' if choice == "1" and args.paginate else DAEMON_CHOICES[choice]
+            created_pdfs = _convert_in_daemon(excel_file_path, output_dir, backend, args.cache_dir, args.combined,
+                                              args.workers)
+        
+        if created_pdfs is None:
+            if choice == "1":
+                created_pdfs = excel_to_pdf_matplotlib(excel_file_path, output_dir, workers=args.workers,
+                                                       paginate=args.paginate, cache_dir=args.cache_dir,
+                                                       combined=args.combined)
+            elif choice == "2":
+                created_pdfs = excel_to_pdf_reportlab(excel_file_path, output_dir, workers=args.workers,
+                                                      cache_dir=args.cache_dir, combined=args.combined)
+            elif choice == "3":
+                created_pdfs = excel_to_pdf_reportlab_streaming(excel_file_path, output_dir)
+            elif choice == "4":
+                created_pdfs = excel_to_pdf_canvas(excel_file_path, output_dir, workers=args.workers,
+                                                   cache_dir=args.cache_dir, combined=args.combined)
+            else:
+                print("Invalid choice. Using Matplotlib as default.")
+                created_pdfs = excel_to_pdf_matplotlib(excel_file_path, output_dir, workers=args.workers,
+                                                       paginate=args.paginate, cache_dir=args.cache_dir,
+                                                       combined=args.combined)
         
         print(f"\n✓ Successfully created {len(created_pdfs)} PDF files!")
         print("Created files:")
         for pdf_path in created_pdfs:
             print(f"  - {os.path.basename(pdf_path)}")
+        
+        if args.optimize and created_pdfs:
+            from pdf_optimize import optimize_pdfs
+            print("\nOptimizing PDFs...")
+            optimize_pdfs(created_pdfs, level=args.compression_level)
+        
+        if args.linearize and created_pdfs:
+            from pdf_linearize import linearize_pdf
+            print("\nLinearizing PDFs...")
+            for pdf_path in created_pdfs:
+                linearize_pdf(pdf_path)
             
     except Exception as e:
         print(f"Error processing Excel file: {str(e)}")
@@ -0,0 +1,916 @@
+#!/usr/bin/env python3
+"""
+Advanced Excel to PDF Converter
+Converts each sheet of an Excel workbook to PDF while preserving cell fills,
+fonts, number formats, borders, alignment, column widths, row heights and
+merged cells.
+
+Cell styles are interned, so each distinct combination is translated from
+openpyxl once. Every style property (fill, font, text color, borders, ...) is
+then covered with rectangles of adjacent cells sharing the same value, and each
+rectangle becomes one TableStyle range command. A formatted sheet costs a few
+commands per page instead of one command per cell.
+"""
+
+import datetime
+import os
+import re
+import sys
+from functools import lru_cache
+
+import numpy as np
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.styles.colors import COLOR_INDEX
+from openpyxl.utils import get_column_letter
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Table
+
+from excel_to_pdf import _unique_output_path
+from instrumentation import emit, stage
+
+# Default Office theme colors by theme index: light 1, dark 1, light 2, dark 2,
+# accents 1-6, hyperlink and followed hyperlink
+_THEME_COLORS = ['FFFFFF', '000000', 'E7E6E6', '44546A', '4472C4', 'ED7D31',
+                 'A5A5A5', 'FFC000', '5B9BD5', '70AD47', '0563C1', '954F72']
+
+# Standard PDF fonts standing in for workbook fonts: (regular, bold, italic, bold italic)
+_SANS_FONTS = ('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique', 'Helvetica-BoldOblique')
+_SERIF_FONTS = ('Times-Roman', 'Times-Bold', 'Times-Italic', 'Times-BoldItalic')
+_MONOSPACE_FONTS = ('Courier', 'Courier-Bold', 'Courier-Oblique', 'Courier-BoldOblique')
+_SERIF_FAMILIES = {'times new roman', 'times', 'cambria', 'georgia', 'garamond', 'book antiqua',
+                   'palatino linotype', 'constantia'}
+_MONOSPACE_FAMILIES = {'courier new', 'courier', 'consolas', 'lucida console', 'menlo'}
+
+# Line widths in points for Excel border styles
+_BORDER_WIDTHS = {
+    'hair': 0.25, 'thin': 0.5, 'dotted': 0.5, 'dashed': 0.5, 'dashDot': 0.5, 'dashDotDot': 0.5,
+    'medium': 1.0, 'mediumDashed': 1.0, 'mediumDashDot': 1.0, 'mediumDashDotDot': 1.0,
+    'slantDashDot': 1.0, 'thick': 1.5, 'double': 1.5,
+}
+
+_HORIZONTAL_ALIGN = {'left': 'LEFT', 'right': 'RIGHT', 'center': 'CENTER', 'centerContinuous': 'CENTER',
+                     'justify': 'LEFT', 'distributed': 'CENTER', 'fill': 'LEFT'}
+_VERTICAL_ALIGN = {'top': 'TOP', 'center': 'MIDDLE', 'justify': 'MIDDLE', 'distributed': 'MIDDLE',
+                   'bottom': 'BOTTOM'}
+
+# Style properties, in the order they are stored in an interned cell style
+_PROPERTIES = ('background', 'text_color', 'font', 'font_size', 'align', 'valign',
+               'top', 'bottom', 'left', 'right')
+
+# Excel column width (in characters of the default font) and row height defaults
+_DEFAULT_COLUMN_WIDTH = 8.43
+_DEFAULT_ROW_HEIGHT = 15.0
+_PAGE_MARGIN = inch / 2
+_TITLE_HEIGHT = 40
+
+
+class _Interner:
+    """
+    Assigns a small integer id to each distinct value, in first-seen order
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def intern(self, value):
+        """Return the id of a value, adding it if it is new"""
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+
+@lru_cache(maxsize=None)
+def _color_hex(kind, value, tint):
+    """Resolve an openpyxl color reference to '#RRGGBB', or None if it has no fixed color"""
+    try:
+        if kind == 'rgb':
+            hex_value = value[-6:]
+        elif kind == 'indexed':
+            # 64 and 65 are the system foreground and background colors
+            if value >= len(COLOR_INDEX):
+                return None
+            hex_value = COLOR_INDEX[value][-6:]
+        elif kind == 'theme':
+            if value >= len(_THEME_COLORS):
+                return None
+            hex_value = _THEME_COLORS[value]
+        else:
+            return None
+        channels = [int(hex_value[i:i + 2], 16) for i in (0, 2, 4)]
+    except (TypeError, ValueError):
+        return None
+
+    # Tints lighten towards white or darken towards black
+    if tint > 0:
+        channels = [round(c + (255 - c) * tint) for c in channels]
+    elif tint < 0:
+        channels = [round(c * (1 + tint)) for c in channels]
+    return '#%02X%02X%02X' % tuple(channels)
+
+def _resolve_color(color):
+    """Convert an openpyxl Color to '#RRGGBB', or None"""
+    if color is None:
+        return None
+    return _color_hex(color.type, color.value, color.tint or 0.0)
+
+@lru_cache(maxsize=None)
+def _reportlab_color(hex_value):
+    """ReportLab color object for a '#RRGGBB' string"""
+    return colors.HexColor(hex_value)
+
+def _pdf_font(font):
+    """Pick the standard PDF font closest to an openpyxl font"""
+    family = (font.name or '').lower()
+    if family in _SERIF_FAMILIES:
+        variants = _SERIF_FONTS
+    elif family in _MONOSPACE_FAMILIES:
+        variants = _MONOSPACE_FONTS
+    else:
+        variants = _SANS_FONTS
+    return variants[bool(font.b) + 2 * bool(font.i)]
+
+def _border_side(side, scale):
+    """(line width, color) of one side of a cell border, or None if it is not drawn"""
+    if side is None or side.style is None:
+        return None
+    width = _BORDER_WIDTHS.get(side.style, 0.5) * scale
+    return (width, _resolve_color(side.color) or '#000000')
+
+def _fill_color(fill):
+    """Background color of a cell fill, or None for no fill"""
+    if getattr(fill, 'patternType', None) is not None:
+        # Patterned fills are drawn as a solid fill in the pattern color
+        return _resolve_color(fill.fgColor) or _resolve_color(fill.bgColor)
+    stops = getattr(fill, 'stop', None)
+    if stops:
+        return _resolve_color(stops[0].color)
+    return None
+
+def _cell_style(cell, numeric, scale):
+    """
+    Translate the formatting of a cell into the style properties drawn in the PDF
+
+    Args:
+        cell (openpyxl Cell): Cell to translate
+        numeric (bool): The cell holds a number or date (right-aligned by default)
+        scale (float): Factor applied to font sizes and line widths
+
+    Returns:
+        tuple: Property values in _PROPERTIES order
+    """
+    font = cell.font
+    alignment = cell.alignment
+    border = cell.border
+
+    horizontal = _HORIZONTAL_ALIGN.get(alignment.horizontal)
+    if horizontal is None:
+        # Excel's "general" alignment: numbers to the right, text to the left
+        horizontal = 'RIGHT' if numeric else 'LEFT'
+
+    return (
+        _fill_color(cell.fill),
+        _resolve_color(font.color) or '#000000',
+        _pdf_font(font),
+        round((font.sz or 11) * scale, 2),
+        horizontal,
+        _VERTICAL_ALIGN.get(alignment.vertical, 'BOTTOM'),
+        _border_side(border.top, scale),
+        _border_side(border.bottom, scale),
+        _border_side(border.left, scale),
+        _border_side(border.right, scale),
+    )
+
+
+_FORMAT_SECTION = re.compile(r'"[^"]*"|\\.|;|[^";\\]+')
+_BRACKET = re.compile(r'\[([^\]]*)\]')
+_DATE_TOKEN = re.compile(r'"[^"]*"|\\.|\[[^\]]*\]|yyyy|yy|mmmmm|mmmm|mmm|mm|m|dddd|ddd|dd|d|hh|h|ss|s|'
+                         r'am/pm|a/p|\.0+|.', re.IGNORECASE)
+_NUMBER_TOKEN = re.compile(r'"[^"]*"|\\.|_.|\*.|[0#?,.]+|.')
+
+def _format_sections(number_format):
+    """Split a number format into its ;-separated sections, ignoring quoted semicolons"""
+    sections = ['']
+    for token in _FORMAT_SECTION.findall(number_format):
+        if token == ';':
+            sections.append('')
+        else:
+            sections[-1] += token
+    return sections
+
+def _strip_brackets(section):
+    """Drop colors and conditions from a format section, keeping currency symbols like [$€-407]"""
+    def replace(match):
+        content = match.group(1)
+        if content.startswith('$'):
+            return '"' + content[1:].split('-')[0] + '"'
+        if content.lower() in ('h', 'hh', 'm', 'mm', 's', 'ss'):
+            return match.group(0)  # Elapsed time
+        return ''
+    return _BRACKET.sub(replace, section)
+
+def _is_date_section(section):
+    """Check whether a format section formats dates or times"""
+    unquoted = re.sub(r'"[^"]*"|\\.', '', section).lower()
+    return any(token in unquoted for token in 'dmyhs') and not any(c in unquoted for c in '0#?')
+
+def _format_general(value):
+    """Format a number the way Excel's General format shows it"""
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 1e15:
+            return str(int(value))
+        return f"{value:.10g}"
+    return str(value)
+
+def _format_datetime_default(value):
+    """Format a date or time that has no date format"""
+    if isinstance(value, datetime.datetime):
+        if value.time() == datetime.time(0):
+            return value.strftime('%Y-%m-%d')
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value.isoformat()
+
+def _compile_number_section(section):
+    """Build a function formatting a non-negative number with one format section"""
+    prefix, suffix = [], []
+    pattern = None
+    percent = False
+
+    for token in _NUMBER_TOKEN.findall(section):
+        if token[0] == '"':
+            literal = token[1:-1]
+        elif token[0] == '\\':
+            literal = token[1]
+        elif token[0] == '_':
+            literal = ' '
+        elif token[0] == '*':
+            literal = ''
+        elif token[0] in '0#?,.' and pattern is None and any(c in token for c in '0#?'):
+            pattern = token
+            continue
+        else:
+            literal = token
+            if token == '%':
+                percent = True
+        (prefix if pattern is None else suffix).append(literal)
+
+    prefix, suffix = ''.join(prefix), ''.join(suffix)
+    if pattern is None:
+        return lambda value: prefix + suffix
+
+    # Trailing commas scale by thousands; commas between digits group thousands
+    scale_down = len(pattern) - len(pattern.rstrip(','))
+    pattern = pattern.rstrip(',')
+    integer_part, _, decimal_part = pattern.partition('.')
+    grouping = ',' if ',' in integer_part else ''
+    decimals = sum(c in '0#?' for c in decimal_part)
+    min_decimals = decimal_part.count('0')
+    min_integer = integer_part.count('0')
+
+    def format_number(value):
+        if percent:
+            value *= 100
+        if scale_down:
+            value /= 1000 ** scale_down
+        text = f"{value:{grouping}.{decimals}f}"
+        if decimals > min_decimals:
+            whole, _, fraction = text.partition('.')
+            fraction = fraction.rstrip('0').ljust(min_decimals, '0')
+            text = f"{whole}.{fraction}" if fraction else whole
+        whole, dot, fraction = text.partition('.')
+        if min_integer == 0 and whole == '0':
+            whole = ''
+        elif min_integer > 1:
+            whole = whole.rjust(min_integer + whole.count(','), '0')
+        return f"{prefix}{whole}{dot}{fraction}{suffix}"
+    return format_number
+
+def _compile_date_section(section):
+    """Build a function formatting a date, time or datetime with one format section"""
+    tokens = _DATE_TOKEN.findall(section)
+    twelve_hour = any(token.lower() in ('am/pm', 'a/p') for token in tokens)
+    parts = []
+
+    for index, token in enumerate(tokens):
+        lower = token.lower()
+        if token[0] == '"':
+            parts.append(token[1:-1])
+        elif token[0] == '\\':
+            parts.append(token[1])
+        elif lower in ('mm', 'm'):
+            # m is minutes right after an hour or right before seconds
+            before = [t.lower() for t in tokens[:index] if t.strip() and t not in ':.']
+            after = [t.lower() for t in tokens[index + 1:] if t.strip() and t not in ':.']
+            minutes = (before and before[-1].strip('[]') in ('h', 'hh')) or \
+                (after and after[0].strip('[]') in ('s', 'ss'))
+            parts.append(('minute' if minutes else 'month', len(token)))
+        elif lower in ('yyyy', 'yy', 'mmm', 'mmmm', 'mmmmm', 'd', 'dd', 'ddd', 'dddd',
+                       'h', 'hh', 's', 'ss', '[h]', '[hh]', 'am/pm', 'a/p'):
+            parts.append((lower, len(token)))
+        elif lower.startswith('[') or lower.startswith('.0'):
+            continue
+        else:
+            parts.append(token)
+
+    def format_date(value):
+        if isinstance(value, datetime.time):
+            value = datetime.datetime.combine(datetime.date(1899, 12, 31), value)
+        if isinstance(value, datetime.timedelta):
+            value = datetime.datetime(1899, 12, 31) + value
+        if not isinstance(value, datetime.datetime):
+            value = datetime.datetime.combine(value, datetime.time(0))
+
+        out = []
+        for part in parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            kind, width = part
+            if kind == 'yyyy':
+                out.append(f"{value.year:04d}")
+            elif kind == 'yy':
+                out.append(f"{value.year % 100:02d}")
+            elif kind == 'month':
+                out.append(f"{value.month:0{width}d}")
+            elif kind == 'mmm':
+                out.append(value.strftime('%b'))
+            elif kind == 'mmmm':
+                out.append(value.strftime('%B'))
+            elif kind == 'mmmmm':
+                out.append(value.strftime('%B')[0])
+            elif kind in ('d', 'dd'):
+                out.append(f"{value.day:0{width}d}")
+            elif kind == 'ddd':
+                out.append(value.strftime('%a'))
+            elif kind == 'dddd':
+                out.append(value.strftime('%A'))
+            elif kind in ('h', 'hh', '[h]', '[hh]'):
+                hour = value.hour
+                if twelve_hour:
+                    hour = hour % 12 or 12
+                out.append(f"{hour:0{2 if 'hh' in kind else 1}d}")
+            elif kind == 'minute':
+                out.append(f"{value.minute:0{width}d}")
+            elif kind in ('s', 'ss'):
+                out.append(f"{value.second:0{width}d}")
+            elif kind == 'am/pm':
+                out.append('AM' if value.hour < 12 else 'PM')
+            elif kind == 'a/p':
+                out.append('A' if value.hour < 12 else 'P')
+        return ''.join(out)
+    return format_date
+
+@lru_cache(maxsize=None)
+def _number_formatter(number_format):
+    """
+    Compile an Excel number format into a function that formats a cell value
+
+    Covers the formats used in practice: General, fixed decimals, thousands
+    separators, percentages, currency prefixes and suffixes, negative and zero
+    sections, and date and time formats. Colors and conditions are ignored.
+
+    Args:
+        number_format (str): Excel number format code
+
+    Returns:
+        callable: Function taking a cell value and returning its text
+    """
+    if not number_format or number_format in ('General', '@'):
+        return _format_value_general
+
+    sections = [_strip_brackets(section) for section in _format_sections(number_format)]
+    if _is_date_section(sections[0]):
+        format_date = _compile_date_section(sections[0])
+        def format_value(value):
+            if isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+                return format_date(value)
+            return _format_value_general(value)
+        return format_value
+
+    positive = _compile_number_section(sections[0])
+    negative = _compile_number_section(sections[1]) if len(sections) > 1 else None
+    zero = _compile_number_section(sections[2]) if len(sections) > 2 else None
+
+    def format_value(value):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return _format_value_general(value)
+        if value < 0:
+            return negative(-value) if negative else '-' + positive(-value)
+        if value == 0 and zero:
+            return zero(value)
+        return positive(value)
+    return format_value
+
+def _format_value_general(value):
+    """Text of a cell value without a specific number format"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, (int, float)):
+        return _format_general(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return _format_datetime_default(value)
+    return str(value)
+
+
+def _rectangles(grid):
+    """
+    Cover a 2-D grid of value ids with rectangles of equal values
+
+    Each row is split into runs of equal values. A run extends the rectangle
+    above it when that rectangle covers exactly the same columns with the same
+    value, so uniform blocks, stripes and columns each become one rectangle.
+
+    Args:
+        grid (np.ndarray): 2-D array of value ids
+
+    Yields:
+        tuple: (value_id, first_row, last_row, first_col, last_col)
+    """
+    row_count, col_count = grid.shape
+    open_rectangles = {}
+
+    for row_index in range(row_count):
+        row = grid[row_index]
+        boundaries = (np.flatnonzero(row[1:] != row[:-1]) + 1).tolist()
+        starts = [0] + boundaries
+        ends = boundaries + [col_count]
+        values = row[starts].tolist()
+
+        current = {}
+        for start, end, value in zip(starts, ends, values):
+            key = (start, end - 1, value)
+            current[key] = open_rectangles.pop(key, row_index)
+
+        # Rectangles not continued by this row are complete
+        for (first_col, last_col, value), first_row in open_rectangles.items():
+            yield value, first_row, row_index - 1, first_col, last_col
+        open_rectangles = current
+
+    for (first_col, last_col, value), first_row in open_rectangles.items():
+        yield value, first_row, row_count - 1, first_col, last_col
+
+def _style_commands(style_grid, styles):
+    """
+    Build TableStyle commands for a block of cells from their interned styles
+
+    For each property the most common value is applied to the whole block with
+    one command, and every rectangle of another value gets one command. When
+    some cells lack the property (no fill, no border) there is no block-wide
+    command and only the rectangles that have a value are styled.
+
+    Args:
+        style_grid (np.ndarray): 2-D array of cell style ids
+        styles (list): Interned style tuples, indexed by style id
+
+    Returns:
+        list: TableStyle commands
+    """
+    commands = []
+    last_row, last_col = style_grid.shape[0] - 1, style_grid.shape[1] - 1
+
+    for position, name in enumerate(_PROPERTIES):
+        values = _Interner()
+        lookup = np.array([values.intern(style[position]) for style in styles], dtype=np.int32)
+        property_grid = lookup[style_grid]
+        # A block-wide base would also cover cells without the property
+        base = values.ids.get(None)
+        if base is None or not (property_grid == base).any():
+            base = int(np.bincount(property_grid.ravel()).argmax())
+
+        if values.values[base] is not None:
+            commands.extend(_property_commands(name, values.values[base], 0, last_row, 0, last_col))
+        for value_id, first_row, end_row, first_col, end_col in _rectangles(property_grid):
+            if value_id != base and values.values[value_id] is not None:
+                commands.extend(_property_commands(name, values.values[value_id],
+                                                   first_row, end_row, first_col, end_col))
+    return commands
+
+def _property_commands(name, value, first_row, last_row, first_col, last_col):
+    """TableStyle commands applying one property value to a rectangle of cells"""
+    start, end = (first_col, first_row), (last_col, last_row)
+    if name == 'background':
+        return [('BACKGROUND', start, end, _reportlab_color(value))]
+    if name == 'text_color':
+        return [('TEXTCOLOR', start, end, _reportlab_color(value))]
+    if name == 'font':
+        return [('FONTNAME', start, end, value)]
+    if name == 'font_size':
+        return [('FONTSIZE', start, end, value)]
+    if name == 'align':
+        return [('ALIGN', start, end, value)]
+    if name == 'valign':
+        return [('VALIGN', start, end, value)]
+
+    width, color = value
+    line = {'top': 'LINEABOVE', 'bottom': 'LINEBELOW', 'left': 'LINEBEFORE', 'right': 'LINEAFTER'}[name]
+    return [(line, start, end, width, _reportlab_color(color))]
+
+
+def _column_widths(worksheet, columns):
+    """Width in points of each visible column, from the sheet's column dimensions"""
+    default = worksheet.sheet_format.defaultColWidth or _DEFAULT_COLUMN_WIDTH
+    widths = {}
+    for dimension in worksheet.column_dimensions.values():
+        if dimension.min is None or not dimension.customWidth:
+            continue
+        for index in range(dimension.min, dimension.max + 1):
+            widths[index] = dimension.width
+
+    # Excel draws a column of n characters as about 7n + 5 pixels
+    return [((widths.get(index, default)) * 7 + 5) * 0.75 for index in columns]
+
+def _row_heights(worksheet, rows):
+    """Height in points of each visible row, from the sheet's row dimensions"""
+    default = worksheet.sheet_format.defaultRowHeight or _DEFAULT_ROW_HEIGHT
+    heights = []
+    for index in rows:
+        dimension = worksheet.row_dimensions.get(index)
+        heights.append(dimension.ht if dimension is not None and dimension.ht else default)
+    return heights
+
+def _hidden(dimensions, index):
+    """Check whether a row or column is hidden"""
+    dimension = dimensions.get(index)
+    return dimension is not None and dimension.hidden
+
+def _read_sheet(worksheet, scale_for_width):
+    """
+    Read the visible cells of a sheet as text plus an interned style per cell
+
+    Args:
+        worksheet (openpyxl Worksheet): Sheet to read
+        scale_for_width (callable): Given the column widths in points, returns
+            the factor applied to widths, heights, font sizes and line widths
+
+    Returns:
+        dict: 'texts' (list of rows), 'style_grid' (np.ndarray of style ids),
+            'styles' (interned style tuples), 'col_widths', 'row_heights',
+            'rows' and 'columns' (sheet indexes of the visible rows and columns)
+            and 'scale'
+    """
+    max_row, max_col = worksheet.max_row, worksheet.max_column
+    hidden_columns = {index for index in range(1, max_col + 1)
+                      if _hidden(worksheet.column_dimensions, get_column_letter(index))}
+    columns = [index for index in range(1, max_col + 1) if index not in hidden_columns]
+    rows = [index for index in range(1, max_row + 1)
+            if not _hidden(worksheet.row_dimensions, index)]
+
+    col_widths = _column_widths(worksheet, columns)
+    scale = scale_for_width(col_widths)
+    col_widths = [width * scale for width in col_widths]
+    row_heights = [height * scale for height in _row_heights(worksheet, rows)]
+
+    styles = _Interner()
+    # Raw openpyxl style (plus whether the value is numeric) -> interned style id
+    style_ids = {}
+    style_grid = np.zeros((len(rows), len(columns)), dtype=np.int32)
+    texts = []
+    visible_rows = set(rows)
+    column_positions = [index - 1 for index in columns]
+
+    out_row = 0
+    for sheet_row, cells in enumerate(worksheet.iter_rows(min_row=1, max_row=max_row, max_col=max_col), 1):
+        if sheet_row not in visible_rows:
+            continue
+        row_texts = []
+        row_styles = style_grid[out_row]
+        for out_col, position in enumerate(column_positions):
+            cell = cells[position]
+            value = cell.value
+            numeric = isinstance(value, (int, float, datetime.date, datetime.time)) and not isinstance(value, bool)
+            raw_style = cell._style
+            key = (tuple(raw_style) if raw_style is not None else None, numeric)
+            style_id = style_ids.get(key)
+            if style_id is None:
+                style_id = style_ids[key] = styles.intern(_cell_style(cell, numeric, scale))
+            row_styles[out_col] = style_id
+            row_texts.append(_number_formatter(cell.number_format)(value) if value is not None else '')
+        texts.append(row_texts)
+        out_row += 1
+
+    return {
+        'texts': texts,
+        'style_grid': style_grid,
+        'styles': styles.values,
+        'col_widths': col_widths,
+        'row_heights': row_heights,
+        'rows': rows,
+        'columns': columns,
+        'scale': scale,
+    }
+
+def _merged_spans(worksheet, rows, columns):
+    """Merged ranges as (first_row, last_row, first_col, last_col) positions among the visible cells"""
+    row_positions = {index: position for position, index in enumerate(rows)}
+    col_positions = {index: position for position, index in enumerate(columns)}
+    spans = []
+    for merged in worksheet.merged_cells.ranges:
+        visible_rows = [row_positions[i] for i in range(merged.min_row, merged.max_row + 1) if i in row_positions]
+        visible_cols = [col_positions[i] for i in range(merged.min_col, merged.max_col + 1) if i in col_positions]
+        if visible_rows and visible_cols:
+            spans.append((visible_rows[0], visible_rows[-1], visible_cols[0], visible_cols[-1]))
+    return spans
+
+def _page_chunks(row_heights, header_rows, first_height, page_height):
+    """Split the body rows into page-sized (start, end) ranges below the repeated header rows"""
+    header_height = sum(row_heights[:header_rows])
+    chunks = []
+    start = header_rows
+    available = first_height - header_height
+    while start < len(row_heights):
+        end = start
+        used = 0.0
+        # Always place at least one row, even if it is taller than the page
+        while end < len(row_heights) and (end == start or used + row_heights[end] <= available):
+            used += row_heights[end]
+            end += 1
+        chunks.append((start, end))
+        start = end
+        available = page_height - header_height
+    return chunks or [(header_rows, header_rows)]
+
+def _draw_advanced_sheet(pdf_canvas, worksheet, sheet, header_rows):
+    """
+    Draw a read sheet as one styled table per page, repeating the header rows
+
+    Args:
+        pdf_canvas (canvas.Canvas): Canvas to draw on; a new page is started after each page
+        worksheet (openpyxl Worksheet): Sheet the data came from (for merged cells)
+        sheet (dict): Result of _read_sheet
+        header_rows (int): Leading rows repeated at the top of every page
+
+    Returns:
+        int: Number of pages drawn
+    """
+    page_width, page_height = pdf_canvas._pagesize
+    usable_height = page_height - 2 * _PAGE_MARGIN
+    header_rows = min(header_rows, len(sheet['texts']))
+    spans = _merged_spans(worksheet, sheet['rows'], sheet['columns'])
+    chunks = _page_chunks(sheet['row_heights'], header_rows, usable_height - _TITLE_HEIGHT, usable_height)
+
+    for page, (start, end) in enumerate(chunks):
+        top = page_height - _PAGE_MARGIN
+        if page == 0:
+            pdf_canvas.setFont('Helvetica-Bold', 14)
+            pdf_canvas.drawString(_PAGE_MARGIN, top - 18, f"Sheet: {worksheet.title}")
+            top -= _TITLE_HEIGHT
+
+        selected = list(range(header_rows)) + list(range(start, end))
+        data = [sheet['texts'][row] for row in selected]
+        grid = sheet['style_grid'][selected]
+
+        commands = [
+            ('LEFTPADDING', (0, 0), (-1, -1), 2 * sheet['scale']),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 2 * sheet['scale']),
+            ('TOPPADDING', (0, 0), (-1, -1), 1),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 2 * sheet['scale']),
+        ]
+        commands.extend(_style_commands(grid, sheet['styles']))
+
+        # Merged cells, clipped to the rows on this page
+        positions = {row: position for position, row in enumerate(selected)}
+        for first_row, last_row, first_col, last_col in spans:
+            rows_here = [positions[row] for row in range(first_row, last_row + 1) if row in positions]
+            if rows_here and (len(rows_here) > 1 or first_col != last_col):
+                commands.append(('SPAN', (first_col, rows_here[0]), (last_col, rows_here[-1])))
+
+        table = Table(data, colWidths=sheet['col_widths'],
+                      rowHeights=[sheet['row_heights'][row] for row in selected])
+        table.setStyle(commands)
+        table_width, table_height = table.wrapOn(pdf_canvas, page_width - 2 * _PAGE_MARGIN, top - _PAGE_MARGIN)
+        table.drawOn(pdf_canvas, _PAGE_MARGIN, top - table_height)
+        pdf_canvas.showPage()
+
+    return len(chunks)
+
+def _page_setup(col_widths):
+    """Choose portrait or landscape A4 for a sheet and the factor that fits its columns on the page"""
+    total_width = sum(col_widths) or 1
+    if total_width <= A4[0] - 2 * _PAGE_MARGIN:
+        return A4, 1.0
+    pagesize = landscape(A4)
+    return pagesize, min(1.0, (pagesize[0] - 2 * _PAGE_MARGIN) / total_width)
+
+def excel_to_pdf_advanced(excel_file_path, output_dir=None, header_rows=1, observer=None):
+    """
+    Convert Excel file to PDF preserving the workbook's cell formatting
+
+    Fills, fonts (bold, italic, size, color), number formats, borders,
+    alignment, column widths, row heights and merged cells are carried over.
+    Hidden rows and columns are left out. Wide sheets are printed landscape
+    and scaled to the page width.
+
+    Args:
+        excel_file_path (str): Path to the .xlsx file
+        output_dir (str): Directory to save PDF files (optional)
+        header_rows (int): Leading rows repeated at the top of every page
+        observer (callable): Receives stage timings and row, page and byte
+            counts (see instrumentation) (optional)
+
+    Returns:
+        list: List of created PDF file paths
+    """
+    if output_dir is None:
+        output_dir = os.path.dirname(excel_file_path) or '.'
+
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+
+    created_pdfs = []
+    reserved_paths = set()
+
+    try:
+        with stage(observer, 'parse', file=excel_file_path):
+            workbook = load_workbook(excel_file_path, data_only=True)
+    except Exception as e:
+        print(f"✗ Error reading {os.path.basename(excel_file_path)}: {str(e)}")
+        return created_pdfs
+
+    print(f"Processing Excel file: {os.path.basename(excel_file_path)}")
+    print(f"Found {len(workbook.sheetnames)} sheets: {workbook.sheetnames}")
+
+    for worksheet in workbook.worksheets:
+        sheet_name = worksheet.title
+        if worksheet.max_row == 1 and worksheet.max_column == 1 and worksheet.cell(1, 1).value is None:
+            print(f"Sheet '{sheet_name}' is empty, skipping...")
+            continue
+
+        output_path = _unique_output_path(output_dir, sheet_name, reserved_paths)
+        try:
+            pagesize = [A4]
+            def scale_for_width(col_widths):
+                pagesize[0], scale = _page_setup(col_widths)
+                return scale
+
+            with stage(observer, 'layout', sheet=sheet_name):
+                sheet = _read_sheet(worksheet, scale_for_width)
+
+            pdf_canvas = canvas.Canvas(output_path, pagesize=pagesize[0])
+            with stage(observer, 'render', sheet=sheet_name):
+                pages = _draw_advanced_sheet(pdf_canvas, worksheet, sheet, header_rows)
+            with stage(observer, 'write', sheet=sheet_name):
+                pdf_canvas.save()
+
+            created_pdfs.append(output_path)
+            print(f"✓ Created PDF: {os.path.basename(output_path)} "
+                  f"({len(sheet['styles'])} distinct cell styles)")
+            emit(observer, 'rows', count=len(sheet['texts']), sheet=sheet_name)
+            emit(observer, 'pages', count=pages, sheet=sheet_name)
+            emit(observer, 'bytes', count=os.path.getsize(output_path), sheet=sheet_name)
+
+        except Exception as e:
+            print(f"✗ Error processing sheet '{sheet_name}': {str(e)}")
+
+    workbook.close()
+    return created_pdfs
+
+def create_sample_excel_with_formatting(filename='formatted_sample.xlsx', rows=200):
+    """
+    Create a sample Excel file with fills, fonts, number formats, borders and alignment
+
+    Args:
+        filename (str): Path of the workbook to create
+        rows (int): Data rows on the Sales sheet (enough for several pages by default)
+
+    Returns:
+        str: Path of the created workbook
+    """
+    workbook = Workbook()
+    thin = Side(style='thin', color='FFBFBFBF')
+    grid = Border(left=thin, right=thin, top=thin, bottom=thin)
+    header_font = Font(bold=True, color='FFFFFFFF')
+    header_fill = PatternFill('solid', fgColor='FF1F4E78')
+    stripe_fill = PatternFill('solid', fgColor='FFDDEBF7')
+    center = Alignment(horizontal='center', vertical='center')
+
+    # Sales sheet: currency, percentages, dates, striped rows and a totals row
+    sales = workbook.active
+    sales.title = 'Sales'
+    headers = ['Date', 'Region', 'Product', 'Units', 'Unit Price', 'Revenue', 'Margin', 'Status']
+    sales.append(headers)
+    for col, width in enumerate([12, 10, 14, 9, 12, 14, 9, 12], 1):
+        sales.column_dimensions[get_column_letter(col)].width = width
+        cell = sales.cell(1, col)
+        cell.font, cell.fill, cell.alignment, cell.border = header_font, header_fill, center, grid
+    sales.row_dimensions[1].height = 22
+
+    regions = ['North', 'South', 'East', 'West']
+    products = ['Laptop', 'Monitor', 'Keyboard', 'Headphones', 'Dock']
+    prices = [899.0, 249.5, 49.99, 129.0, 189.0]
+    for i in range(rows):
+        product = i % len(products)
+        units = 5 + (i * 37) % 120
+        margin = ((i * 53) % 45 - 8) / 100
+        row = 2 + i
+        sales.append([datetime.date(2024, 1, 1) + datetime.timedelta(days=i), regions[i % 4], products[product],
+                      units, prices[product], f"=D{row}*E{row}", margin,
+                      'Shipped' if i % 7 else 'Backorder'])
+        # Formulas have no cached value until Excel recalculates, so store the result too
+        sales.cell(row, 6).value = units * prices[product]
+        for col in range(1, len(headers) + 1):
+            cell = sales.cell(row, col)
+            cell.border = grid
+            if i % 2:
+                cell.fill = stripe_fill
+        sales.cell(row, 1).number_format = 'yyyy-mm-dd'
+        sales.cell(row, 4).number_format = '#,##0'
+        sales.cell(row, 5).number_format = '"$"#,##0.00'
+        sales.cell(row, 6).number_format = '"$"#,##0.00'
+        sales.cell(row, 7).number_format = '0.0%'
+        if margin < 0:
+            sales.cell(row, 7).font = Font(color='FFC00000', bold=True)
+        if i % 7 == 0:
+            sales.cell(row, 8).font = Font(italic=True, color='FF9C5700')
+            sales.cell(row, 8).fill = PatternFill('solid', fgColor='FFFFEB9C')
+        sales.cell(row, 8).alignment = Alignment(horizontal='center')
+
+    total_row = rows + 2
+    sales.cell(total_row, 1, 'Total')
+    sales.merge_cells(start_row=total_row, start_column=1, end_row=total_row, end_column=3)
+    sales.cell(total_row, 4, sum(5 + (i * 37) % 120 for i in range(rows))).number_format = '#,##0'
+    sales.cell(total_row, 6, sum((5 + (i * 37) % 120) * prices[i % len(products)] for i in range(rows)))
+    sales.cell(total_row, 6).number_format = '"$"#,##0.00'
+    double = Side(style='double', color='FF000000')
+    for col in range(1, len(headers) + 1):
+        cell = sales.cell(total_row, col)
+        cell.font = Font(bold=True)
+        cell.border = Border(top=double, bottom=Side(style='thick'))
+        cell.fill = PatternFill('solid', fgColor='FFF2F2F2')
+
+    # Employees sheet: theme colors, serif font, thousands separators and booleans
+    employees = workbook.create_sheet('Employees')
+    employees.append(['Name', 'Department', 'Start Date', 'Salary', 'Rating', 'Remote'])
+    for col in range(1, 7):
+        cell = employees.cell(1, col)
+        cell.font = Font(name='Cambria', bold=True, size=12, color='FF000000')
+        cell.fill = PatternFill('solid', fgColor='FFFFC000')
+        cell.border = Border(bottom=Side(style='medium'))
+    department_fills = {'Sales': 'FFE2EFDA', 'Marketing': 'FFFCE4D6', 'IT': 'FFD9E1F2', 'Finance': 'FFEDEDED'}
+    people = [('John Doe', 'Sales', 52000), ('Jane Smith', 'Marketing', 58500), ('Bob Johnson', 'IT', 71250),
+              ('Alice Brown', 'Finance', 64000), ('Charlie Wilson', 'IT', 69900), ('Dana White', 'Sales', 48750)]
+    for i, (name, department, salary) in enumerate(people):
+        employees.append([name, department, datetime.date(2018 + i, 1 + i, 3 + i), salary,
+                          3.25 + i * 0.3, i % 2 == 0])
+        row = i + 2
+        for col in range(1, 7):
+            employees.cell(row, col).fill = PatternFill('solid', fgColor=department_fills[department])
+        employees.cell(row, 2).font = Font(italic=True)
+        employees.cell(row, 3).number_format = 'mm/dd/yyyy'
+        employees.cell(row, 4).number_format = '#,##0 [$€-407]'
+        employees.cell(row, 5).number_format = '0.00'
+        employees.cell(row, 6).alignment = Alignment(horizontal='center')
+    for col, width in enumerate([18, 14, 12, 12, 8, 8], 1):
+        employees.column_dimensions[get_column_letter(col)].width = width
+
+    # Inventory sheet: stock alerts, accounting format and negative numbers in parentheses
+    inventory = workbook.create_sheet('Inventory')
+    inventory.append(['SKU', 'Product', 'On Hand', 'Reorder Level', 'Value', 'Change'])
+    for col in range(1, 7):
+        cell = inventory.cell(1, col)
+        cell.font, cell.fill, cell.alignment = header_font, PatternFill('solid', fgColor='FF548235'), center
+    for i in range(40):
+        on_hand = (i * 29) % 160
+        reorder = 40
+        inventory.append([f"SKU-{1000 + i}", products[i % len(products)], on_hand, reorder,
+                          on_hand * prices[i % len(products)], ((i * 17) % 50) - 25])
+        row = i + 2
+        inventory.cell(row, 5).number_format = '_("$"* #,##0.00_);_("$"* (#,##0.00);_("$"* "-"??_);_(@_)'
+        inventory.cell(row, 6).number_format = '#,##0;(#,##0)'
+        if on_hand < reorder:
+            for col in range(1, 7):
+                inventory.cell(row, col).fill = PatternFill('solid', fgColor='FFFFC7CE')
+                inventory.cell(row, col).font = Font(color='FF9C0006')
+    for col, width in enumerate([10, 14, 10, 13, 14, 10], 1):
+        inventory.column_dimensions[get_column_letter(col)].width = width
+
+    workbook.save(filename)
+    print(f"✓ Created sample Excel file with formatting: {filename}")
+    return filename
+
+def main():
+    """Convert an Excel file given on the command line, or a generated sample"""
+    print("Advanced Excel to PDF Converter")
+    print("=" * 50)
+
+    if len(sys.argv) > 1:
+        excel_file_path = sys.argv[1]
+    else:
+        excel_file_path = create_sample_excel_with_formatting()
+
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    created_pdfs = excel_to_pdf_advanced(excel_file_path, output_dir)
+
+    print(f"\n✓ Successfully created {len(created_pdfs)} PDF files!")
+    for pdf_path in created_pdfs:
+        print(f"  - {os.path.basename(pdf_path)}")
+
+if __name__ == "__main__":
+    main()
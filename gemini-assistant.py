@@ -7,14 +7,17 @@ A Python interface for Google's Gemini AI model
 import os
 import sys
 import json
+import importlib.util
 from typing import List, Dict, Any, Optional
 
-# Try to import Google's Gemini library
+# Check for Google's Gemini library without importing it; the import itself is
+# slow and only happens when a model is initialized
 try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
+    GEMINI_AVAILABLE = importlib.util.find_spec("google.generativeai") is not None
 except ImportError:
     GEMINI_AVAILABLE = False
+
+if not GEMINI_AVAILABLE:
     print("Warning: google-generativeai library not found.")
     print("Install it with: pip install google-generativeai")
 
@@ -45,6 +48,8 @@ class GeminiAssistant:
     def _initialize_model(self):
         """Initialize the Gemini model"""
         try:
+            import google.generativeai as genai
+            
             genai.configure(api_key=self.api_key)
             self.model = genai.GenerativeModel(self.model_name)
             print(f"✅ Gemini Assistant initialized with model: {self.model_name}")
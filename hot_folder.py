@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Hot folder watcher
+Polls input directories and converts Excel files as they land or change, and
+optionally appends new PDFs to a rolling merged PDF. A file is only picked up
+once its size and modification time have stopped changing, files whose
+content hash was already processed are skipped, and conversions run in a
+bounded pool of worker processes.
+"""
+
+import argparse
+import json
+import os
+import signal
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from batch_convert import EXCEL_EXTENSIONS, convert_job, file_signature
+from excel_to_pdf import BACKENDS
+from pdf_index import file_sha256
+from pdf_operations import merge_pdfs
+
+
+def _ignore_interrupts():
+    """Leave Ctrl+C to the watcher, which lets running conversions finish"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class FolderState:
+    """
+    JSON record of the content hash last processed for each watched file and
+    the output directory given to each workbook
+    """
+
+    def __init__(self, state_path):
+        """
+        Load an existing state file or start a new one
+
+        Args:
+            state_path (str): Path of the JSON state file
+        """
+        self.state_path = state_path
+        self.files = {}
+
+        if os.path.exists(state_path):
+            with open(state_path, 'r', encoding='utf-8') as f:
+                self.files = json.load(f).get('files', {})
+
+    def is_processed(self, path, digest):
+        """Check whether these exact contents of a file were already processed"""
+        return self.files.get(path, {}).get('hash') == digest
+
+    def output_dir(self, path, output_root):
+        """Output subdirectory of a workbook, named after the file and kept between runs"""
+        entry = self.files.setdefault(path, {})
+        if 'output_dir' not in entry:
+            used = {other.get('output_dir') for other in self.files.values()}
+            stem = os.path.splitext(os.path.basename(path))[0]
+            name = stem
+            counter = 1
+            while os.path.join(output_root, name) in used:
+                name = f"{stem}_{counter}"
+                counter += 1
+            entry['output_dir'] = os.path.join(output_root, name)
+        return entry['output_dir']
+
+    def mark_processed(self, path, digest):
+        """Record the processed contents of a file and save the state immediately"""
+        self.files.setdefault(path, {})['hash'] = digest
+        self.save()
+
+    def save(self):
+        """Write the state atomically so an interrupted save leaves the old file intact"""
+        temp_path = self.state_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.files}, f, indent=2)
+        os.replace(temp_path, self.state_path)
+
+
+class HotFolder:
+    """
+    Watches input directories and processes files once they have settled
+    """
+
+    def __init__(self, input_dirs, output_dir, backend='canvas', workers=2, queue_size=8,
+                 settle_seconds=2.0, rolling_merge=None, cache_dir=None):
+        """
+        Initialize the watcher
+
+        Args:
+            input_dirs (list): Directories to watch (not recursive)
+            output_dir (str): Root output directory; each workbook gets a subdirectory
+            backend (str): Conversion backend name (see excel_to_pdf.BACKENDS)
+            workers (int): Worker processes converting workbooks
+            queue_size (int): Most conversions submitted at once; settled files
+                beyond this wait for a free slot
+            settle_seconds (float): How long a file's size and modification
+                time must stay the same before it is processed
+            rolling_merge (str): File name in output_dir that new PDFs are
+                appended to (optional; PDFs are ignored without it)
+            cache_dir (str): Sheet cache directory (default: <output_dir>/.pdf_cache)
+        """
+        self.input_dirs = [os.path.abspath(directory) for directory in input_dirs]
+        self.output_dir = os.path.abspath(output_dir)
+        self.backend = backend
+        self.workers = workers
+        self.queue_size = queue_size
+        self.settle_seconds = settle_seconds
+        self.rolling_path = os.path.join(self.output_dir, rolling_merge) if rolling_merge else None
+        self.cache_dir = cache_dir or os.path.join(self.output_dir, '.pdf_cache')
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.state = FolderState(os.path.join(self.output_dir, 'hot_folder_state.json'))
+        self.executor = None
+
+        # path -> (signature, time the signature was first seen)
+        self.observed = {}
+        # path -> signature already handled, so settled files are hashed only once
+        self.handled = {}
+        # future -> (path, digest, signature) of conversions in the pool
+        self.in_flight = {}
+
+    def _is_candidate(self, path, name):
+        """Check whether a directory entry is a file this watcher processes"""
+        # Skip Excel lock files, hidden and temporary files, and our own output
+        if name.startswith(('~$', '.')) or name.endswith('.tmp'):
+            return False
+        if path == self.rolling_path or path.startswith(self.output_dir + os.sep):
+            return False
+        lower = name.lower()
+        return lower.endswith(EXCEL_EXTENSIONS) or (self.rolling_path is not None and lower.endswith('.pdf'))
+
+    def scan(self):
+        """
+        Look at the watched directories once and return the files that have settled
+
+        Returns:
+            list: Paths whose signature has not changed for settle_seconds and
+                that have not been handled in this state yet, oldest first
+        """
+        now = time.monotonic()
+        current = {}
+        for directory in self.input_dirs:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                print(f"✗ Cannot read {directory}: {str(e)}")
+                continue
+            for entry in entries:
+                if entry.is_file() and self._is_candidate(entry.path, entry.name):
+                    try:
+                        current[entry.path] = file_signature(entry.path)
+                    except OSError:
+                        continue  # Removed while scanning
+
+        settled = []
+        for path, signature in current.items():
+            previous = self.observed.get(path)
+            if previous is None or previous[0] != signature:
+                self.observed[path] = (signature, now)
+            elif now - previous[1] >= self.settle_seconds and self.handled.get(path) != signature:
+                settled.append(path)
+
+        # Forget files that were removed
+        for path in list(self.observed):
+            if path not in current:
+                del self.observed[path]
+                self.handled.pop(path, None)
+
+        return sorted(settled, key=lambda path: self.observed[path][0][1])
+
+    def _changed(self, path):
+        """Hash a settled file; returns its digest, or None if these contents were already processed"""
+        signature = self.observed[path][0]
+        digest = file_sha256(path)
+        if digest is None:
+            print(f"✗ Cannot read {os.path.basename(path)}")
+            self.handled[path] = signature
+            return None
+        if self.state.is_processed(path, digest):
+            self.handled[path] = signature
+            return None
+        return digest
+
+    def _submit_conversions(self, workbooks):
+        """Queue changed workbooks for conversion while the pool has free slots"""
+        for path in workbooks:
+            if len(self.in_flight) >= self.queue_size:
+                break  # The rest stay settled and are picked up on a later poll
+            if any(queued[0] == path for queued in self.in_flight.values()):
+                continue
+            digest = self._changed(path)
+            if digest is None:
+                continue
+
+            output_dir = self.state.output_dir(path, self.output_dir)
+            future = self.executor.submit(convert_job, path, output_dir, self.backend, self.cache_dir)
+            self.in_flight[future] = (path, digest, self.observed[path][0])
+            print(f"→ Converting {os.path.basename(path)}")
+
+    def _collect_conversions(self):
+        """Report finished conversions and record their content hashes"""
+        for future in [future for future in self.in_flight if future.done()]:
+            path, digest, signature = self.in_flight.pop(future)
+            # Failures are not retried until the file changes again
+            self.handled[path] = signature
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"✗ Error converting {os.path.basename(path)}: {str(e)}")
+                continue
+
+            self.state.mark_processed(path, digest)
+            print(f"✓ {os.path.basename(path)}: {len(result['sheets'])} sheets, "
+                  f"{result['rows']:,} rows in {result['seconds']:.2f}s")
+            for error in result['errors']:
+                print(f"    {error}")
+
+    def _append_pdfs(self, pdfs):
+        """Append changed PDFs to the rolling merge in one merge_pdfs call"""
+        changed = []
+        for path in pdfs:
+            digest = self._changed(path)
+            if digest is not None:
+                changed.append((path, digest))
+        if not changed:
+            return
+
+        inputs = [path for path, _ in changed]
+        if os.path.exists(self.rolling_path):
+            inputs.insert(0, self.rolling_path)
+
+        # merge_pdfs picks its own file name, so merge into a scratch directory
+        # and move the result over the rolling file in one step
+        with tempfile.TemporaryDirectory(dir=self.output_dir) as scratch:
+            merged_path = merge_pdfs(inputs, scratch)
+            if merged_path is not None:
+                os.replace(merged_path, self.rolling_path)
+
+        for path, digest in changed:
+            self.handled[path] = self.observed[path][0]
+            if merged_path is not None:
+                self.state.mark_processed(path, digest)
+        if merged_path is not None:
+            print(f"✓ Appended {len(changed)} PDF(s) to {os.path.basename(self.rolling_path)}")
+
+    def poll(self):
+        """Scan once, collect finished conversions and start new work"""
+        self._collect_conversions()
+        settled = self.scan()
+        self._submit_conversions([path for path in settled if path.lower().endswith(EXCEL_EXTENSIONS)])
+        if self.rolling_path is not None:
+            self._append_pdfs([path for path in settled if path.lower().endswith('.pdf')])
+
+    def run(self, interval=1.0, once=False):
+        """
+        Watch until interrupted with Ctrl+C
+
+        Args:
+            interval (float): Seconds between scans
+            once (bool): Process the files already present, wait for their
+                conversions and return instead of watching
+        """
+        print(f"Watching {', '.join(self.input_dirs)} -> {self.output_dir}")
+        if self.rolling_path:
+            print(f"New PDFs are appended to {self.rolling_path}")
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_ignore_interrupts) as self.executor:
+            try:
+                if once:
+                    # Everything present now counts as settled
+                    self.settle_seconds = 0
+                    self.scan()
+                    while True:
+                        self.poll()
+                        if not self.in_flight and not self.scan():
+                            break
+                        time.sleep(min(interval, 0.1))
+                    return
+
+                while True:
+                    self.poll()
+                    time.sleep(interval)
+            except KeyboardInterrupt:
+                print("\nStopping, waiting for running conversions...")
+            finally:
+                try:
+                    # Failed conversions (and workers stopped by Ctrl+C) are
+                    # reported by _collect_conversions, not raised here
+                    wait(list(self.in_flight))
+                    self._collect_conversions()
+                finally:
+                    self.state.save()
+
+
+def main():
+    """Command line entry point for the hot folder watcher"""
+    parser = argparse.ArgumentParser(description="Convert Excel files and merge PDFs as they land in folders")
+    parser.add_argument("inputs", nargs="+", help="Directories to watch")
+    parser.add_argument("-o", "--output-dir", default="pdf_output", help="Root output directory")
+    parser.add_argument("-b", "--backend", default="canvas", choices=sorted(BACKENDS),
+                        help="Conversion backend")
+    parser.add_argument("-w", "--workers", type=int, default=2, help="Worker processes")
+    parser.add_argument("-q", "--queue-size", type=int, default=8,
+                        help="Most conversions queued at once")
+    parser.add_argument("-i", "--interval", type=float, default=1.0, help="Seconds between scans")
+    parser.add_argument("-s", "--settle", type=float, default=2.0,
+                        help="Seconds a file must stay unchanged before it is processed")
+    parser.add_argument("-m", "--rolling-merge", default=None, metavar="NAME",
+                        help="Append new PDFs to this file in the output directory")
+    parser.add_argument("--cache-dir", default=None, help="Sheet cache directory")
+    parser.add_argument("--once", action="store_true",
+                        help="Process the files present now and exit")
+    args = parser.parse_args()
+
+    missing = [directory for directory in args.inputs if not os.path.isdir(directory)]
+    if missing:
+        parser.error(f"not a directory: {', '.join(missing)}")
+
+    print("Hot Folder Watcher")
+    print("=" * 50)
+
+    watcher = HotFolder(args.inputs, args.output_dir, backend=args.backend, workers=args.workers,
+                        queue_size=args.queue_size, settle_seconds=args.settle,
+                        rolling_merge=args.rolling_merge, cache_dir=args.cache_dir)
+    watcher.run(interval=args.interval, once=args.once)
+
+
+if __name__ == "__main__":
+    main()
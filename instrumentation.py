@@ -0,0 +1,243 @@
+"""
+Instrumentation for PyTools operations
+The converters and PDF operations accept an optional observer: any callable
+that takes one event dict. Events are:
+
+    {'event': 'stage_start', 'stage': ..., ...}
+    {'event': 'stage_end', 'stage': ..., 'seconds': ..., ...}
+    {'event': 'rows', 'count': ..., ...}     data rows processed
+    {'event': 'pages', 'count': ..., ...}    PDF pages written
+    {'event': 'bytes', 'count': ..., ...}    bytes written to an output
+    {'event': 'bytes_saved', 'count': ..., ...}  bytes not written because
+                                             identical streams were shared
+
+plus context such as 'sheet' or 'file'. Stages are 'parse' (reading Excel),
+'layout' (formatting cells and building tables or figures), 'render' (drawing
+and PDF serialization), 'validate' (checking merge inputs), 'fingerprint'
+(hashing pages to skip duplicates), 'read' (parsing input PDFs), 'compress'
+(recompressing streams when optimizing), 'write' (saving output) and 'cache'.
+Stages timed in a worker process arrive as a 'stage_end' event only, once the
+worker's result is collected.
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+def emit(observer, event, **fields):
+    """Send an event to an observer, if there is one"""
+    if observer is not None:
+        observer({'event': event, **fields})
+
+
+@contextmanager
+def stage(observer, name, **fields):
+    """
+    Report the start and end of a stage, with its duration, to an observer
+
+    Args:
+        observer (callable): Event callback, or None to do nothing
+        name (str): Stage name
+        **fields: Context added to both events, such as sheet or file
+    """
+    if observer is None:
+        yield
+        return
+
+    emit(observer, 'stage_start', stage=name, **fields)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        emit(observer, 'stage_end', stage=name, seconds=time.perf_counter() - start, **fields)
+
+
+def record_stages(observer, stages, **fields):
+    """Report stage durations that were measured elsewhere, e.g. in a worker process"""
+    for name, seconds in stages.items():
+        emit(observer, 'stage_end', stage=name, seconds=seconds, **fields)
+
+
+def combine_observers(*observers):
+    """
+    Build one observer that forwards every event to several others
+
+    Args:
+        *observers: Observers; None entries are ignored
+
+    Returns:
+        callable: Combined observer, or None if no observers were given
+    """
+    observers = [observer for observer in observers if observer is not None]
+    if not observers:
+        return None
+    if len(observers) == 1:
+        return observers[0]
+
+    def forward(event):
+        for observer in observers:
+            observer(event)
+    return forward
+
+
+class StageTimer:
+    """
+    Stage durations collected without an observer, for code that runs in a
+    worker process and hands its timings back with its result
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block and add it to the named stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def result(self, pages):
+        """Render result passed back to the caller: page count and stage durations"""
+        return {'pages': pages, 'stages': self.stages}
+
+
+class StatsObserver:
+    """
+    Observer that totals stage durations and row, page and byte counts
+    """
+
+    def __init__(self):
+        self.stage_seconds = {}
+        self.stage_counts = {}
+        self.counters = {'rows': 0, 'pages': 0, 'bytes': 0, 'bytes_saved': 0}
+
+    def __call__(self, event):
+        kind = event['event']
+        if kind == 'stage_end':
+            name = event['stage']
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + event['seconds']
+            self.stage_counts[name] = self.stage_counts.get(name, 0) + 1
+        elif kind in self.counters:
+            self.counters[kind] += event['count']
+
+    def summary(self):
+        """
+        Return the totals collected so far
+
+        Returns:
+            dict: 'stages' (name -> {'seconds', 'count'}) and the 'rows',
+                'pages', 'bytes' and 'bytes_saved' counters
+        """
+        stages = {name: {'seconds': seconds, 'count': self.stage_counts[name]}
+                  for name, seconds in self.stage_seconds.items()}
+        return {'stages': stages, **self.counters}
+
+    def report(self):
+        """Print per-stage durations and counters"""
+        print("\nStage timings:")
+        for name, seconds in sorted(self.stage_seconds.items(), key=lambda item: -item[1]):
+            print(f"  {name:<10} {seconds:8.3f}s  ({self.stage_counts[name]} times)")
+        print(f"Rows: {self.counters['rows']:,}, pages: {self.counters['pages']:,}, "
+              f"bytes written: {self.counters['bytes']:,}")
+        if self.counters['bytes_saved']:
+            print(f"Bytes saved by sharing identical streams: {self.counters['bytes_saved']:,}")
+
+
+class ProgressObserver:
+    """
+    Observer that turns events into short progress messages
+    """
+
+    def __init__(self, write=print):
+        """
+        Initialize the observer
+
+        Args:
+            write (callable): Called with each message (default: print)
+        """
+        self.write = write
+        self.rows = 0
+        self.pages = 0
+
+    def __call__(self, event):
+        kind = event['event']
+        where = event.get('sheet') or event.get('file')
+        where = f" ({where})" if where else ""
+
+        if kind == 'stage_start':
+            self.write(f"{event['stage'].capitalize()}{where}...")
+        elif kind == 'rows':
+            self.rows += event['count']
+            self.write(f"{self.rows:,} rows processed")
+        elif kind == 'pages':
+            self.pages += event['count']
+            self.write(f"{self.pages:,} pages{where}")
+
+
+class Capture:
+    """
+    Optional cProfile and tracemalloc capture around an operation
+
+    Use as a context manager; with both options off it does nothing.
+    """
+
+    def __init__(self, profile=False, trace_memory=False, top=15):
+        """
+        Initialize the capture
+
+        Args:
+            profile (bool): Record a cProfile profile
+            trace_memory (bool): Trace allocations with tracemalloc
+            top (int): Number of functions or allocation sites to report
+        """
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.top = top
+        self.profiler = None
+        self.stats = None
+        self.memory_peak = None
+        self.memory_snapshot = None
+
+    def __enter__(self):
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.stats = pstats.Stats(self.profiler)
+        if self.trace_memory:
+            self.memory_snapshot = tracemalloc.take_snapshot()
+            self.memory_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return False
+
+    def dump(self, path):
+        """Save the cProfile data to a file for pstats or snakeviz"""
+        if self.stats is not None:
+            self.stats.dump_stats(path)
+
+    def report(self):
+        """Print the slowest functions and the largest allocation sites"""
+        if self.stats is not None:
+            output = io.StringIO()
+            self.stats.stream = output
+            self.stats.sort_stats('cumulative').print_stats(self.top)
+            print(f"\nProfile (top {self.top} by cumulative time):")
+            print(output.getvalue().strip())
+
+        if self.memory_snapshot is not None:
+            print(f"\nPeak traced memory: {self.memory_peak / (1024 * 1024):.1f} MB")
+            print(f"Top {self.top} allocation sites:")
+            for statistic in self.memory_snapshot.statistics('lineno')[:self.top]:
+                print(f"  {statistic}")
@@ -6,10 +6,15 @@ A comprehensive tool for Excel to PDF conversion and PDF operations
 
 import os
 import sys
+import argparse
 import subprocess
-from excel_to_pdf import excel_to_pdf_matplotlib, excel_to_pdf_reportlab
-from pdf_operations import split_pdf, merge_pdfs
-from example_usage import create_sample_excel
+
+# The converters pull in pandas, matplotlib, ReportLab and PyPDF2, so each menu
+# action imports what it needs when it runs; the menu itself starts instantly.
+# When a conversion daemon is running (pdf_daemon.py serve), jobs go to it instead
+
+# Instrumentation chosen on the command line (see main and run_operation)
+INSTRUMENTATION = {'timings': False, 'profile': False, 'trace_memory': False}
 
 def print_banner():
     """Print the application banner"""
@@ -31,6 +36,8 @@ def print_menu():
     print("7.  Run Example Usage")
     print("8.  Test Advanced Formatting")
     print("9.  View PDF Output Directory")
+    print("10. Convert Excel to PDF (Fast Canvas)")
+    print("11. Watch Folders (convert and merge new files)")
     print("0.  Exit")
     print("-" * 40)
 
@@ -42,6 +49,54 @@ def get_user_input(prompt):
         print("\n\nExiting...")
         sys.exit(0)
 
+def run_operation(operation, *args, **kwargs):
+    """
+    Run a conversion or PDF operation with the instrumentation chosen on the command line
+    
+    Args:
+        operation (callable): Function accepting an observer= keyword argument
+        *args, **kwargs: Arguments for the operation
+    
+    Returns:
+        The operation's return value
+    """
+    if not any(INSTRUMENTATION.values()):
+        return operation(*args, **kwargs)
+    
+    from instrumentation import Capture, StatsObserver
+    
+    stats = StatsObserver()
+    with Capture(profile=INSTRUMENTATION['profile'], trace_memory=INSTRUMENTATION['trace_memory']) as capture:
+        value = operation(*args, observer=stats, **kwargs)
+    
+    stats.report()
+    capture.report()
+    return value
+
+def run_in_daemon(op, **args):
+    """
+    Hand a job to a running conversion daemon (see pdf_daemon), whose warm
+    workers skip this process's imports and setup
+    
+    Args:
+        op (str): 'convert', 'merge' or 'split'
+        **args: Job arguments
+    
+    Returns:
+        tuple: (True, job result) if the daemon ran the job, or (False, None)
+            if no daemon is running or instrumentation is on, in which case
+            the caller runs the job itself
+    """
+    if any(INSTRUMENTATION.values()):
+        return False, None
+    
+    from pdf_daemon import DaemonNotRunning, submit_job
+    
+    try:
+        return True, submit_job(op, **args)
+    except DaemonNotRunning:
+        return False, None
+
 def validate_file_path(file_path, file_type="file"):
     """Validate if a file or directory exists"""
     if not os.path.exists(file_path):
@@ -64,7 +119,12 @@ def convert_excel_to_pdf_matplotlib():
     
     try:
         print(f"\nConverting {os.path.basename(excel_file)} to PDF...")
-        created_pdfs = excel_to_pdf_matplotlib(excel_file, output_dir)
+        ran, result = run_in_daemon('convert', excel_file=excel_file, output_dir=output_dir, backend='matplotlib')
+        if ran:
+            created_pdfs = result['pdfs']
+        else:
+            from excel_to_pdf import excel_to_pdf_matplotlib
+            created_pdfs = run_operation(excel_to_pdf_matplotlib, excel_file, output_dir)
         
         if created_pdfs:
             print(f"\n✅ Successfully created {len(created_pdfs)} PDF file(s):")
@@ -91,7 +151,44 @@ def convert_excel_to_pdf_reportlab():
     
     try:
         print(f"\nConverting {os.path.basename(excel_file)} to PDF...")
-        created_pdfs = excel_to_pdf_reportlab(excel_file, output_dir)
+        ran, result = run_in_daemon('convert', excel_file=excel_file, output_dir=output_dir, backend='reportlab')
+        if ran:
+            created_pdfs = result['pdfs']
+        else:
+            from excel_to_pdf import excel_to_pdf_reportlab
+            created_pdfs = run_operation(excel_to_pdf_reportlab, excel_file, output_dir)
+        
+        if created_pdfs:
+            print(f"\n✅ Successfully created {len(created_pdfs)} PDF file(s):")
+            for pdf_path in created_pdfs:
+                print(f"   📄 {os.path.basename(pdf_path)}")
+        else:
+            print("\n⚠️  No PDF files were created.")
+            
+    except Exception as e:
+        print(f"❌ Error during conversion: {str(e)}")
+
+def convert_excel_to_pdf_canvas():
+    """Handle Excel to PDF conversion using the fast canvas engine"""
+    print("\n🔄 Excel to PDF Conversion (Fast Canvas)")
+    print("-" * 40)
+    
+    excel_file = get_user_input("Enter the path to your Excel file: ")
+    if not validate_file_path(excel_file, "Excel file"):
+        return
+    
+    output_dir = get_user_input("Enter output directory (press Enter for default): ").strip()
+    if not output_dir:
+        output_dir = "pdf_output"
+    
+    try:
+        print(f"\nConverting {os.path.basename(excel_file)} to PDF...")
+        ran, result = run_in_daemon('convert', excel_file=excel_file, output_dir=output_dir, backend='canvas')
+        if ran:
+            created_pdfs = result['pdfs']
+        else:
+            from excel_to_pdf import excel_to_pdf_canvas
+            created_pdfs = run_operation(excel_to_pdf_canvas, excel_file, output_dir)
         
         if created_pdfs:
             print(f"\n✅ Successfully created {len(created_pdfs)} PDF file(s):")
@@ -112,12 +209,24 @@ def split_pdf_operation():
     if not validate_file_path(pdf_file, "PDF file"):
         return
     
+    output_dir = get_user_input("Enter output directory (press Enter for a folder next to the PDF): ").strip()
+    pages_per_file = get_user_input("Pages per output file (press Enter for 1): ").strip()
+    
     try:
-        print(f"\nProcessing {os.path.basename(pdf_file)}...")
-        pages = split_pdf(pdf_file)
+        pages_per_file = int(pages_per_file) if pages_per_file else 1
+        
+        print(f"\nSplitting {os.path.basename(pdf_file)}...")
+        ran, result = run_in_daemon('split', input_path=pdf_file, output_dir=output_dir or None,
+                                    pages_per_file=pages_per_file)
+        if ran:
+            output_files = result['files']
+        else:
+            from pdf_operations import split_pdf
+            output_files = run_operation(split_pdf, pdf_file, output_dir or None, pages_per_file)
         
-        if pages:
-            print(f"✅ Successfully extracted {len(pages)} pages from {os.path.basename(pdf_file)}")
+        if output_files:
+            print(f"✅ Successfully split {os.path.basename(pdf_file)} into {len(output_files)} file(s) "
+                  f"in {os.path.dirname(output_files[0])}")
         else:
             print("⚠️  No pages were extracted.")
             
@@ -133,23 +242,44 @@ def merge_pdfs_operation():
     if not validate_file_path(directory, "directory"):
         return
     
-    # Find PDF files in the directory
-    pdf_files = [f for f in os.listdir(directory) if f.lower().endswith('.pdf')]
+    # Find PDF files in the directory; page counts come from the page index,
+    # which only parses files that are new or changed since the last scan
+    from pdf_index import PdfIndex
+    index = PdfIndex()
+    entries = index.scan(directory)
     
-    if not pdf_files:
+    if not entries:
         print("❌ No PDF files found in the specified directory.")
+        index.close()
         return
     
-    print(f"\nFound {len(pdf_files)} PDF files:")
-    for i, pdf_file in enumerate(pdf_files, 1):
-        print(f"   {i}. {pdf_file}")
+    print(f"\nFound {len(entries)} PDF files:")
+    for i, entry in enumerate(entries, 1):
+        if entry['valid']:
+            print(f"   {i}. {os.path.basename(entry['path'])} ({entry['pages']} pages)")
+        else:
+            print(f"   {i}. {os.path.basename(entry['path'])} ❌ {entry['error']}")
+    total_pages = sum(entry['pages'] for entry in entries if entry['valid'])
+    skip_duplicates = get_user_input("Skip files and pages identical to ones already merged? (y/N): ")
+    skip_duplicates = skip_duplicates.strip().lower() in ('y', 'yes')
+    skip_repeated_pages = False
+    if skip_duplicates:
+        skip_repeated_pages = get_user_input("Also skip pages repeated within one file? (y/N): ")
+        skip_repeated_pages = skip_repeated_pages.strip().lower() in ('y', 'yes')
     
     try:
         # Get full paths of all PDF files
-        full_paths = [os.path.join(directory, pdf) for pdf in pdf_files]
+        full_paths = [entry['path'] for entry in entries]
         
-        print(f"\nMerging {len(full_paths)} PDF files...")
-        output_path = merge_pdfs(full_paths, directory)
+        print(f"\nMerging {len(full_paths)} PDF files ({total_pages:,} pages)...")
+        ran, output_path = run_in_daemon('merge', input_files=full_paths, output_dir=directory,
+                                         skip_duplicates=skip_duplicates,
+                                         skip_repeated_pages=skip_repeated_pages)
+        if not ran:
+            from pdf_operations import merge_pdfs
+            output_path = run_operation(merge_pdfs, full_paths, directory, index=index,
+                                        skip_duplicates=skip_duplicates,
+                                        skip_repeated_pages=skip_repeated_pages)
         
         if output_path:
             print(f"✅ Successfully merged PDFs into: {os.path.basename(output_path)}")
@@ -158,6 +288,8 @@ def merge_pdfs_operation():
             
     except Exception as e:
         print(f"❌ Error during PDF merging: {str(e)}")
+    finally:
+        index.close()
 
 def launch_pdf_gui():
     """Launch the PDF GUI application"""
@@ -171,8 +303,13 @@ def launch_pdf_gui():
         from tkinterdnd2 import TkinterDnD
         
         print("Starting PDF GUI...")
+        observer = None
+        if INSTRUMENTATION['timings']:
+            from instrumentation import ProgressObserver
+            observer = ProgressObserver()
+        
         root = TkinterDnD.Tk()
-        app = PDFApp(root)
+        app = PDFApp(root, observer=observer)
         root.mainloop()
         
     except ImportError as e:
@@ -187,6 +324,8 @@ def create_sample_excel_file():
     print("-" * 40)
     
     try:
+        from example_usage import create_sample_excel
+        
         excel_file = create_sample_excel()
         print(f"✅ Successfully created sample Excel file: {excel_file}")
         print("This file contains sample data for Sales, Employee, and Inventory sheets.")
@@ -246,15 +385,54 @@ def view_pdf_output_directory():
         file_size = os.path.getsize(file_path)
         print(f"   {i}. {pdf_file} ({file_size:,} bytes)")
 
+def watch_folders():
+    """Watch folders and convert new Excel files or merge new PDFs as they arrive"""
+    print("\n👀 Watch Folders")
+    print("-" * 40)
+    
+    directories = get_user_input("Enter the directories to watch (separated by commas): ")
+    directories = [directory.strip() for directory in directories.split(',') if directory.strip()]
+    if not directories or not all(validate_file_path(directory, "directory") for directory in directories):
+        return
+    
+    output_dir = get_user_input("Enter output directory (press Enter for default): ").strip()
+    if not output_dir:
+        output_dir = "pdf_output"
+    
+    rolling_merge = get_user_input("Append new PDFs to this file in the output directory "
+                                   "(press Enter to ignore PDFs): ").strip()
+    
+    try:
+        from hot_folder import HotFolder
+        
+        print("\nWatching for new and changed files. Press Ctrl+C to stop.")
+        HotFolder(directories, output_dir, rolling_merge=rolling_merge or None).run()
+        
+    except Exception as e:
+        print(f"❌ Error while watching folders: {str(e)}")
+
 def main():
     """Main function with menu loop"""
+    parser = argparse.ArgumentParser(description="PyTools - Excel & PDF Processing Suite")
+    parser.add_argument("--timings", action="store_true",
+                        help="Print per-stage timings and row, page and byte counts after each operation")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile each operation with cProfile and print the slowest functions")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Trace allocations with tracemalloc and print the largest sites")
+    args = parser.parse_args()
+    
+    INSTRUMENTATION['timings'] = args.timings
+    INSTRUMENTATION['profile'] = args.profile
+    INSTRUMENTATION['trace_memory'] = args.trace_memory
+    
     print_banner()
     
     while True:
         print_menu()
         
         try:
-            choice = get_user_input("\nEnter your choice (0-9): ")
+            choice = get_user_input("\nEnter your choice (0-11): ")
             
             if choice == "0":
                 print("\n👋 Thank you for using PyTools!")
@@ -278,8 +456,12 @@ def main():
                 test_advanced_formatting()
             elif choice == "9":
                 view_pdf_output_directory()
+            elif choice == "10":
+                convert_excel_to_pdf_canvas()
+            elif choice == "11":
+                watch_folders()
             else:
-                print("❌ Invalid choice! Please select a valid option (0-9).")
+                print("❌ Invalid choice! Please select a valid option (0-11).")
                 
         except KeyboardInterrupt:
             print("\n\n👋 Thank you for using PyTools!")
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Conversion daemon
+A long-running local server that keeps pandas, matplotlib, ReportLab and
+PyPDF2 imported and their font and style state built, and runs convert, merge
+and split jobs sent over a Unix domain socket in a pool of warm worker
+processes. Jobs beyond the queue limit are refused instead of piling up.
+
+The client half of this module imports nothing heavy, so `pdf_daemon.py
+convert ...` returns in tens of milliseconds for small workbooks when a daemon
+is running, and runs the job in-process when none is.
+
+Protocol: the client connects, sends one JSON request line such as
+{"op": "convert", "args": {...}} and reads one JSON response line:
+{"ok": true, "result": ..., "output": "..."} or {"ok": false, "error": "..."}.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+# Job arguments holding paths; the client makes them absolute because the
+# daemon runs in a different working directory
+_PATH_ARGS = ('excel_file', 'output_dir', 'cache_dir', 'input_path', 'input_files')
+
+# Longest request line the daemon accepts
+_MAX_REQUEST_BYTES = 1024 * 1024
+
+
+def default_socket_path():
+    """Socket path from PYTOOLS_SOCKET, else a per-user socket in the runtime or temp directory"""
+    if os.environ.get('PYTOOLS_SOCKET'):
+        return os.environ['PYTOOLS_SOCKET']
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"pytools-{os.getuid()}.sock")
+
+
+class DaemonNotRunning(ConnectionError):
+    """No daemon is listening on the socket"""
+
+
+def _send(request, socket_path=None, timeout=None):
+    """Send one request to the daemon and return its decoded response"""
+    socket_path = socket_path or default_socket_path()
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(socket_path):
+        raise DaemonNotRunning(socket_path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        try:
+            client.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            raise DaemonNotRunning(socket_path)
+
+        client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with client.makefile('rb') as reader:
+            line = reader.readline()
+
+    if not line:
+        raise ConnectionError("The daemon closed the connection without replying")
+    return json.loads(line)
+
+def daemon_status(socket_path=None):
+    """
+    Ask a running daemon for its status
+
+    Args:
+        socket_path (str): Daemon socket (default: default_socket_path())
+
+    Returns:
+        dict: Status with pid, workers, queue size, active and finished jobs,
+            or None if no daemon is running
+    """
+    try:
+        return _send({'op': 'status'}, socket_path, timeout=2)['result']
+    except (OSError, ValueError):
+        return None
+
+def submit_job(op, socket_path=None, echo=True, **args):
+    """
+    Run a job in the daemon and wait for its result
+
+    Args:
+        op (str): 'convert', 'merge' or 'split' (see JOBS)
+        socket_path (str): Daemon socket (default: default_socket_path())
+        echo (bool): Print the progress output the job produced in the daemon
+        **args: Job arguments; paths may be relative to the current directory
+
+    Returns:
+        The job's result (see JOBS)
+
+    Raises:
+        DaemonNotRunning: No daemon is listening
+        RuntimeError: The daemon refused the job or the job failed
+    """
+    for name in _PATH_ARGS:
+        if isinstance(args.get(name), str):
+            args[name] = os.path.abspath(args[name])
+        elif isinstance(args.get(name), list):
+            args[name] = [os.path.abspath(path) for path in args[name]]
+
+    response = _send({'op': op, 'args': args}, socket_path)
+    if echo and response.get('output'):
+        print(response['output'], end='')
+    if not response['ok']:
+        raise RuntimeError(response['error'])
+    return response['result']
+
+
+def _convert_job(excel_file, output_dir=None, backend='reportlab', cache_dir=None, combined=False,
+                 overwrite=False, workers=None):
+    """Convert a workbook; returns the convert_workbook details"""
+    from excel_to_pdf import convert_workbook
+    return convert_workbook(excel_file, output_dir, backend=backend, workers=workers, cache_dir=cache_dir,
+                            combined=combined, overwrite=overwrite)
+
+def _merge_job(input_files, output_dir, skip_duplicates=False, skip_repeated_pages=False):
+    """Merge PDFs; returns the merged file's path, or None if the merge failed"""
+    from pdf_index import PdfIndex
+    from pdf_operations import merge_pdfs
+    with PdfIndex() as index:
+        return merge_pdfs(input_files, output_dir, index=index, skip_duplicates=skip_duplicates,
+                          skip_repeated_pages=skip_repeated_pages)
+
+def _split_job(input_path, output_dir=None, pages_per_file=1):
+    """Split a PDF into files of pages_per_file pages; returns the written paths"""
+    from pdf_operations import split_pdf
+    return {'files': split_pdf(input_path, output_dir, pages_per_file)}
+
+# Job name -> function run in a worker process
+JOBS = {
+    'convert': _convert_job,
+    'merge': _merge_job,
+    'split': _split_job,
+}
+
+# Modules the fork server imports once, so every worker starts with them loaded
+_PRELOAD_MODULES = ['excel_to_pdf', 'pdf_operations', 'matplotlib.figure', 'matplotlib.backends.backend_pdf']
+
+def _warm_up():
+    """Import the converters and build per-process font and style state ahead of the first job"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.backends.backend_pdf import PdfPages  # noqa: F401
+    from matplotlib.figure import Figure  # noqa: F401
+    import pdf_operations  # noqa: F401
+    import excel_to_pdf
+
+    excel_to_pdf._reportlab_title_style()
+    excel_to_pdf._reportlab_row_heights()
+    for font_name in ('Helvetica', 'Helvetica-Bold'):
+        excel_to_pdf._glyph_widths(font_name)
+
+def _run_job(op, args):
+    """Run a job in a worker process, capturing what it prints for the client"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = JOBS[op](**args)
+    return result, output.getvalue()
+
+
+class ConversionDaemon:
+    """
+    Unix socket server handing jobs to a pool of warm worker processes
+    """
+
+    def __init__(self, socket_path=None, workers=None, queue_size=16):
+        """
+        Initialize the daemon
+
+        Args:
+            socket_path (str): Socket to listen on (default: default_socket_path())
+            workers (int): Worker processes (default: CPU count)
+            queue_size (int): Most jobs accepted at once, running or waiting;
+                further jobs are refused until one finishes
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.slots = threading.BoundedSemaphore(queue_size)
+        self.lock = threading.Lock()
+        self.stats = {'active': 0, 'completed': 0, 'failed': 0, 'refused': 0}
+        self.started = None
+        self.executor = None
+        self.server = None
+
+    def status(self):
+        """Daemon status sent to clients"""
+        with self.lock:
+            stats = dict(self.stats)
+        return {'pid': os.getpid(), 'socket': self.socket_path, 'workers': self.workers,
+                'queue_size': self.queue_size, 'uptime': time.time() - self.started, **stats}
+
+    def _claim_socket(self):
+        """Remove a stale socket left by a daemon that died, or fail if one is still running"""
+        if not os.path.exists(self.socket_path):
+            return
+        if daemon_status(self.socket_path) is not None:
+            raise RuntimeError(f"A daemon is already running on {self.socket_path}")
+        os.unlink(self.socket_path)
+
+    def handle(self, request):
+        """
+        Answer one decoded request
+
+        Args:
+            request: Decoded JSON, normally {'op': ..., 'args': {...}}
+
+        Returns:
+            dict: Response sent back to the client
+        """
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': "Invalid request: expected a JSON object"}
+        op = request.get('op')
+        args = request.get('args') or {}
+        if not isinstance(args, dict):
+            return {'ok': False, 'error': "Invalid request: 'args' must be a JSON object"}
+        if op == 'status':
+            return {'ok': True, 'result': self.status()}
+        if op == 'shutdown':
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {'ok': True, 'result': None}
+        if not isinstance(op, str) or op not in JOBS:
+            return {'ok': False, 'error': f"Unknown operation '{op}'"}
+
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.stats['refused'] += 1
+            return {'ok': False, 'error': f"Daemon busy: {self.queue_size} jobs already queued"}
+
+        with self.lock:
+            self.stats['active'] += 1
+        try:
+            result, output = self.executor.submit(_run_job, op, args).result()
+            succeeded = True
+            return {'ok': True, 'result': result, 'output': output}
+        except Exception as e:
+            succeeded = False
+            return {'ok': False, 'error': f"{op} failed: {str(e)}"}
+        finally:
+            self.slots.release()
+            with self.lock:
+                self.stats['active'] -= 1
+                self.stats['completed' if succeeded else 'failed'] += 1
+
+    def serve(self):
+        """Listen for jobs until a shutdown request, SIGTERM or Ctrl+C"""
+        import multiprocessing
+        import socketserver
+        from concurrent.futures import ProcessPoolExecutor
+
+        self._claim_socket()
+
+        # Workers forked straight from the daemon would inherit its listening
+        # socket and keep it open after shutdown, so fork them from a clean
+        # fork server that has the converters imported already
+        context = None
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(_PRELOAD_MODULES)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                            initializer=_warm_up)
+
+        # Start every worker before accepting jobs so the first ones don't wait for imports
+        for future in [self.executor.submit(_warm_up) for _ in range(self.workers)]:
+            future.result()
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline(_MAX_REQUEST_BYTES)
+                try:
+                    response = daemon.handle(json.loads(line))
+                except ValueError as e:
+                    response = {'ok': False, 'error': f"Invalid request: {str(e)}"}
+                except Exception as e:
+                    # Always answer, so a bad request never leaves the client without a reply
+                    response = {'ok': False, 'error': f"Request failed: {str(e)}"}
+                self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        # Bind with an owner-only umask so the socket is never reachable by other users
+        previous_umask = os.umask(0o177)
+        try:
+            self.server = Server(self.socket_path, Handler)
+        finally:
+            os.umask(previous_umask)
+        signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=self.server.shutdown).start())
+        self.started = time.time()
+
+        print(f"✓ Daemon listening on {self.socket_path} with {self.workers} workers "
+              f"(pid {os.getpid()})")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            print("Stopping, waiting for running jobs...")
+            self.executor.shutdown(cancel_futures=True)
+            print("Daemon stopped")
+
+
+def _run(op, socket_path, **args):
+    """Run a job in the daemon, or in this process when no daemon is running"""
+    try:
+        return submit_job(op, socket_path, **args)
+    except DaemonNotRunning:
+        print("(no daemon running, working in this process)")
+        return JOBS[op](**args)
+
+def main():
+    """Command line entry point: run the daemon, query it, or send it jobs"""
+    parser = argparse.ArgumentParser(description="Warm conversion daemon and its client")
+    parser.add_argument("--socket", default=None, help="Daemon socket path (default: $PYTOOLS_SOCKET or a per-user socket)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the daemon in the foreground")
+    serve.add_argument("-w", "--workers", type=int, default=None,
+                       help="Worker processes (default: CPU count)")
+    serve.add_argument("-q", "--queue-size", type=int, default=16,
+                       help="Most jobs accepted at once before new ones are refused")
+
+    commands.add_parser("status", help="Show whether a daemon is running and what it is doing")
+    commands.add_parser("stop", help="Stop a running daemon")
+
+    convert = commands.add_parser("convert", help="Convert a workbook to PDF")
+    convert.add_argument("excel_file", help="Path to the Excel file")
+    convert.add_argument("-o", "--output-dir", default=None, help="Output directory")
+    convert.add_argument("-b", "--backend", default="reportlab",
+                         choices=['matplotlib', 'matplotlib-paginated', 'reportlab', 'canvas'],
+                         help="Conversion backend")
+    convert.add_argument("-c", "--combined", action="store_true",
+                         help="Write all sheets into one PDF with a bookmark per sheet")
+    convert.add_argument("--cache-dir", default=None, help="Sheet cache directory")
+
+    merge = commands.add_parser("merge", help="Merge PDF files")
+    merge.add_argument("input_files", nargs="+", help="PDF files to merge, in order")
+    merge.add_argument("-o", "--output-dir", default=".", help="Directory for the merged PDF")
+    merge.add_argument("--skip-duplicates", action="store_true",
+                       help="Leave out files and pages identical to ones already merged")
+    merge.add_argument("--skip-repeated-pages", action="store_true",
+                       help="With --skip-duplicates, also leave out pages repeated within one file")
+
+    split = commands.add_parser("split", help="Split a PDF into files of single pages or page ranges")
+    split.add_argument("input_path", help="PDF file")
+    split.add_argument("-o", "--output-dir", default=None,
+                       help="Directory for the page files (default: <name>_pages next to the PDF)")
+    split.add_argument("-n", "--pages-per-file", type=int, default=1, help="Pages in each output file")
+
+    args = parser.parse_args()
+    socket_path = args.socket or default_socket_path()
+
+    if args.command == "serve":
+        ConversionDaemon(socket_path, args.workers, args.queue_size).serve()
+        return
+
+    if args.command == "status":
+        status = daemon_status(socket_path)
+        if status is None:
+            print(f"✗ No daemon running on {socket_path}")
+            sys.exit(1)
+        print(f"✓ Daemon running on {status['socket']} (pid {status['pid']}, up {status['uptime']:.0f}s)")
+        print(f"  Workers: {status['workers']}, queue size: {status['queue_size']}")
+        print(f"  Jobs active: {status['active']}, completed: {status['completed']}, "
+              f"failed: {status['failed']}, refused: {status['refused']}")
+        return
+
+    if args.command == "stop":
+        try:
+            _send({'op': 'shutdown'}, socket_path, timeout=5)
+            print("✓ Daemon stopping")
+        except DaemonNotRunning:
+            print(f"✗ No daemon running on {socket_path}")
+            sys.exit(1)
+        return
+
+    try:
+        if args.command == "convert":
+            _run('convert', socket_path, excel_file=args.excel_file, output_dir=args.output_dir,
+                 backend=args.backend, combined=args.combined, cache_dir=args.cache_dir)
+        elif args.command == "merge":
+            if _run('merge', socket_path, input_files=args.input_files, output_dir=args.output_dir,
+                    skip_duplicates=args.skip_duplicates,
+                    skip_repeated_pages=args.skip_repeated_pages) is None:
+                sys.exit(1)
+        elif args.command == "split":
+            _run('split', socket_path, input_path=args.input_path, output_dir=args.output_dir,
+                 pages_per_file=args.pages_per_file)
+    except RuntimeError as e:
+        print(f"✗ {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
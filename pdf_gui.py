@@ -1,12 +1,28 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
-from pdf_operations import split_pdf, merge_pdfs
+import queue
+import threading
+from pdf_operations import split_pdfs, merge_pdfs
+from pdf_index import PdfIndex
+from instrumentation import combine_observers
 from tkinterdnd2 import DND_FILES, TkinterDnD
 
 class PDFApp:
-    def __init__(self, root):
+    def __init__(self, root, observer=None):
+        """
+        Build the PDF tool window
+        
+        Args:
+            root (tk.Tk): Root window (a TkinterDnD.Tk for drag and drop)
+            observer (callable): Also receives the progress and timing events of
+                every split and merge (see instrumentation) (optional)
+        """
         self.root = root
+        # Status bar progress plus any observer supplied by the caller
+        self.observer = combine_observers(self.show_progress, observer)
+        # Page counts of listed PDFs, kept between runs
+        self.index = PdfIndex()
         self.root.title("Accutive Security PDF Merge Tool")
         self.root.geometry("600x400")
         
@@ -132,27 +148,72 @@ class PDFApp:
         self.pdf_listbox.delete(0, tk.END)
         directory = self.dir_path.get()
         if os.path.isdir(directory):
-            pdf_files = [f for f in os.listdir(directory) if f.lower().endswith('.pdf')]
-            for pdf in pdf_files:
-                self.pdf_listbox.insert(tk.END, pdf)
-            self.status_var.set(f"Found {len(pdf_files)} PDF files")
+            entries = self.index.scan(directory)
+            for entry in entries:
+                self.pdf_listbox.insert(tk.END, os.path.basename(entry['path']))
+            pages = sum(entry['pages'] for entry in entries if entry['valid'])
+            unreadable = sum(1 for entry in entries if not entry['valid'])
+            status = f"Found {len(entries)} PDF files, {pages:,} pages"
+            if unreadable:
+                status += f" ({unreadable} unreadable)"
+            self.status_var.set(status)
 
     def process_pdfs(self):
+        """Split every listed PDF into single-page files under <directory>/split_pages, in the background"""
         directory = self.dir_path.get()
         if not os.path.isdir(directory):
             messagebox.showerror("Error", "Please select a valid directory")
             return
         
         self.status_var.set("Processing PDFs...")
-        final_list = []
+        self.process_btn.state(['disabled'])
+        output_root = os.path.join(directory, "split_pages")
+        pdf_files = [os.path.join(directory, pdf_file) for pdf_file in self.pdf_listbox.get(0, tk.END)]
+        
+        # The split runs in worker processes driven from a background thread;
+        # its events are queued and handled here on the Tk thread
+        events = queue.Queue()
+        outcome = {}
         
-        for pdf_file in self.pdf_listbox.get(0, tk.END):
-            full_path = os.path.join(directory, pdf_file)
-            pages = split_pdf(full_path)
-            final_list.extend(pages)
+        def run():
+            try:
+                # SQLite connections belong to one thread, so open the index here
+                with PdfIndex() as index:
+                    outcome['summary'] = split_pdfs(pdf_files, output_root, observer=events.put, index=index)
+            except Exception as e:
+                outcome['error'] = str(e)
         
-        self.status_var.set(f"Processed {len(final_list)} pages from all PDFs")
-        messagebox.showinfo("Success", f"Successfully processed {len(final_list)} pages")
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        self.root.after(100, self.poll_split, thread, events, outcome, output_root, 0)
+    
+    def poll_split(self, thread, events, outcome, output_root, pages):
+        """Forward queued split events and report the result once the split has finished"""
+        while not events.empty():
+            event = events.get()
+            if self.observer is not None:
+                self.observer(event)
+            if event['event'] == 'pages':
+                pages += event['count']
+                self.status_var.set(f"Processing PDFs... {pages:,} pages written")
+        
+        if thread.is_alive():
+            self.root.after(100, self.poll_split, thread, events, outcome, output_root, pages)
+            return
+        
+        self.process_btn.state(['!disabled'])
+        if 'error' in outcome:
+            self.status_var.set("Failed to split PDFs")
+            messagebox.showerror("Error", f"Failed to split PDFs: {outcome['error']}")
+            return
+        
+        summary = outcome['summary']
+        page_files = sum(len(paths) for paths in summary['files'].values())
+        self.status_var.set(f"Wrote {page_files} page files to {output_root}")
+        message = f"Successfully split the PDFs into {page_files} page files\nSaved in: {output_root}"
+        if summary['failed']:
+            message += f"\n{len(summary['failed'])} file(s) could not be split"
+        messagebox.showinfo("Success", message)
 
     def merge_pdfs(self):
         """Merge selected PDF files"""
@@ -171,7 +232,7 @@ class PDFApp:
         self.status_var.set("Merging PDFs...")
         
         # Merge the PDFs
-        output_path = merge_pdfs(pdf_files, directory)
+        output_path = merge_pdfs(pdf_files, directory, observer=self.observer, index=self.index)
         
         if output_path:
             self.status_var.set(f"Successfully merged PDFs into {os.path.basename(output_path)}")
@@ -180,6 +241,12 @@ class PDFApp:
             self.status_var.set("Failed to merge PDFs")
             messagebox.showerror("Error", "Failed to merge PDFs")
 
+    def show_progress(self, event):
+        """Show the file being read or written in the status bar while an operation runs"""
+        if event['event'] == 'stage_start':
+            self.status_var.set(f"{event['stage'].capitalize()}: {os.path.basename(event.get('file', ''))}")
+            self.root.update_idletasks()
+
     def update_selection_mode(self):
         """Update the visibility of directory and drop zone based on selection mode"""
         if self.selection_mode.get() == "manual":
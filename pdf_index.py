@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+Persistent PDF page index
+Remembers the page count, page sizes, encryption status and validity of every
+PDF it has seen in a small SQLite database. Entries are matched by path, size
+and modification time, so a repeated scan of an unchanged directory only
+stats the files. A file whose timestamp changed but whose SHA-256 did not, or
+a copy of a file already indexed elsewhere, is recognised by its hash and not
+parsed again. Page fingerprints for duplicate detection are cached per content
+hash as well.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+# Files below this count are hashed and parsed in-process rather than in a process pool
+PARALLEL_THRESHOLD = 16
+
+# Bump when _page_fingerprints changes, so fingerprints cached by older versions are dropped
+FINGERPRINT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdfs (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    pages INTEGER,
+    page_sizes TEXT,
+    encrypted INTEGER NOT NULL,
+    valid INTEGER NOT NULL,
+    error TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pdfs_directory ON pdfs (directory);
+CREATE INDEX IF NOT EXISTS pdfs_sha256 ON pdfs (sha256);
+CREATE TABLE IF NOT EXISTS page_fingerprints (
+    sha256 TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    fingerprints TEXT NOT NULL
+);
+"""
+
+_COLUMNS = ('path', 'size', 'mtime_ns', 'sha256', 'pages', 'page_sizes', 'encrypted', 'valid', 'error')
+
+
+def default_index_path():
+    """Index path from PYTOOLS_INDEX, else pdf_index.sqlite in the per-user cache directory"""
+    if os.environ.get('PYTOOLS_INDEX'):
+        return os.environ['PYTOOLS_INDEX']
+    cache_dir = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_dir, 'pytools', 'pdf_index.sqlite')
+
+
+def file_sha256(path):
+    """SHA-256 of a file's contents, read in 1 MB chunks; None if the file cannot be read"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _unreadable(path, error):
+    """Entry of a file that could not be read, which is not stored"""
+    return {'path': path, 'size': None, 'mtime_ns': None, 'sha256': None, 'pages': None,
+            'page_sizes': None, 'encrypted': False, 'valid': False, 'error': error}
+
+
+def _inspect_pdf(path):
+    """
+    Parse a PDF and describe its pages
+
+    Returns:
+        dict: 'pages', 'page_sizes' (list of [width, height] in points, as
+            displayed after page rotation), 'encrypted', 'valid' and 'error'
+    """
+    from PyPDF2 import PdfReader
+
+    info = {'pages': None, 'page_sizes': None, 'encrypted': False, 'valid': False, 'error': None}
+    try:
+        with open(path, 'rb') as f:
+            reader = PdfReader(f, strict=False)
+            info['encrypted'] = reader.is_encrypted
+            if reader.is_encrypted and not reader.decrypt(''):
+                info['error'] = "encrypted with a password"
+                return info
+
+            sizes = []
+            for page in reader.pages:
+                width, height = float(page.mediabox.width), float(page.mediabox.height)
+                if page.rotation % 180 == 90:
+                    width, height = height, width
+                sizes.append([round(width, 2), round(height, 2)])
+            info.update(pages=len(sizes), page_sizes=sizes, valid=True)
+    except Exception as e:
+        info['error'] = str(e) or type(e).__name__
+    return info
+
+
+def _digest(value, digests):
+    """
+    SHA-256 of a PDF object's content, independent of object numbers
+
+    Args:
+        value: PDF object; references are followed
+        digests (dict): Digests of indirect objects already seen in this
+            document, shared between pages
+
+    Returns:
+        bytes: Digest
+    """
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+    if isinstance(value, IndirectObject):
+        key = (value.idnum, value.generation)
+        if key not in digests:
+            digests[key] = b"cycle"
+            digests[key] = _digest(value.get_object(), digests)
+        return digests[key]
+
+    digest = hashlib.sha256()
+    if isinstance(value, DictionaryObject):
+        digest.update(b"stream<<" if isinstance(value, StreamObject) else b"<<")
+        for key in sorted(value):
+            if key not in ('/Parent', '/Length'):
+                digest.update(key.encode('utf-8'))
+                digest.update(_digest(value.raw_get(key), digests))
+        if isinstance(value, StreamObject):
+            digest.update(hashlib.sha256(value._data).digest())
+    elif isinstance(value, ArrayObject):
+        digest.update(b"[")
+        for item in value:
+            digest.update(_digest(item, digests))
+    else:
+        digest.update(f"{type(value).__name__}:{value!r}".encode('utf-8', 'surrogatepass'))
+    return digest.digest()
+
+
+def _page_fingerprints(path):
+    """
+    Fingerprint every page of a PDF by what it shows and carries
+
+    A page's fingerprint is a SHA-256 of its content streams with runs of
+    whitespace collapsed, its resources (fonts and images compared by their
+    data, not their object numbers), its media box and rotation (inherited
+    or not), and every other page entry, such as its annotations, links and
+    form widgets. References to pages count as page positions.
+
+    Returns:
+        list: Hex fingerprint per page, or None if the file cannot be read
+    """
+    from PyPDF2 import PdfReader
+    from PyPDF2.generic import ArrayObject
+
+    try:
+        with open(path, 'rb') as f:
+            reader = PdfReader(f, strict=False)
+            if reader.is_encrypted and not reader.decrypt(''):
+                return None
+
+            digests = {}
+            for page_index, page in enumerate(reader.pages):
+                reference = page.indirect_reference
+                if reference is not None:
+                    digests[(reference.idnum, reference.generation)] = f"page {page_index}".encode('ascii')
+
+            fingerprints = []
+            for page in reader.pages:
+                contents = page.raw_get('/Contents') if '/Contents' in page else None
+                contents = contents.get_object() if contents is not None else None
+                # An unfiltered stream read by PyPDF2 is an empty (falsy) dictionary
+                if isinstance(contents, ArrayObject):
+                    streams = contents
+                else:
+                    streams = [contents] if contents is not None else []
+                content = b"\n".join(stream.get_object().get_data() for stream in streams)
+
+                digest = hashlib.sha256(b" ".join(content.split()))
+                for key in ('/Resources', '/MediaBox', '/CropBox', '/Rotate'):
+                    node = page
+                    while node is not None and key not in node:
+                        node = node['/Parent'] if '/Parent' in node else None
+                    digest.update(key.encode('ascii'))
+                    digest.update(_digest(node.raw_get(key) if node is not None else None, digests))
+                for key in sorted(page):
+                    if key not in ('/Parent', '/Contents', '/Resources', '/MediaBox', '/CropBox', '/Rotate'):
+                        digest.update(key.encode('utf-8'))
+                        digest.update(_digest(page.raw_get(key), digests))
+                fingerprints.append(digest.hexdigest())
+            return fingerprints
+    except Exception:
+        return None
+
+
+def page_fingerprints(paths, workers=None):
+    """
+    Page fingerprints of PDFs, computed in a process pool for large batches
+    and not cached (see PdfIndex.fingerprints)
+
+    Args:
+        paths (list): Paths of PDF files
+        workers (int): Worker processes (default: CPU count)
+
+    Returns:
+        list: Per path, a list of hex page fingerprints, or None for files
+            that cannot be read
+    """
+    return _map(_page_fingerprints, list(paths), workers)
+
+
+def find_duplicates(paths, fingerprints, within_files=False):
+    """
+    Find files and pages that repeat earlier ones, in order
+
+    Args:
+        paths (list): Paths of PDF files
+        fingerprints (list): Page fingerprints per path, as returned by
+            page_fingerprints or PdfIndex.fingerprints; None entries are skipped
+        within_files (bool): Also count pages repeating an earlier page of
+            the same file (by default only pages of earlier files count)
+
+    Returns:
+        dict: 'files', a list of (position, earlier position) in paths of
+            files whose pages all repeat an earlier file, and 'pages', a list
+            of (position, page index, earlier position, earlier page index)
+            for repeated pages of the other files
+    """
+    documents = {}
+    pages = {}
+    duplicates = {'files': [], 'pages': []}
+    for position, page_list in enumerate(fingerprints):
+        if page_list is None:
+            continue
+        key = tuple(page_list)
+        if key in documents:
+            duplicates['files'].append((position, documents[key]))
+            continue
+        documents[key] = position
+        first_seen = {}
+        for page_index, fingerprint in enumerate(page_list):
+            earlier = pages.get(fingerprint) or (first_seen.get(fingerprint) if within_files else None)
+            if earlier is not None:
+                duplicates['pages'].append((position, page_index) + earlier)
+            else:
+                first_seen.setdefault(fingerprint, (position, page_index))
+        for fingerprint, first in first_seen.items():
+            pages.setdefault(fingerprint, first)
+    return duplicates
+
+
+def _map(function, items, workers):
+    """Apply function to every item, in a process pool for large batches"""
+    if len(items) < PARALLEL_THRESHOLD:
+        return [function(item) for item in items]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, items, chunksize=16))
+
+
+class PdfIndex:
+    """
+    SQLite index of PDF page counts and page sizes, keyed by path, size,
+    modification time and content hash
+    """
+
+    def __init__(self, index_path=None, workers=None):
+        """
+        Open or create an index
+
+        Args:
+            index_path (str): SQLite database path (default: default_index_path())
+            workers (int): Worker processes hashing and parsing changed files
+                (default: CPU count)
+        """
+        self.index_path = index_path or default_index_path()
+        self.workers = workers
+        if os.path.dirname(self.index_path):
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        # Several processes (GUI, daemon workers, menu) may share one index
+        self.connection = sqlite3.connect(self.index_path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self._drop_unversioned_fingerprints()
+        self.connection.executescript(_SCHEMA)
+        with self.connection:
+            self.connection.execute("DELETE FROM page_fingerprints WHERE version != ?", (FINGERPRINT_VERSION,))
+
+    def _drop_unversioned_fingerprints(self):
+        """Drop a fingerprint table written before fingerprints carried a version"""
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(page_fingerprints)")]
+        if columns and 'version' not in columns:
+            with self.connection:
+                self.connection.execute("DROP TABLE page_fingerprints")
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _entry(row):
+        entry = dict(zip(_COLUMNS, row))
+        entry['page_sizes'] = json.loads(entry['page_sizes']) if entry['page_sizes'] else None
+        entry['encrypted'] = bool(entry['encrypted'])
+        entry['valid'] = bool(entry['valid'])
+        return entry
+
+    def _stored(self, paths, directory=None, page_sizes=True):
+        """Stored entries by path, for one directory or a list of paths"""
+        # Decoding page sizes is most of the time a scan of unchanged files takes
+        columns = ', '.join(_COLUMNS if page_sizes else
+                            ['NULL' if column == 'page_sizes' else column for column in _COLUMNS])
+        if directory is not None:
+            rows = self.connection.execute(f"SELECT {columns} FROM pdfs WHERE directory = ?", (directory,))
+        else:
+            rows = []
+            paths = list(paths)
+            # Stay below SQLite's limit on query parameters
+            for start in range(0, len(paths), 500):
+                chunk = paths[start:start + 500]
+                rows.extend(self.connection.execute(
+                    f"SELECT {columns} FROM pdfs WHERE path IN ({', '.join('?' * len(chunk))})", chunk))
+        return {row[0]: row for row in rows}
+
+    def _by_hash(self, digests):
+        """Stored entries by content hash, for files whose contents may already be indexed"""
+        found = {}
+        digests = list(digests)
+        columns = ', '.join(_COLUMNS)
+        for start in range(0, len(digests), 500):
+            chunk = digests[start:start + 500]
+            for row in self.connection.execute(
+                    f"SELECT {columns} FROM pdfs WHERE sha256 IN ({', '.join('?' * len(chunk))})", chunk):
+                found.setdefault(row[3], row)
+        return found
+
+    def _refresh(self, stats, stored, page_sizes=True):
+        """
+        Bring the index up to date for files whose size or modification time changed
+
+        Args:
+            stats (dict): path -> (size, mtime_ns) of the files to look up
+            stored (dict): path -> stored row, as returned by _stored
+            page_sizes (bool): Include page sizes in the returned entries
+
+        Returns:
+            dict: path -> entry for every path in stats
+        """
+        entries = {}
+        changed = []
+        for path, (size, mtime_ns) in stats.items():
+            row = stored.get(path)
+            if row is not None and row[1] == size and row[2] == mtime_ns:
+                entries[path] = self._entry(row)
+            else:
+                changed.append(path)
+        if not changed:
+            return entries
+
+        # Hash first: touched files and copies of indexed files need no parsing
+        digests = dict(zip(changed, _map(file_sha256, changed, self.workers)))
+        for path in [path for path in changed if digests[path] is None]:
+            entries[path] = _unreadable(path, "cannot be read")
+            changed.remove(path)
+            del digests[path]
+        known = self._by_hash(set(digests.values()))
+        unknown = sorted({path for path in changed if digests[path] not in known})
+        parsed = dict(zip(unknown, _map(_inspect_pdf, unknown, self.workers)))
+
+        now = time.time()
+        records = []
+        for path in changed:
+            size, mtime_ns = stats[path]
+            if path in parsed:
+                info = parsed[path]
+                info['page_sizes'] = json.dumps(info['page_sizes']) if info['page_sizes'] is not None else None
+            else:
+                info = dict(zip(_COLUMNS, known[digests[path]]))
+            record = (path, size, mtime_ns, digests[path], info['pages'], info['page_sizes'],
+                      int(info['encrypted']), int(info['valid']), info['error'])
+            records.append((os.path.dirname(path), now) + record)
+            entries[path] = self._entry(record if page_sizes else record[:5] + (None,) + record[6:])
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO pdfs (directory, indexed_at, path, size, mtime_ns, sha256, pages, "
+                "page_sizes, encrypted, valid, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", records)
+        return entries
+
+    def entries(self, paths, page_sizes=True):
+        """
+        Look up PDFs, indexing the ones that are new or changed
+
+        Args:
+            paths (list): Paths of PDF files
+            page_sizes (bool): Include page sizes; without them 'page_sizes' is None
+
+        Returns:
+            list: One entry dict per path, in order, with 'path', 'size',
+                'mtime_ns', 'sha256', 'pages', 'page_sizes' (list of
+                [width, height] in points), 'encrypted', 'valid' and 'error';
+                missing files get an entry with valid False
+        """
+        paths = [os.path.abspath(path) for path in paths]
+        stats = {}
+        missing = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                stats[path] = (stat.st_size, stat.st_mtime_ns)
+            except OSError as e:
+                missing[path] = _unreadable(path, e.strerror or str(e))
+
+        found = self._refresh(stats, self._stored(stats, page_sizes=page_sizes), page_sizes)
+        return [found.get(path) or missing[path] for path in paths]
+
+    def entry(self, path):
+        """Look up one PDF (see entries)"""
+        return self.entries([path])[0]
+
+    def page_count(self, path):
+        """Page count of a PDF, or None if it cannot be read"""
+        return self.entry(path)['pages']
+
+    def scan(self, directory, page_sizes=False):
+        """
+        Index every PDF in a directory (not recursive) and drop entries of
+        PDFs that were removed from it
+
+        Args:
+            directory (str): Directory to scan
+            page_sizes (bool): Include page sizes; without them 'page_sizes' is None
+
+        Returns:
+            list: Entries (see entries) of the directory's PDFs, in directory listing order
+        """
+        directory = os.path.abspath(directory)
+        stats = {}
+        with os.scandir(directory) as listing:
+            for item in listing:
+                if item.name.lower().endswith('.pdf') and item.is_file():
+                    stat = item.stat()
+                    stats[item.path] = (stat.st_size, stat.st_mtime_ns)
+
+        stored = self._stored(None, directory=directory, page_sizes=page_sizes)
+        removed = [(path,) for path in stored if path not in stats]
+        if removed:
+            with self.connection:
+                self.connection.executemany("DELETE FROM pdfs WHERE path = ?", removed)
+
+        found = self._refresh(stats, stored, page_sizes)
+        return [found[path] for path in stats]
+
+    def fingerprints(self, paths):
+        """
+        Page fingerprints of PDFs (see page_fingerprints), cached by content
+        hash so unchanged files and copies are never fingerprinted again.
+        Only fingerprints of the current FINGERPRINT_VERSION are reused.
+
+        Args:
+            paths (list): Paths of PDF files
+
+        Returns:
+            list: Per path, a list of hex page fingerprints, or None for files
+                that cannot be read
+        """
+        entries = self.entries(paths, page_sizes=False)
+        digests = {entry['sha256'] for entry in entries if entry['valid']}
+
+        cached = {}
+        digest_list = sorted(digests)
+        for start in range(0, len(digest_list), 500):
+            chunk = digest_list[start:start + 500]
+            for digest, fingerprints in self.connection.execute(
+                    f"SELECT sha256, fingerprints FROM page_fingerprints "
+                    f"WHERE version = ? AND sha256 IN ({', '.join('?' * len(chunk))})",
+                    [FINGERPRINT_VERSION] + chunk):
+                cached[digest] = json.loads(fingerprints)
+
+        # One file per content hash is enough
+        missing = {}
+        for entry in entries:
+            if entry['valid'] and entry['sha256'] not in cached:
+                missing.setdefault(entry['sha256'], entry['path'])
+        if missing:
+            computed = dict(zip(missing, _map(_page_fingerprints, list(missing.values()), self.workers)))
+            records = [(digest, FINGERPRINT_VERSION, json.dumps(fingerprints))
+                       for digest, fingerprints in computed.items() if fingerprints is not None]
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO page_fingerprints (sha256, version, fingerprints) "
+                    "VALUES (?, ?, ?)", records)
+            cached.update(computed)
+
+        return [cached.get(entry['sha256']) if entry['valid'] else None for entry in entries]
+
+    def prune(self):
+        """
+        Drop entries of files that no longer exist, and fingerprints no entry uses
+
+        Returns:
+            int: Number of entries removed
+        """
+        removed = [(path,) for path, in self.connection.execute("SELECT path FROM pdfs")
+                   if not os.path.exists(path)]
+        with self.connection:
+            self.connection.executemany("DELETE FROM pdfs WHERE path = ?", removed)
+            self.connection.execute(
+                "DELETE FROM page_fingerprints WHERE sha256 NOT IN (SELECT sha256 FROM pdfs)")
+        return len(removed)
+
+
+def main():
+    """Command line entry point: index directories and print their page counts"""
+    parser = argparse.ArgumentParser(description="Index PDF page counts and sizes for fast directory scans")
+    parser.add_argument("directories", nargs="*", help="Directories to scan")
+    parser.add_argument("--index", default=None, help="Index database (default: $PYTOOLS_INDEX or the user cache)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes for changed files")
+    parser.add_argument("--prune", action="store_true", help="Drop entries of files that no longer exist")
+    parser.add_argument("--duplicates", action="store_true",
+                        help="Also list files and pages that repeat earlier ones")
+    parser.add_argument("--within-files", action="store_true",
+                        help="With --duplicates, also list pages repeated within one file")
+    args = parser.parse_args()
+
+    with PdfIndex(args.index, workers=args.workers) as index:
+        if args.prune:
+            print(f"✓ Removed {index.prune()} stale entries")
+
+        for directory in args.directories:
+            start = time.perf_counter()
+            try:
+                entries = index.scan(directory)
+            except OSError as e:
+                print(f"✗ Cannot read {directory}: {str(e)}")
+                continue
+            elapsed = time.perf_counter() - start
+
+            for entry in entries:
+                name = os.path.basename(entry['path'])
+                if entry['valid']:
+                    lock = " (encrypted)" if entry['encrypted'] else ""
+                    print(f"  {name}: {entry['pages']} pages{lock}")
+                else:
+                    print(f"  ✗ {name}: {entry['error']}")
+            pages = sum(entry['pages'] for entry in entries if entry['valid'])
+            print(f"✓ {directory}: {len(entries)} PDFs, {pages:,} pages ({elapsed * 1000:.0f} ms)")
+
+            if args.duplicates:
+                paths = [entry['path'] for entry in entries]
+                duplicates = find_duplicates(paths, index.fingerprints(paths), args.within_files)
+                names = [os.path.basename(path) for path in paths]
+                for position, original in duplicates['files']:
+                    print(f"  {names[position]}: same pages as {names[original]}")
+                for position, page_index, original, original_index in duplicates['pages']:
+                    print(f"  {names[position]} page {page_index + 1}: same as "
+                          f"{names[original]} page {original_index + 1}")
+                print(f"✓ {len(duplicates['files'])} duplicate files, {len(duplicates['pages'])} duplicate pages")
+
+
+if __name__ == "__main__":
+    main()
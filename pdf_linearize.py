@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+"""
+Linearized ("fast web view") PDF output
+Rewrites a PDF so a viewer reading it over a network can show the first page
+as soon as the start of the file has arrived. The linearization dictionary,
+a cross-reference section for the first page, the catalog, the hint stream
+and every object the first page uses come first. Then come the remaining
+pages in order, the objects they share and everything else. A structural
+checker verifies the layout without a viewer.
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import re
+import time
+import zlib
+
+from instrumentation import emit, stage
+
+# Inherited page attributes that linearized page objects carry themselves
+INHERITED_KEYS = ('/Resources', '/MediaBox', '/CropBox', '/Rotate')
+
+# Catalog entries a viewer needs before the first page (plus /Outlines with /PageMode /UseOutlines)
+DOCUMENT_KEYS = ('/ViewerPreferences', '/PageMode', '/Threads', '/OpenAction', '/AcroForm')
+
+# Digits reserved for the offsets written before they are known
+OFFSET_WIDTH = 10
+
+
+class _BitWriter:
+    """Packs unsigned integers into big-endian bit fields, as hint tables store them"""
+
+    def __init__(self):
+        self.output = bytearray()
+        self.value = 0
+        self.bits = 0
+
+    def write(self, value, bits):
+        for shift in range(bits - 1, -1, -1):
+            self.value = (self.value << 1) | ((value >> shift) & 1)
+            self.bits += 1
+            if self.bits == 8:
+                self.output.append(self.value)
+                self.value = 0
+                self.bits = 0
+
+    def flush(self):
+        """Pad to a byte boundary"""
+        if self.bits:
+            self.write(0, 8 - self.bits)
+
+
+class _BitReader:
+    """Reads the bit fields written by _BitWriter"""
+
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+
+    def read(self, bits):
+        value = 0
+        for _ in range(bits):
+            byte = self.data[self.position // 8]
+            value = (value << 1) | ((byte >> (7 - self.position % 8)) & 1)
+            self.position += 1
+        return value
+
+    def align(self):
+        self.position = (self.position + 7) // 8 * 8
+
+
+def _bits_needed(value):
+    return value.bit_length()
+
+
+def _walk(objects, starts, skip):
+    """Object numbers reachable from some values in the order first reached, without entering skip or /Parent"""
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject
+
+    seen = set()
+    order = []
+    stack = list(reversed(starts))
+    while stack:
+        value = stack.pop()
+        if isinstance(value, IndirectObject):
+            number = value.idnum
+            if number in seen or number in skip:
+                continue
+            seen.add(number)
+            order.append(number)
+            value = objects[number]
+        if isinstance(value, DictionaryObject):
+            stack.extend(reversed([item for key, item in value.items() if key != '/Parent']))
+        elif isinstance(value, ArrayObject):
+            stack.extend(reversed(value))
+    return order
+
+
+def _page_tree(objects, node_number, inherited, pages, nodes):
+    """Collect page and page tree node numbers in page order, copying inherited attributes onto the pages"""
+    from PyPDF2.generic import NameObject
+
+    node = objects[node_number]
+    if node.get('/Type') != '/Pages' and '/Kids' not in node:
+        for key, value in inherited.items():
+            if key not in node:
+                node[NameObject(key)] = value
+        pages.append(node_number)
+        return
+
+    nodes.append(node_number)
+    inherited = dict(inherited)
+    for key in INHERITED_KEYS:
+        if key in node:
+            inherited[key] = node.raw_get(key)
+            del node[key]
+    for kid in node.raw_get('/Kids'):
+        _page_tree(objects, kid.idnum, inherited, pages, nodes)
+
+
+def _renumbered(obj, numbers):
+    """Copy of a direct object with its references renumbered"""
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject
+
+    if isinstance(obj, IndirectObject):
+        return IndirectObject(numbers[obj.idnum], 0, None)
+    if isinstance(obj, DictionaryObject):
+        copy = DictionaryObject()
+        for key, value in obj.items():
+            copy[key] = _renumbered(value, numbers)
+        return copy
+    if isinstance(obj, ArrayObject):
+        return ArrayObject(_renumbered(value, numbers) for value in obj)
+    return obj
+
+
+def _object_parts(number, obj, numbers):
+    """Serialized pieces of an object under its new number; stream data is passed through as is"""
+    from PyPDF2.generic import DictionaryObject, StreamObject
+
+    header = io.BytesIO()
+    if isinstance(obj, StreamObject):
+        DictionaryObject.write_to_stream(_renumbered(DictionaryObject(obj), numbers), header, None)
+        dictionary = header.getvalue()
+        return [f"{number} 0 obj\n".encode('ascii') + dictionary[:-2]
+                + f" /Length {len(obj._data)} >>\nstream\n".encode('ascii'),
+                obj._data, b"\nendstream\nendobj\n"]
+    _renumbered(obj, numbers).write_to_stream(header, None)
+    return [f"{number} 0 obj\n".encode('ascii') + header.getvalue() + b"\nendobj\n"]
+
+
+def _linearization_dict(number, length, hint_offset, hint_length, first_page, first_page_end, pages,
+                        main_xref_entry):
+    """Linearization parameter dictionary, with offsets padded to a fixed width"""
+    width = OFFSET_WIDTH
+    return (f"{number} 0 obj\n<< /Linearized 1 /L {length:{width}d} /H [ {hint_offset:{width}d} "
+            f"{hint_length:{width}d} ] /O {first_page} /E {first_page_end:{width}d} /N {pages} "
+            f"/T {main_xref_entry:{width}d} >>\nendobj\n").encode('ascii')
+
+
+def _hint_stream(pages, shared_lengths, first_page_objects, first_shared, page_offset):
+    """
+    Primary hint stream data: the page offset hint table and the shared object hint table
+
+    Args:
+        pages (list): Per page (object count, byte length, shared object identifiers)
+        shared_lengths (list): Byte length of each shared object table entry;
+            the first first_page_objects entries are the first page's objects
+        first_page_objects (int): Entries of the first page in the shared object table
+        first_shared (tuple): (object number, offset) of the first object of
+            the shared objects section, or (0, 0) if there is none
+        page_offset (int): Offset of the first page's page object
+
+    Returns:
+        tuple: (hint data, offset of the shared object hint table in it)
+    """
+    counts = [count for count, _, _ in pages]
+    lengths = [length for _, length, _ in pages]
+    shared = [identifiers for _, _, identifiers in pages]
+    least_count, least_length = min(counts), min(lengths)
+    count_bits = _bits_needed(max(counts) - least_count)
+    length_bits = _bits_needed(max(lengths) - least_length)
+    shared_count_bits = _bits_needed(max(len(identifiers) for identifiers in shared))
+    identifier_bits = _bits_needed(max((max(identifiers) for identifiers in shared if identifiers), default=0))
+
+    table = _BitWriter()
+    for value, bits in ((least_count, 32), (page_offset, 32), (count_bits, 16), (least_length, 32),
+                        (length_bits, 16), (0, 32), (0, 16), (least_length, 32), (length_bits, 16),
+                        (shared_count_bits, 16), (identifier_bits, 16), (0, 16), (4, 16)):
+        table.write(value, bits)
+    for values, least, bits in ((counts, least_count, count_bits), (lengths, least_length, length_bits),
+                                ([len(identifiers) for identifiers in shared], 0, shared_count_bits)):
+        for value in values:
+            table.write(value - least, bits)
+        table.flush()
+    for identifiers in shared:
+        for identifier in identifiers:
+            table.write(identifier, identifier_bits)
+    table.flush()
+    # Fractional positions take no bits; content stream offsets are 0 and
+    # content lengths are the page lengths
+    table.flush()
+    table.flush()
+    for length in lengths:
+        table.write(length - least_length, length_bits)
+    table.flush()
+    shared_offset = len(table.output)
+
+    least_group = min(shared_lengths)
+    group_bits = _bits_needed(max(shared_lengths) - least_group)
+    for value, bits in ((first_shared[0], 32), (first_shared[1], 32), (first_page_objects, 32),
+                        (len(shared_lengths), 32), (0, 16), (least_group, 32), (group_bits, 16)):
+        table.write(value, bits)
+    for length in shared_lengths:
+        table.write(length - least_group, group_bits)
+    table.flush()
+    for _ in shared_lengths:
+        table.write(0, 1)  # No MD5 signatures
+    table.flush()
+    # Every group is one object, so the object counts take no bits
+    table.flush()
+    return bytes(table.output), shared_offset
+
+
+def linearize_pdf(input_path, output_path=None, observer=None):
+    """
+    Rewrite a PDF in linearized form.
+
+    Args:
+        input_path (str): PDF to linearize
+        output_path (str): Where to write the result (default: replace the
+            input once the linearized file is complete)
+        observer (callable): Receives 'read' and 'write' stages and the
+            output byte count (see instrumentation) (optional)
+
+    Returns:
+        str: Path of the linearized PDF, or None if it could not be written
+    """
+    from PyPDF2 import PdfReader
+    from PyPDF2.generic import IndirectObject, StreamObject
+    from pdf_operations import _open_input
+    from pdf_optimize import _DocumentCopy
+
+    start = time.perf_counter()
+    target = output_path or input_path
+    temp_path = target + '.tmp'
+
+    try:
+        with _open_input(input_path) as input_file:
+            with stage(observer, 'read', file=input_path):
+                reader = PdfReader(input_file, strict=False)
+                if reader.is_encrypted:
+                    # The linearized copy is written without encryption
+                    reader.decrypt('')
+                document = _DocumentCopy(reader)
+            objects = document.objects
+            catalog = document.root.idnum
+
+            with stage(observer, 'write', file=target):
+                # Sort objects into the parts of a linearized file
+                pages, nodes = [], []
+                _page_tree(objects, objects[catalog].raw_get('/Pages').idnum, {}, pages, nodes)
+                if not pages:
+                    raise ValueError("the document has no pages")
+                structure = set(pages) | set(nodes) | {catalog}
+
+                keys = DOCUMENT_KEYS + (('/Outlines',) if objects[catalog].get('/PageMode') == '/UseOutlines' else ())
+                document_part = [catalog] + _walk(objects, [objects[catalog].raw_get(key) for key in keys
+                                                            if key in objects[catalog]], structure)
+                skip = structure | set(document_part)
+
+                def page_objects(page):
+                    values = [value for key, value in objects[page].items() if key != '/Parent']
+                    return [page] + _walk(objects, values, skip)
+
+                first_page = page_objects(pages[0])
+                first_set = set(first_page)
+                used = [page_objects(page) for page in pages[1:]]
+                users = {}
+                for page_used in used:
+                    for number in page_used:
+                        if number not in first_set:
+                            users[number] = users.get(number, 0) + 1
+
+                sections = [[number for number in page_used if users.get(number) == 1 or number == page_used[0]]
+                            for page_used in used]
+                shared_part = [number for number in sorted(users) if users[number] > 1]
+                placed = first_set | set(document_part) | set(shared_part)
+                placed.update(number for section in sections for number in section)
+                other_part = [number for number in range(1, len(objects)) if number not in placed]
+
+                # Main section objects are numbered from 1; the first-page section comes after them
+                main_order = [number for section in sections for number in section] + shared_part + other_part
+                main_count = len(main_order) + 1
+                linearization_number = main_count
+                first_order = document_part + [None] + first_page  # None marks the hint stream
+                numbers = {old: new for new, old in enumerate(main_order, 1)}
+                next_number = linearization_number + 1
+                for old in first_order:
+                    if old is None:
+                        hint_number = next_number
+                    else:
+                        numbers[old] = next_number
+                    next_number += 1
+                total = next_number
+
+                parts = {old: _object_parts(numbers[old], objects[old], numbers)
+                         for old in main_order + document_part + first_page}
+                sizes = {old: sum(len(part) for part in pieces) for old, pieces in parts.items()}
+
+                # Trailer values
+                root = IndirectObject(numbers[catalog], 0, None)
+                info = _renumbered(document.info, numbers) if document.info is not None else None
+                if document.id is not None:
+                    file_id = io.BytesIO()
+                    _renumbered(document.id, numbers).write_to_stream(file_id, None)
+                    file_id = file_id.getvalue().decode('latin-1')
+                else:
+                    digest = hashlib.md5(f"{input_path}{time.time()}".encode('utf-8')).hexdigest()
+                    file_id = f"[<{digest}> <{digest}>]"
+
+                def first_page_xref(offsets, main_xref):
+                    lines = [f"xref\n{linearization_number} {total - linearization_number}\n"]
+                    lines += [f"{offsets[number]:010d} 00000 n \n" for number in range(linearization_number, total)]
+                    trailer = f"trailer\n<< /Size {total} /Root {root.idnum} 0 R "
+                    if info is not None:
+                        info_text = io.BytesIO()
+                        info.write_to_stream(info_text, None)
+                        trailer += f"/Info {info_text.getvalue().decode('latin-1')} "
+                    trailer += f"/ID {file_id} /Prev {main_xref:{OFFSET_WIDTH}d} >>\nstartxref\n0\n%%EOF\n"
+                    return (''.join(lines) + trailer).encode('latin-1')
+
+                header = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n"
+                linearization_length = len(_linearization_dict(linearization_number, 0, 0, 0, numbers[pages[0]], 0, len(pages), 0))
+                placeholder = {number: 0 for number in range(linearization_number, total)}
+                first_xref_length = len(first_page_xref(placeholder, 0))
+
+                def layout(hint_length):
+                    """Offsets of every object with a hint stream of the given length"""
+                    offsets = {linearization_number: len(header)}
+                    position = len(header) + linearization_length + first_xref_length
+                    for old in document_part:
+                        offsets[numbers[old]] = position
+                        position += sizes[old]
+                    offsets[hint_number] = position
+                    position += hint_length
+                    for old in first_page + main_order:
+                        offsets[numbers[old]] = position
+                        position += sizes[old]
+                    return offsets, position
+
+                # Hint tables give offsets as if the hint stream were not there
+                offsets, main_xref = layout(0)
+                first_page_end = offsets[numbers[main_order[0]]] if main_order else main_xref
+                section_starts = [offsets[numbers[section[0]]] for section in sections]
+                section_ends = section_starts[1:] + [offsets[numbers[shared_part[0]]] if shared_part else
+                                                     offsets[numbers[other_part[0]]] if other_part else main_xref]
+                page_offset = offsets[numbers[first_page[0]]]
+                shared_index = {old: index for index, old in enumerate(first_page)}
+                shared_index.update({old: len(first_page) + index for index, old in enumerate(shared_part)})
+                page_hints = [(len(first_page), first_page_end - page_offset, [])]
+                for section, page_used, section_start, section_end in zip(sections, used, section_starts,
+                                                                          section_ends):
+                    identifiers = [shared_index[number] for number in page_used if number in shared_index]
+                    page_hints.append((len(section), section_end - section_start, identifiers))
+                first_shared = (numbers[shared_part[0]], offsets[numbers[shared_part[0]]]) if shared_part else (0, 0)
+                hint_data, shared_offset = _hint_stream(
+                    page_hints, [sizes[old] for old in first_page + shared_part], len(first_page),
+                    first_shared, page_offset)
+                hint_data = zlib.compress(hint_data)
+                hint_object = (f"{hint_number} 0 obj\n<< /S {shared_offset} /Filter /FlateDecode "
+                               f"/Length {len(hint_data)} >>\nstream\n").encode('ascii') + hint_data \
+                    + b"\nendstream\nendobj\n"
+
+                offsets, main_xref = layout(len(hint_object))
+                main_xref_head = f"xref\n0 {main_count}"
+                main_xref_text = [main_xref_head + "\n0000000000 65535 f \n"]
+                main_xref_text += [f"{offsets[number]:010d} 00000 n \n" for number in range(1, main_count)]
+                first_xref_offset = len(header) + linearization_length
+                main_xref_text.append(f"trailer\n<< /Size {main_count} >>\nstartxref\n{first_xref_offset}\n%%EOF\n")
+                main_xref_bytes = ''.join(main_xref_text).encode('ascii')
+                file_length = main_xref + len(main_xref_bytes)
+
+                with open(temp_path, 'wb') as output:
+                    output.write(header)
+                    output.write(_linearization_dict(
+                        linearization_number, file_length, offsets[hint_number], len(hint_object),
+                        numbers[pages[0]], first_page_end + len(hint_object), len(pages),
+                        main_xref + len(main_xref_head)))
+                    output.write(first_page_xref(offsets, main_xref))
+                    for old in document_part:
+                        for part in parts[old]:
+                            output.write(part)
+                    output.write(hint_object)
+                    for old in first_page + main_order:
+                        for part in parts[old]:
+                            output.write(part)
+                    output.write(main_xref_bytes)
+
+            del document, objects, reader, parts
+        os.replace(temp_path, target)
+
+    except Exception as e:
+        print(f"✗ Error linearizing {os.path.basename(input_path)}: {str(e)}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
+
+    emit(observer, 'bytes', count=os.path.getsize(target), file=target)
+    print(f"✓ Linearized {os.path.basename(target)}: first page readable after "
+          f"{first_page_end + len(hint_object):,} of {file_length:,} bytes "
+          f"({time.perf_counter() - start:.2f}s)")
+    return target
+
+
+def check_linearized(path):
+    """
+    Check the structure of a linearized PDF without rendering it
+
+    Verifies the linearization dictionary against the file, both
+    cross-reference sections and the trailer chain, the hint stream's page
+    offsets against the actual position of every page object, and that
+    everything the first page uses lies before the end of the first-page
+    section.
+
+    Args:
+        path (str): PDF to check
+
+    Returns:
+        list: Problems found; empty if the file is properly linearized
+    """
+    from PyPDF2 import PdfReader
+    from PyPDF2.generic import IndirectObject
+
+    problems = []
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    match = re.match(rb"%PDF-\d\.\d[^\n]*\n(?:%[^\n]*\n)?(\d+) 0 obj\s*<<(.*?)>>\s*endobj", data[:1024], re.S)
+    if match is None or b"/Linearized" not in match.group(2):
+        return ["no linearization dictionary at the start of the file"]
+    params = {}
+    for key in ('L', 'O', 'E', 'N', 'T'):
+        value = re.search(rb"/" + key.encode('ascii') + rb"\s+(\d+)", match.group(2))
+        if value is None:
+            problems.append(f"linearization dictionary has no /{key}")
+        else:
+            params[key] = int(value.group(1))
+    hint = re.search(rb"/H\s*\[\s*(\d+)\s+(\d+)", match.group(2))
+    if hint is None:
+        problems.append("linearization dictionary has no /H")
+    if problems:
+        return problems
+    hint_offset, hint_length = int(hint.group(1)), int(hint.group(2))
+
+    if params['L'] != len(data):
+        problems.append(f"/L is {params['L']} but the file has {len(data)} bytes")
+
+    # First-page cross-reference section directly after the dictionary
+    first_xref = match.end()
+    while data[first_xref:first_xref + 1] in (b"\r", b"\n", b" "):
+        first_xref += 1
+    if not data.startswith(b"xref", first_xref):
+        problems.append("the first-page cross-reference table does not follow the linearization dictionary")
+    final_startxref = re.findall(rb"startxref\s+(\d+)\s+%%EOF", data[-1024:])
+    if not final_startxref or int(final_startxref[-1]) != first_xref:
+        problems.append("the last startxref does not point to the first-page cross-reference table")
+    trailer = data.find(b"trailer", first_xref)
+    previous = re.search(rb"/Prev\s+(\d+)", data[trailer:data.find(b"startxref", trailer)]) if trailer > 0 else None
+    main_xref = int(previous.group(1)) if previous else None
+    if main_xref is None or not data.startswith(b"xref", main_xref):
+        problems.append("the first-page trailer's /Prev does not point to the main cross-reference table")
+    elif not (data[params['T']:params['T'] + 1].isspace()
+              and data[params['T'] + 1:params['T'] + 19] == b"0000000000 65535 f"):
+        problems.append("/T does not point to the first entry of the main cross-reference table")
+
+    try:
+        reader = PdfReader(io.BytesIO(data), strict=True)
+        page_refs = [page.indirect_reference for page in reader.pages]
+    except Exception as e:
+        return problems + [f"the file cannot be read: {str(e)}"]
+
+    if params['N'] != len(page_refs):
+        problems.append(f"/N is {params['N']} but the document has {len(page_refs)} pages")
+    if page_refs[0].idnum != params['O']:
+        problems.append(f"/O is {params['O']} but the first page is object {page_refs[0].idnum}")
+
+    def offset_of(number):
+        return reader.xref[0].get(number)
+
+    # Everything the first page uses must arrive before /E
+    first_page = reader.pages[0]
+    late = [number for number in [page_refs[0].idnum] + _walk_reader(reader, first_page)
+            if offset_of(number) is not None and offset_of(number) >= params['E']]
+    if late:
+        problems.append(f"{len(late)} objects used by the first page lie after /E")
+
+    # Hint stream: decode the page offset table and compare page positions
+    hint_match = re.match(rb"(\d+) 0 obj\s*<<(.*?)>>\s*stream\r?\n", data[hint_offset:hint_offset + 512], re.S)
+    if hint_match is None:
+        problems.append("/H does not point to a stream object")
+        return problems
+    if not data[hint_offset:hint_offset + hint_length].rstrip().endswith(b"endobj"):
+        problems.append("/H length does not end at the end of the hint stream object")
+    try:
+        hint_object = reader.get_object(IndirectObject(int(hint_match.group(1)), 0, reader))
+        hints = _BitReader(hint_object.get_data())
+    except Exception as e:
+        problems.append(f"the hint stream cannot be read: {str(e)}")
+        return problems
+
+    least_count = hints.read(32)
+    first_offset = hints.read(32)
+    count_bits = hints.read(16)
+    least_length = hints.read(32)
+    length_bits = hints.read(16)
+    hints.read(32 * 2 + 16 * 6)
+    for _ in page_refs:
+        hints.read(count_bits)
+    hints.align()
+    lengths = [least_length + hints.read(length_bits) for _ in page_refs]
+
+    def adjusted(offset):
+        # Hint table offsets leave out the hint stream itself
+        return offset - hint_length if offset > hint_offset else offset
+
+    expected = first_offset
+    for index, (reference, length) in enumerate(zip(page_refs, lengths)):
+        actual = offset_of(reference.idnum)
+        if actual is None or adjusted(actual) != expected:
+            problems.append(f"hint table places page {index + 1} at {expected}, "
+                            f"but its page object is at {actual}")
+            break
+        expected += length
+    if least_count == 0:
+        problems.append("hint table says a page has no objects")
+    return problems
+
+
+def _walk_reader(reader, page):
+    """Object numbers a page of a PdfReader uses, not following /Parent or other pages"""
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject
+
+    pages = {reference.idnum for reference in (p.indirect_reference for p in reader.pages)}
+    seen = set()
+    stack = [value for key, value in page.items() if key != '/Parent']
+    while stack:
+        value = stack.pop()
+        if isinstance(value, IndirectObject):
+            if value.idnum in seen or value.idnum in pages:
+                continue
+            seen.add(value.idnum)
+            value = value.get_object()
+            if isinstance(value, DictionaryObject) and value.get('/Type') == '/Pages':
+                continue
+        if isinstance(value, DictionaryObject):
+            stack.extend(item for key, item in value.items() if key != '/Parent')
+        elif isinstance(value, ArrayObject):
+            stack.extend(value)
+    return list(seen)
+
+
+def main():
+    """Command line entry point for linearizing and checking PDFs"""
+    parser = argparse.ArgumentParser(description="Write PDFs in linearized (fast web view) form")
+    parser.add_argument("pdfs", nargs="+", help="PDF files")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Output file (one input only; default: replace each input)")
+    parser.add_argument("--check", action="store_true", help="Only check whether the files are linearized")
+    args = parser.parse_args()
+
+    if args.output and len(args.pdfs) > 1:
+        parser.error("--output needs a single input file")
+
+    failed = 0
+    for path in args.pdfs:
+        if not args.check:
+            path = linearize_pdf(path, args.output)
+            if path is None:
+                failed += 1
+                continue
+        problems = check_linearized(path)
+        if problems:
+            failed += 1
+            print(f"✗ {os.path.basename(path)} is not properly linearized:")
+            for problem in problems:
+                print(f"    {problem}")
+        else:
+            print(f"✓ {os.path.basename(path)} is linearized")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,52 +1,726 @@
 from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import (ArrayObject, DecodedStreamObject, DictionaryObject, EncodedStreamObject,
+                            IndirectObject, NameObject, NullObject, NumberObject, StreamObject)
+import hashlib
+import io
+import mmap
 import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from instrumentation import StageTimer, emit, record_stages, stage
 
-def split_pdf(input_path):
+# Inputs opened and parsed ahead of the one being copied during a merge
+MERGE_WINDOW = 4
+
+# Inputs below this count are validated in-process rather than in a process pool
+PARALLEL_VALIDATION_THRESHOLD = 16
+
+# Most children per node of the merged document's page tree
+PAGE_TREE_FANOUT = 64
+
+# Pages of a large PDF given to one worker at a time by split_pdfs
+SPLIT_TASK_PAGES = 100
+
+# Reader kept open by each split_pdfs worker process: (path, file, reader)
+_worker_reader = None
+
+# Inputs at least this large are memory-mapped unless told otherwise
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+# Reads from a mapped input at least this long return a view instead of a copy
+ZERO_COPY_MIN = 64 * 1024
+
+class MappedPdfFile:
+    """
+    Read-only file object over a memory-mapped PDF.
+    
+    PdfReader parses objects lazily from the mapping, and long reads (the
+    data of page content, image and font streams) come back as memoryview
+    slices of it. Streams that are only copied are never decoded, so their
+    bytes go from the page cache to the output without being held in memory.
+    """
+    
+    mode = 'rb'
+    
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mapping)
+        self.position = 0
+    
+    def read(self, size=-1):
+        start = self.position
+        end = len(self.view) if size is None or size < 0 else min(start + size, len(self.view))
+        self.position = max(start, end)
+        # Only stream data (a long read that ends at an endstream keyword) is
+        # returned as a view; PyPDF2 searches in other reads, which needs bytes
+        if end - start >= ZERO_COPY_MIN and self.mapping[end:end + 12].lstrip().startswith(b"endstream"):
+            return self.view[start:end]
+        return self.mapping[start:end]
+    
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self.position
+        elif whence == 2:
+            offset += len(self.view)
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self.position = offset
+        return offset
+    
+    def tell(self):
+        return self.position
+    
+    def close(self):
+        """Unmap the file, or leave it to be unmapped once no stream data refers to it"""
+        try:
+            self.view.release()
+            self.mapping.close()
+        except BufferError:
+            pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _open_input(path, mmap_input=None):
+    """
+    Open a PDF for reading
+    
+    Args:
+        path (str): PDF path
+        mmap_input (bool): Memory-map the file (MappedPdfFile) instead of
+            using buffered reads; None maps files of MMAP_THRESHOLD bytes or more
+    
+    Returns:
+        File object to pass to PdfReader
+    """
+    size = os.path.getsize(path)
+    if mmap_input is None:
+        mmap_input = size >= MMAP_THRESHOLD
+    if mmap_input and size > 0:
+        return MappedPdfFile(path)
+    return open(path, 'rb')
+
+def _page_ranges(page_count, pages_per_file=1, ranges=None):
+    """0-based (first, last) page ranges for each output file of a split"""
+    if ranges is not None:
+        for first, last in ranges:
+            if not 1 <= first <= last <= page_count:
+                raise ValueError(f"Page range {first}-{last} is outside pages 1-{page_count}")
+        return [(first - 1, last - 1) for first, last in ranges]
+    
+    if pages_per_file < 1:
+        raise ValueError("pages_per_file must be at least 1")
+    return [(first, min(first + pages_per_file, page_count) - 1)
+            for first in range(0, page_count, pages_per_file)]
+
+def _split_file_name(stem, first, last, page_count):
+    """Output file name of a split's 0-based page range"""
+    # Zero-pad page numbers so the files sort in page order
+    width = len(str(page_count))
+    if first == last:
+        return f"{stem}_page_{first + 1:0{width}d}.pdf"
+    return f"{stem}_pages_{first + 1:0{width}d}-{last + 1:0{width}d}.pdf"
+
+def _write_page_range(reader, first, last, output_path):
+    """Write pages first..last (0-based, inclusive) of a reader to a new PDF"""
+    writer = PdfWriter()
+    for page_number in range(first, last + 1):
+        writer.add_page(reader.pages[page_number])
+    with open(output_path, 'wb') as output_file:
+        writer.write(output_file)
+    
+    # Let go of the parsed objects of these pages before the next file
+    del writer
+    reader.resolved_objects.clear()
+
+def iter_split_pdf(input_path, output_dir=None, pages_per_file=1, ranges=None, observer=None,
+                   mmap_input=None):
     """
-    Read a PDF file and return a list of its pages.
+    Split a PDF into single pages or page ranges, writing each to its own file as it goes.
+    
+    Only the pages of the file being written are held in memory: the reader's
+    object cache is dropped after every output file, so archives of any size
+    can be split.
     
     Args:
         input_path (str): Path to the input PDF file
+        output_dir (str): Directory for the output files
+            (default: a '<name>_pages' directory next to the input)
+        pages_per_file (int): Pages in each output file
+        ranges (list): (first, last) 1-based inclusive page ranges, one output
+            file each, instead of pages_per_file (optional)
+        observer (callable): Receives a 'read' stage, a 'write' stage per output
+            file and page and byte counts (see instrumentation) (optional)
+        mmap_input (bool): Memory-map the input and pass stream data through
+            without copying it (see MappedPdfFile); None maps inputs of
+            MMAP_THRESHOLD bytes or more
+    
+    Yields:
+        str: Path of each output file once it has been written
+    """
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    if output_dir is None:
+        output_dir = os.path.join(os.path.dirname(input_path) or '.', f"{stem}_pages")
+    os.makedirs(output_dir, exist_ok=True)
+    
+    with _open_input(input_path, mmap_input) as input_file:
+        with stage(observer, 'read', file=input_path):
+            # Create a PDF reader object; pages are parsed when they are used
+            reader = PdfReader(input_file)
+            page_count = len(reader.pages)
+        
+        for first, last in _page_ranges(page_count, pages_per_file, ranges):
+            output_path = os.path.join(output_dir, _split_file_name(stem, first, last, page_count))
+            with stage(observer, 'write', file=output_path):
+                _write_page_range(reader, first, last, output_path)
+            
+            emit(observer, 'pages', count=last - first + 1, file=output_path)
+            emit(observer, 'bytes', count=os.path.getsize(output_path), file=output_path)
+            yield output_path
+
+def split_pdf(input_path, output_dir=None, pages_per_file=1, ranges=None, observer=None, mmap_input=None):
+    """
+    Split a PDF into files of single pages or page ranges.
+    
+    Args:
+        input_path (str): Path to the input PDF file
+        output_dir (str): Directory for the output files
+            (default: a '<name>_pages' directory next to the input)
+        pages_per_file (int): Pages in each output file
+        ranges (list): (first, last) 1-based inclusive page ranges, one output
+            file each, instead of pages_per_file (optional)
+        observer (callable): Receives a 'read' stage, a 'write' stage per output
+            file and page and byte counts (see instrumentation) (optional)
+        mmap_input (bool): Memory-map the input and pass stream data through
+            without copying it (see MappedPdfFile); None maps inputs of
+            MMAP_THRESHOLD bytes or more
     
     Returns:
-        list: List of pages from the PDF
+        list: Paths of the written files, or an empty list if the split failed
     """
+    output_paths = []
     try:
-        # Create a PDF reader object
-        reader = PdfReader(input_path)
-        pages = []
+        for output_path in iter_split_pdf(input_path, output_dir, pages_per_file, ranges, observer,
+                                          mmap_input):
+            output_paths.append(output_path)
         
-        # Extract each page and add to the list
-        for page in reader.pages:
-            pages.append(page)
-            
-        print(f"Successfully processed {len(pages)} pages from {os.path.basename(input_path)}")
-        return pages
+        print(f"Successfully split {os.path.basename(input_path)} into {len(output_paths)} files")
+        return output_paths
         
     except Exception as e:
         print(f"Error processing {input_path}: {str(e)}")
         return []
 
-def merge_pdfs(input_files, output_dir):
+def _split_output_dirs(input_files, output_root):
+    """One output directory per input, named after the file; repeated names get _2, _3, ... in input order"""
+    output_dirs = []
+    used = set()
+    for path in input_files:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name = stem
+        counter = 2
+        while name in used:
+            name = f"{stem}_{counter}"
+            counter += 1
+        used.add(name)
+        output_dirs.append(os.path.join(output_root, name))
+    return output_dirs
+
+def _reader_for(path, mmap_input=None):
+    """Open reader for a PDF, reused across the tasks a worker process gets for the same file"""
+    global _worker_reader
+    if _worker_reader is not None and _worker_reader[0] == path:
+        return _worker_reader[2]
+    if _worker_reader is not None:
+        _worker_reader[1].close()
+        _worker_reader = None
+    
+    input_file, reader = _open_pdf(path, mmap_input)
+    _worker_reader = (path, input_file, reader)
+    return reader
+
+def _split_task(input_path, output_dir, page_ranges, page_count, mmap_input=None):
+    """
+    Write some page ranges of one PDF, in a worker process
+    
+    Returns:
+        dict: 'files' (paths written), 'pages', 'bytes', 'stages' (stage
+            durations) and 'error' (message, or None)
+    """
+    timer = StageTimer()
+    result = {'files': [], 'pages': 0, 'bytes': 0, 'error': None}
+    try:
+        with timer.stage('read'):
+            reader = _reader_for(input_path, mmap_input)
+        stem = os.path.splitext(os.path.basename(input_path))[0]
+        os.makedirs(output_dir, exist_ok=True)
+        
+        for first, last in page_ranges:
+            output_path = os.path.join(output_dir, _split_file_name(stem, first, last, page_count))
+            with timer.stage('write'):
+                _write_page_range(reader, first, last, output_path)
+            result['files'].append(output_path)
+            result['pages'] += last - first + 1
+            result['bytes'] += os.path.getsize(output_path)
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+    result['stages'] = timer.stages
+    return result
+
+def _run_split_task(task):
+    return _split_task(*task)
+
+def split_pdfs(input_files, output_root, pages_per_file=1, workers=None, observer=None, index=None,
+               mmap_input=None):
+    """
+    Split many PDFs at once, spreading files and the page ranges of large
+    files over a pool of worker processes.
+    
+    Each input gets its own directory under output_root named after the file
+    (repeated names get _2, _3, ... in input order), with the same file names
+    as split_pdf, so the layout does not depend on which worker wrote what.
+    A file listed more than once is split once.
+    
+    Args:
+        input_files (list): Paths of the PDF files
+        output_root (str): Directory that receives one subdirectory per input
+        pages_per_file (int): Pages in each output file
+        workers (int): Worker processes (default: CPU count; 1 splits in-process)
+        observer (callable): Receives a 'validate' stage, and per input the
+            'read' and 'write' stage durations and page and byte counts (see
+            instrumentation) (optional)
+        index (pdf_index.PdfIndex): Page counts come from this page index
+            instead of opening every file first (optional)
+        mmap_input (bool): Memory-map the inputs (see split_pdf)
+    
+    Returns:
+        dict: 'files' (input path -> list of written paths, in page order),
+            'failed' (input path -> error message), 'pages', 'bytes' and 'seconds'
+    """
+    start = time.perf_counter()
+    if pages_per_file < 1:
+        raise ValueError("pages_per_file must be at least 1")
+    
+    # Results are keyed by input path, so each file is split only once
+    unique = {}
+    for path in input_files:
+        unique.setdefault(os.path.abspath(path), path)
+    input_files = list(unique.values())
+    
+    with stage(observer, 'validate', files=len(input_files)):
+        checked = validate_pdfs(input_files, workers=workers, index=index)
+    summary = {'files': {}, 'failed': {}, 'pages': 0, 'bytes': 0}
+    
+    # Large files are cut into tasks of about SPLIT_TASK_PAGES pages each
+    ranges_per_task = max(1, SPLIT_TASK_PAGES // pages_per_file)
+    tasks = []
+    for (path, page_count, error), output_dir in zip(checked, _split_output_dirs(input_files, output_root)):
+        if error is not None:
+            summary['failed'][path] = error
+            continue
+        summary['files'][path] = []
+        page_ranges = _page_ranges(page_count, pages_per_file)
+        for first in range(0, len(page_ranges), ranges_per_task):
+            tasks.append((path, output_dir, page_ranges[first:first + ranges_per_task], page_count, mmap_input))
+    
+    if (workers or os.cpu_count() or 1) == 1 or len(tasks) <= 1:
+        results = map(_run_split_task, tasks)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # Tasks of one file are queued together, so a worker mostly gets
+        # consecutive ranges of the file it already has open
+        results = executor.map(_run_split_task, tasks, chunksize=1)
+    
+    try:
+        for task, result in zip(tasks, results):
+            path = task[0]
+            record_stages(observer, result['stages'], file=path)
+            if result['files']:
+                emit(observer, 'pages', count=result['pages'], file=path)
+                emit(observer, 'bytes', count=result['bytes'], file=path)
+            summary['files'][path].extend(result['files'])
+            summary['pages'] += result['pages']
+            summary['bytes'] += result['bytes']
+            if result['error'] is not None and path not in summary['failed']:
+                summary['failed'][path] = result['error']
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    # Inputs with a failed task keep the files that were written
+    for path, error in summary['failed'].items():
+        print(f"✗ {os.path.basename(path)}: {error}")
+    summary['seconds'] = time.perf_counter() - start
+    output_files = sum(len(paths) for paths in summary['files'].values())
+    print(f"✓ Split {len(input_files) - len(summary['failed'])} of {len(input_files)} PDFs into "
+          f"{output_files:,} files ({summary['pages']:,} pages) in {summary['seconds']:.2f}s")
+    return summary
+
+def _validate_pdf(path):
+    """Open a PDF and count its pages; returns (page count, None) or (None, error message)"""
+    try:
+        with open(path, 'rb') as f:
+            reader = PdfReader(f, strict=False)
+            if reader.is_encrypted and not reader.decrypt(''):
+                return None, "encrypted with a password"
+            return len(reader.pages), None
+    except Exception as e:
+        return None, str(e) or type(e).__name__
+
+def validate_pdfs(input_files, workers=None, index=None):
+    """
+    Check that every input can be opened and has pages, in parallel for large batches.
+    
+    Args:
+        input_files (list): Paths of the PDF files
+        workers (int): Worker processes (default: CPU count)
+        index (pdf_index.PdfIndex): Answer from this page index, which only
+            parses files it has not seen unchanged before (optional)
+    
+    Returns:
+        list: (path, page count, error) per input, in input order; page count
+            is None and error is a message for inputs that cannot be merged
+    """
+    if index is not None:
+        results = [(entry['pages'], entry['error'] if not entry['valid'] else None)
+                   for entry in index.entries(input_files, page_sizes=False)]
+    elif len(input_files) < PARALLEL_VALIDATION_THRESHOLD:
+        results = [_validate_pdf(path) for path in input_files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_validate_pdf, input_files, chunksize=16))
+    
+    checked = []
+    for path, (page_count, error) in zip(input_files, results):
+        if error is None and page_count == 0:
+            error = "no pages"
+        checked.append((path, page_count if error is None else None, error))
+    return checked
+
+def _open_pdf(path, mmap_input=None):
+    """Open and parse a PDF for merging; the caller closes the returned file"""
+    input_file = _open_input(path, mmap_input)
+    try:
+        reader = PdfReader(input_file, strict=False)
+        if reader.is_encrypted:
+            reader.decrypt('')
+        reader.pages[0]  # Parse the page tree here, off the writing thread
+    except Exception:
+        input_file.close()
+        raise
+    return input_file, reader
+
+class _StreamingPdfWriter:
+    """
+    Writes a merged PDF incrementally: each input's pages and the objects they
+    use are copied to the output as soon as the input is read, so only one
+    input's objects are in memory. The page tree, catalog and cross-reference
+    table are written at the end.
+    
+    With deduplicate, stream objects (fonts, images, ICC profiles, content)
+    are identified by a hash of their dictionary and data, and a stream
+    identical to one already written is shared instead of written again.
+    Pages given a fingerprint already written are left out, and references
+    to them point at the page that was kept.
+    """
+    
+    def __init__(self, output_file, deduplicate=True):
+        self.output = output_file
+        self.deduplicate = deduplicate
+        # Content hash -> object number of each stream written
+        self.streams = {}
+        # Source streams being copied, to break reference cycles between streams
+        self.copying = set()
+        self.duplicates = 0
+        self.bytes_saved = 0
+        # Page fingerprint -> object number of the page written with it
+        self.page_fingerprints = {}
+        self.skipped_pages = 0
+        # Byte offset of each object, by object number (0 is the free list head)
+        self.offsets = [None]
+        self.pages = []
+        self.leaves = []
+        self.output.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+    
+    def _reserve(self):
+        """Allocate an object number to be written later"""
+        self.offsets.append(None)
+        return len(self.offsets) - 1
+    
+    def _write_object(self, number, obj):
+        self.offsets[number] = self.output.tell()
+        self.output.write(f"{number} 0 obj\n".encode('ascii'))
+        obj.write_to_stream(self.output, None)
+        self.output.write(b"\nendobj\n")
+    
+    def _write_serialized(self, number, *parts):
+        self.offsets[number] = self.output.tell()
+        self.output.write(f"{number} 0 obj\n".encode('ascii'))
+        for part in parts:
+            self.output.write(part)
+        self.output.write(b"\nendobj\n")
+    
+    def _copy_stream(self, key, source, numbers, pending):
+        """Copy a stream, or reuse an identical stream already written; returns its object number"""
+        # Streams it references are copied (and shared) first, so identical
+        # streams end up with identical references and the same hash
+        self.copying.add(key)
+        try:
+            copy = self._copy(source, numbers, pending)
+        finally:
+            self.copying.discard(key)
+        
+        # Hash and write the dictionary and the data separately, so stream
+        # data (possibly a view of a memory-mapped input) is never copied
+        data = copy._data
+        copy[NameObject('/Length')] = NumberObject(len(data))
+        header = io.BytesIO()
+        DictionaryObject.write_to_stream(copy, header, None)
+        header = header.getvalue()
+        digest = hashlib.sha256(header)
+        digest.update(data)
+        digest = digest.digest()
+        
+        number = self.streams.get(digest)
+        if number is None:
+            number = self.streams[digest] = self._reserve()
+            self._write_serialized(number, header, b"\nstream\n", data, b"\nendstream")
+        else:
+            self.duplicates += 1
+            self.bytes_saved += len(header) + len(data) + 18
+        return number
+    
+    def _copy(self, obj, numbers, pending):
+        """Copy a direct object, renumbering references and queueing the objects they point to"""
+        if isinstance(obj, IndirectObject):
+            key = (obj.idnum, obj.generation)
+            number = numbers.get(key)
+            if number is None:
+                source = obj.get_object() if self.deduplicate and key not in self.copying else None
+                if isinstance(source, StreamObject):
+                    number = numbers[key] = self._copy_stream(key, source, numbers, pending)
+                else:
+                    number = numbers[key] = self._reserve()
+                    pending.append((number, obj))
+            return IndirectObject(number, 0, None)
+        if isinstance(obj, StreamObject):
+            # Content streams parsed into operations are written back decoded
+            copy = EncodedStreamObject() if isinstance(obj, EncodedStreamObject) else DecodedStreamObject()
+            copy._data = obj._data
+            for key, value in obj.items():
+                if key != '/Length':  # Rewritten from the data
+                    copy[key] = self._copy(value, numbers, pending)
+            return copy
+        if isinstance(obj, DictionaryObject):
+            copy = DictionaryObject()
+            for key, value in obj.items():
+                copy[key] = self._copy(value, numbers, pending)
+            return copy
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self._copy(value, numbers, pending) for value in obj)
+        return obj
+    
+    def add_document(self, reader, fingerprints=None, within_document=False):
+        """
+        Copy every page of a document and the objects its pages use
+        
+        Args:
+            reader (PdfReader): Document to copy
+            fingerprints (list): Fingerprint of each page (see
+                pdf_index.page_fingerprints); pages whose fingerprint was
+                written by an earlier document are skipped (optional)
+            within_document (bool): Also skip pages repeating an earlier
+                page of this document
+        
+        Returns:
+            int: Number of pages added
+        """
+        # Source object -> output object number, for this document only
+        numbers = {}
+        pending = deque()
+        page_numbers = []
+        # Fingerprint -> page number, for pages first written by this document
+        written = {}
+        
+        # Number the pages first so links and annotations pointing at a page
+        # of this document resolve to the copied page, or to the identical
+        # page already written in its place
+        for page_index, page in enumerate(reader.pages):
+            fingerprint = fingerprints[page_index] if fingerprints is not None else None
+            number = self.page_fingerprints.get(fingerprint)
+            if number is None and within_document:
+                number = written.get(fingerprint)
+            if number is None:
+                number = self._reserve()
+                page_numbers.append((page, number))
+                if fingerprint is not None:
+                    written.setdefault(fingerprint, number)
+            else:
+                self.skipped_pages += 1
+            if page.indirect_reference is not None:
+                numbers[(page.indirect_reference.idnum, page.indirect_reference.generation)] = number
+        for fingerprint, number in written.items():
+            self.page_fingerprints.setdefault(fingerprint, number)
+        
+        for page, number in page_numbers:
+            copy = DictionaryObject()
+            for key, value in page.items():
+                if key != '/Parent':
+                    copy[key] = self._copy(value, numbers, pending)
+            self.pages.append(number)
+            copy[NameObject('/Parent')] = self._page_parent(len(self.pages) - 1)
+            self._write_object(number, copy)
+            
+            while pending:
+                number, reference = pending.popleft()
+                source = reference.get_object()
+                self._write_object(number, NullObject() if source is None else
+                                   self._copy(source, numbers, pending))
+        
+        return len(page_numbers)
+    
+    def _page_parent(self, page_index):
+        """Reference to the leaf page tree node that will hold a page"""
+        if page_index % PAGE_TREE_FANOUT == 0:
+            self.leaves.append(self._reserve())
+        return IndirectObject(self.leaves[-1], 0, None)
+    
+    def _write_pages_node(self, number, kids, count, parent):
+        node = DictionaryObject({
+            NameObject('/Type'): NameObject('/Pages'),
+            NameObject('/Kids'): ArrayObject(IndirectObject(kid, 0, None) for kid in kids),
+            NameObject('/Count'): NumberObject(count),
+        })
+        if parent is not None:
+            node[NameObject('/Parent')] = IndirectObject(parent, 0, None)
+        self._write_object(number, node)
+    
+    def close(self):
+        """Write the page tree, catalog, cross-reference table and trailer"""
+        # Build a balanced page tree bottom-up from the leaves the pages were
+        # given as parents; each level is a list of (object number, kids, page count)
+        level = [(leaf, self.pages[i * PAGE_TREE_FANOUT:(i + 1) * PAGE_TREE_FANOUT])
+                 for i, leaf in enumerate(self.leaves)]
+        level = [(number, kids, len(kids)) for number, kids in level]
+        while len(level) > 1:
+            parents = []
+            for i in range(0, len(level), PAGE_TREE_FANOUT):
+                group = level[i:i + PAGE_TREE_FANOUT]
+                parent = self._reserve()
+                for number, kids, count in group:
+                    self._write_pages_node(number, kids, count, parent)
+                parents.append((parent, [number for number, _, _ in group], sum(count for _, _, count in group)))
+            level = parents
+        root, kids, count = level[0]
+        self._write_pages_node(root, kids, count, None)
+        
+        catalog = self._reserve()
+        self._write_object(catalog, DictionaryObject({
+            NameObject('/Type'): NameObject('/Catalog'),
+            NameObject('/Pages'): IndirectObject(root, 0, None),
+        }))
+        
+        xref_offset = self.output.tell()
+        self.output.write(f"xref\n0 {len(self.offsets)}\n".encode('ascii'))
+        self.output.write(b"0000000000 65535 f \n")
+        for offset in self.offsets[1:]:
+            # Reserved numbers that were never used are listed as free
+            if offset is None:
+                self.output.write(b"0000000000 65535 f \n")
+            else:
+                self.output.write(f"{offset:010d} 00000 n \n".encode('ascii'))
+        self.output.write(f"trailer\n<< /Size {len(self.offsets)} /Root {catalog} 0 R >>\n"
+                          f"startxref\n{xref_offset}\n%%EOF\n".encode('ascii'))
+
+def merge_pdfs(input_files, output_dir, observer=None, skip_invalid=False, window=MERGE_WINDOW,
+               validation_workers=None, deduplicate=True, index=None, mmap_input=None, optimize=False,
+               compression_level=6, linearize=False, skip_duplicates=False,
+               skip_repeated_pages=False):
     """
     Merge multiple PDF files into a single PDF.
     
+    Pages are streamed to the output one input at a time, so memory use and
+    open file handles stay bounded however many files are merged. Every input
+    is validated first (in parallel for large batches), so a broken file is
+    reported before anything is written. Identical streams such as fonts,
+    images and ICC profiles embedded by every input are written once and
+    shared.
+    
     Args:
         input_files (list): List of paths to PDF files to merge
         output_dir (str): Directory where the merged PDF will be saved
+        observer (callable): Receives a 'validate' stage, a 'read' and a
+            'write' stage per input, page and byte counts and the bytes saved
+            by sharing streams (see instrumentation) (optional)
+        skip_invalid (bool): Leave out inputs that cannot be read instead of
+            failing the whole merge
+        window (int): Inputs opened and parsed ahead of the one being written
+        validation_workers (int): Worker processes validating the inputs
+            (default: CPU count)
+        deduplicate (bool): Share identical streams between inputs
+        index (pdf_index.PdfIndex): Validate from this page index instead of
+            parsing every input (optional)
+        mmap_input (bool): Memory-map the inputs and pass their stream data
+            through without copying it (see MappedPdfFile); None maps inputs
+            of MMAP_THRESHOLD bytes or more
+        optimize (bool): Recompress the merged file and write it with object
+            and xref streams (see pdf_optimize.optimize_pdf)
+        compression_level (int): zlib level for optimize, 1 (fastest) to 9 (smallest)
+        linearize (bool): Write the merged file linearized, so viewers can show
+            the first page before the rest has downloaded (see
+            pdf_linearize.linearize_pdf); with optimize, streams stay
+            recompressed but objects are not packed into object streams
+        skip_duplicates (bool): Leave out files and pages identical to ones
+            already merged, by page fingerprints computed in parallel and
+            cached in index (see pdf_index.page_fingerprints); links to a
+            skipped page point at the page that was kept
+        skip_repeated_pages (bool): With skip_duplicates, also leave out
+            pages repeated within one input
     
     Returns:
         str: Path to the merged PDF file, or None if merge failed
     """
+    output_path = None
     try:
-        # Create a PDF writer object
-        writer = PdfWriter()
+        with stage(observer, 'validate', files=len(input_files)):
+            checked = validate_pdfs(input_files, workers=validation_workers, index=index)
+        invalid = [(path, error) for path, _, error in checked if error is not None]
+        for path, error in invalid:
+            print(f"✗ {os.path.basename(path)}: {error}")
+        if invalid and not skip_invalid:
+            print(f"Error merging PDFs: {len(invalid)} of {len(input_files)} files cannot be read")
+            return None
+        input_files = [path for path, _, error in checked if error is None]
+        if not input_files:
+            print("Error merging PDFs: no readable PDF files to merge")
+            return None
         
-        # Add pages from each input file
-        for pdf_file in input_files:
-            reader = PdfReader(pdf_file)
-            for page in reader.pages:
-                writer.add_page(page)
+        page_lists = [None] * len(input_files)
+        if skip_duplicates:
+            from pdf_index import find_duplicates, page_fingerprints
+            with stage(observer, 'fingerprint', files=len(input_files)):
+                if index is not None:
+                    page_lists = index.fingerprints(input_files)
+                else:
+                    page_lists = page_fingerprints(input_files, workers=validation_workers)
+            duplicates = find_duplicates(input_files, page_lists, within_files=skip_repeated_pages)
+            names = [os.path.basename(path) for path in input_files]
+            for position, original in duplicates['files']:
+                print(f"✓ Skipping {names[position]}: same pages as {names[original]}")
+            repeated = Counter(position for position, *_ in duplicates['pages'])
+            for position, count in repeated.items():
+                print(f"✓ Skipping {count} of {len(page_lists[position])} pages of {names[position]} "
+                      f"already merged")
+            skipped = {position for position, _ in duplicates['files']}
+            kept = [position for position in range(len(input_files)) if position not in skipped]
+            input_files = [input_files[position] for position in kept]
+            page_lists = [page_lists[position] for position in kept]
         
         # Generate output filename
         output_filename = "merged_document.pdf"
@@ -59,15 +733,65 @@ def merge_pdfs(input_files, output_dir):
             output_path = os.path.join(output_dir, output_filename)
             counter += 1
         
-        # Write the merged PDF to file
-        with open(output_path, 'wb') as output_file:
-            writer.write(output_file)
+        # A background thread opens the next inputs while the current one is
+        # copied; at most `window` inputs are open at once
+        with ThreadPoolExecutor(max_workers=1) as prefetch, open(output_path, 'wb') as output_file:
+            writer = _StreamingPdfWriter(output_file, deduplicate=deduplicate)
+            pending = deque()
+            next_input = 0
+            
+            while next_input < len(input_files) or pending:
+                while next_input < len(input_files) and len(pending) < max(window, 1):
+                    path = input_files[next_input]
+                    pending.append((path, page_lists[next_input], prefetch.submit(_open_pdf, path, mmap_input)))
+                    next_input += 1
+                
+                pdf_file, fingerprints, future = pending.popleft()
+                try:
+                    with stage(observer, 'read', file=pdf_file):
+                        input_file, reader = future.result()
+                    with input_file:
+                        with stage(observer, 'write', file=pdf_file):
+                            writer.add_document(reader, fingerprints, within_document=skip_repeated_pages)
+                        # Drop parsed objects (and views of a mapped input) before closing it
+                        reader.resolved_objects.clear()
+                    del reader
+                except Exception:
+                    # Close inputs that were already opened ahead
+                    for *_, opened in pending:
+                        try:
+                            opened.result()[0].close()
+                        except Exception:
+                            pass
+                    raise
+            
+            writer.close()
+        
+        if optimize:
+            from pdf_optimize import optimize_pdf
+            optimize_pdf(output_path, level=compression_level, observer=observer)
+        
+        if linearize:
+            from pdf_linearize import linearize_pdf
+            if linearize_pdf(output_path, observer=observer) is None:
+                raise ValueError("the merged file could not be linearized")
         
+        emit(observer, 'pages', count=len(writer.pages), file=output_path)
+        emit(observer, 'bytes', count=os.path.getsize(output_path), file=output_path)
+        emit(observer, 'bytes_saved', count=writer.bytes_saved, file=output_path)
+        
+        if writer.duplicates:
+            print(f"✓ Shared {writer.duplicates:,} duplicate streams, saving {writer.bytes_saved:,} bytes")
+        if writer.skipped_pages:
+            print(f"✓ Skipped {writer.skipped_pages:,} duplicate pages")
         print(f"Successfully merged {len(input_files)} PDFs into {output_filename}")
         return output_path
         
     except Exception as e:
         print(f"Error merging PDFs: {str(e)}")
+        # Don't leave a partial merge behind
+        if output_path is not None and os.path.exists(output_path):
+            os.remove(output_path)
         return None
 
 if __name__ == "__main__":
@@ -79,9 +803,6 @@ if __name__ == "__main__":
         print(f"Error: Directory '{directory_path}' does not exist.")
         exit(1)
     
-    # List to store all pages from all PDFs
-    final_list = []
-    
     # Scan directory for PDF files
     pdf_files = [f for f in os.listdir(directory_path) if f.lower().endswith('.pdf')]
     
@@ -91,15 +812,11 @@ if __name__ == "__main__":
     
     print(f"\nFound {len(pdf_files)} PDF files in the directory.")
     
-    # Process each PDF file
-    for pdf_file in pdf_files:
-        full_path = os.path.join(directory_path, pdf_file)
-        print(f"\nProcessing: {pdf_file}")
-        
-        # Get pages from current PDF and append to final list
-        pages = split_pdf(full_path)
-        final_list.extend(pages)
+    # Pages are written to a folder per PDF under split_pages/, with files
+    # spread over one worker process per core
+    output_root = os.path.join(directory_path, "split_pages")
+    summary = split_pdfs([os.path.join(directory_path, pdf_file) for pdf_file in pdf_files], output_root)
     
     # Print summary
-    print(f"\nTotal pages from all PDFs: {final_list}") 
-    print(f"\nTotal pages collected from all PDFs: {len(final_list)}") 
\ No newline at end of file
+    total_files = sum(len(paths) for paths in summary['files'].values())
+    print(f"\nTotal page files written to {output_root}: {total_files}")
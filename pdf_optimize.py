@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+PDF output optimization
+Rewrites a finished PDF smaller: uncompressed and weakly compressed streams
+are Flate-compressed again at a chosen level across a thread pool, small
+objects are packed into compressed object streams and the cross-reference
+table is written as a compressed xref stream. Image data in other formats
+(JPEG, JPEG 2000, fax) is copied as is.
+"""
+
+import argparse
+import io
+import os
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentation import emit, stage
+
+# Default zlib level: 6 is zlib's own default, 9 is smallest and slowest
+DEFAULT_LEVEL = 6
+
+# Most objects packed into one object stream
+OBJECTS_PER_STREAM = 200
+
+# Streams shorter than this are not worth compressing
+MIN_STREAM_BYTES = 64
+
+
+def _flate_filter(stream):
+    """Check whether a stream is uncompressed (None) or plain Flate ('flate'); anything else returns False"""
+    filters = stream.get('/Filter')
+    if filters is None:
+        return None
+    if isinstance(filters, list):
+        if len(filters) != 1:
+            return False
+        filters = filters[0]
+    elif not isinstance(filters, str):
+        return False
+    # Predictors (DecodeParms) would have to be undone and redone
+    if filters == '/FlateDecode' and stream.get('/DecodeParms') is None:
+        return 'flate'
+    return False
+
+
+def _recompress(job):
+    """
+    Compress stream data at a zlib level, in a pool thread (zlib releases the GIL)
+
+    Args:
+        job (tuple): (data, 'flate' if the data is already Flate-compressed
+            else None, zlib level)
+
+    Returns:
+        bytes: Compressed data, or None if it is not smaller than the original
+    """
+    data, current, level = job
+    try:
+        raw = zlib.decompress(data) if current == 'flate' else data
+    except zlib.error:
+        return None
+    compressed = zlib.compress(raw, level)
+    return compressed if len(compressed) < len(data) else None
+
+
+def _serialize(obj):
+    """PDF syntax of a non-stream object"""
+    buffer = io.BytesIO()
+    obj.write_to_stream(buffer, None)
+    return buffer.getvalue()
+
+
+class _DocumentCopy:
+    """
+    Every object reachable from a document's trailer, renumbered from 1 in
+    the order they are reached
+    """
+
+    def __init__(self, reader):
+        from PyPDF2.generic import NullObject
+
+        self.objects = [None]
+        self.numbers = {}
+        self.pending = deque()
+
+        trailer = reader.trailer
+        self.root = self._copy(trailer.raw_get('/Root'))
+        self.info = self._copy(trailer.raw_get('/Info')) if '/Info' in trailer else None
+        self.id = self._copy(trailer.raw_get('/ID')) if '/ID' in trailer else None
+
+        while self.pending:
+            number, reference = self.pending.popleft()
+            source = reference.get_object()
+            self.objects[number] = NullObject() if source is None else self._copy(source)
+
+    def _copy(self, obj):
+        from PyPDF2.generic import (ArrayObject, DecodedStreamObject, DictionaryObject,
+                                    EncodedStreamObject, IndirectObject, StreamObject)
+
+        if isinstance(obj, IndirectObject):
+            key = (obj.idnum, obj.generation)
+            number = self.numbers.get(key)
+            if number is None:
+                number = self.numbers[key] = len(self.objects)
+                self.objects.append(None)
+                self.pending.append((number, obj))
+            return IndirectObject(number, 0, None)
+        if isinstance(obj, StreamObject):
+            copy = EncodedStreamObject() if isinstance(obj, EncodedStreamObject) else DecodedStreamObject()
+            copy._data = obj._data
+            for key, value in obj.items():
+                if key != '/Length':
+                    copy[key] = self._copy(value)
+            return copy
+        if isinstance(obj, DictionaryObject):
+            copy = DictionaryObject()
+            for key, value in obj.items():
+                copy[key] = self._copy(value)
+            return copy
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self._copy(value) for value in obj)
+        return obj
+
+
+def _write_stream(output, number, dictionary, data):
+    """Write a stream object with its dictionary given as PDF syntax without /Length"""
+    output.write(f"{number} 0 obj\n".encode('ascii'))
+    output.write(dictionary[:-2] + f" /Length {len(data)} >>".encode('ascii'))
+    output.write(b"\nstream\n")
+    output.write(data)
+    output.write(b"\nendstream\nendobj\n")
+
+
+def optimize_pdf(input_path, output_path=None, level=DEFAULT_LEVEL, workers=None, object_streams=True,
+                 observer=None):
+    """
+    Rewrite a PDF with recompressed streams, object streams and a compressed xref stream.
+
+    Args:
+        input_path (str): PDF to optimize
+        output_path (str): Where to write the result (default: replace the
+            input once the optimized file is complete)
+        level (int): zlib compression level, 1 (fastest) to 9 (smallest)
+        workers (int): Threads compressing streams (default: CPU count)
+        object_streams (bool): Pack non-stream objects into object streams
+        observer (callable): Receives 'read', 'compress' and 'write' stages
+            and the output byte count (see instrumentation) (optional)
+
+    Returns:
+        dict: 'input_bytes', 'output_bytes', 'seconds', 'streams_recompressed'
+            and 'objects_packed', or None if the PDF could not be optimized
+    """
+    from PyPDF2 import PdfReader
+    from PyPDF2.generic import ArrayObject, DictionaryObject, NameObject, NumberObject, StreamObject
+    from pdf_operations import _open_input
+
+    if not 1 <= level <= 9:
+        raise ValueError("level must be between 1 and 9")
+    start = time.perf_counter()
+    input_bytes = os.path.getsize(input_path)
+    target = output_path or input_path
+    temp_path = target + '.tmp'
+
+    try:
+        with _open_input(input_path) as input_file:
+            with stage(observer, 'read', file=input_path):
+                reader = PdfReader(input_file, strict=False)
+                if reader.is_encrypted:
+                    # The optimized copy is written without encryption
+                    reader.decrypt('')
+                document = _DocumentCopy(reader)
+            objects = document.objects
+
+            # Recompress what can be made smaller; Flate work runs in parallel
+            with stage(observer, 'compress', file=input_path):
+                candidates = []
+                for number, obj in enumerate(objects):
+                    if isinstance(obj, StreamObject) and obj.get('/Type') != '/Metadata' \
+                            and len(obj._data) >= MIN_STREAM_BYTES:
+                        current = _flate_filter(obj)
+                        if current is not False:
+                            candidates.append((number, current))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = executor.map(_recompress, [(objects[number]._data, current, level)
+                                                         for number, current in candidates])
+                    recompressed = 0
+                    for (number, current), data in zip(candidates, results):
+                        if data is None:
+                            continue
+                        stream = objects[number]
+                        stream._data = data
+                        stream[NameObject('/Filter')] = NameObject('/FlateDecode')
+                        recompressed += 1
+
+            with stage(observer, 'write', file=target), open(temp_path, 'wb') as output:
+                output.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+                # Object number -> (1, offset) for objects in the file body,
+                # (2, object stream number, index) for packed objects
+                entries = [(0, 0, 65535)] + [None] * (len(objects) - 1)
+                packed = []
+
+                for number, obj in enumerate(objects[1:], 1):
+                    if isinstance(obj, StreamObject):
+                        entries[number] = (1, output.tell(), 0)
+                        header = io.BytesIO()
+                        DictionaryObject.write_to_stream(obj, header, None)
+                        _write_stream(output, number, header.getvalue(), obj._data)
+                    elif object_streams:
+                        packed.append(number)
+                    else:
+                        entries[number] = (1, output.tell(), 0)
+                        output.write(f"{number} 0 obj\n".encode('ascii') + _serialize(obj) + b"\nendobj\n")
+
+                for first in range(0, len(packed), OBJECTS_PER_STREAM):
+                    group = packed[first:first + OBJECTS_PER_STREAM]
+                    stream_number = len(entries)
+                    offsets = []
+                    body = io.BytesIO()
+                    for index, number in enumerate(group):
+                        offsets.append(f"{number} {body.tell()}")
+                        body.write(_serialize(objects[number]))
+                        body.write(b"\n")
+                        entries[number] = (2, stream_number, index)
+                    head = (" ".join(offsets) + "\n").encode('ascii')
+                    data = zlib.compress(head + body.getvalue(), level)
+                    entries.append((1, output.tell(), 0))
+                    _write_stream(output, stream_number, _serialize(DictionaryObject({
+                        NameObject('/Type'): NameObject('/ObjStm'),
+                        NameObject('/N'): NumberObject(len(group)),
+                        NameObject('/First'): NumberObject(len(head)),
+                        NameObject('/Filter'): NameObject('/FlateDecode'),
+                    })), data)
+
+                # The xref stream lists itself as the last object
+                xref_number = len(entries)
+                xref_offset = output.tell()
+                entries.append((1, xref_offset, 0))
+                offset_width = max(1, (max(entry[1] for entry in entries).bit_length() + 7) // 8)
+                rows = b"".join(kind.to_bytes(1, 'big') + field.to_bytes(offset_width, 'big')
+                                + extra.to_bytes(2, 'big') for kind, field, extra in entries)
+                trailer = DictionaryObject({
+                    NameObject('/Type'): NameObject('/XRef'),
+                    NameObject('/Size'): NumberObject(len(entries)),
+                    NameObject('/W'): ArrayObject([NumberObject(1), NumberObject(offset_width), NumberObject(2)]),
+                    NameObject('/Root'): document.root,
+                    NameObject('/Filter'): NameObject('/FlateDecode'),
+                })
+                if document.info is not None:
+                    trailer[NameObject('/Info')] = document.info
+                if document.id is not None:
+                    trailer[NameObject('/ID')] = document.id
+                _write_stream(output, xref_number, _serialize(trailer), zlib.compress(rows, level))
+                output.write(f"startxref\n{xref_offset}\n%%EOF\n".encode('ascii'))
+
+            del document, objects, reader
+        os.replace(temp_path, target)
+
+    except Exception as e:
+        print(f"✗ Error optimizing {os.path.basename(input_path)}: {str(e)}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
+
+    output_bytes = os.path.getsize(target)
+    emit(observer, 'bytes', count=output_bytes, file=target)
+    result = {
+        'input_bytes': input_bytes,
+        'output_bytes': output_bytes,
+        'seconds': time.perf_counter() - start,
+        'streams_recompressed': recompressed,
+        'objects_packed': len(packed),
+    }
+    change = (output_bytes - input_bytes) / input_bytes * 100 if input_bytes else 0.0
+    print(f"✓ Optimized {os.path.basename(target)}: {input_bytes:,} -> {output_bytes:,} bytes "
+          f"({change:+.1f}%) in {result['seconds']:.2f}s")
+    return result
+
+
+def optimize_pdfs(paths, level=DEFAULT_LEVEL, workers=None, object_streams=True, observer=None):
+    """
+    Optimize several PDFs in place and print the total size change
+
+    Args:
+        paths (list): PDFs to optimize
+        level, workers, object_streams, observer: As for optimize_pdf
+
+    Returns:
+        list: optimize_pdf result per path (None for files that failed)
+    """
+    results = [optimize_pdf(path, level=level, workers=workers, object_streams=object_streams,
+                            observer=observer) for path in paths]
+    done = [result for result in results if result is not None]
+    if len(paths) > 1 and done:
+        before = sum(result['input_bytes'] for result in done)
+        after = sum(result['output_bytes'] for result in done)
+        seconds = sum(result['seconds'] for result in done)
+        print(f"✓ Optimized {len(done)} of {len(paths)} PDFs: {before:,} -> {after:,} bytes in {seconds:.2f}s")
+    return results
+
+
+def main():
+    """Command line entry point for optimizing PDFs"""
+    parser = argparse.ArgumentParser(description="Recompress PDFs and pack them with object and xref streams")
+    parser.add_argument("pdfs", nargs="+", help="PDF files to optimize")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Output file (one input only; default: replace each input)")
+    parser.add_argument("-l", "--level", type=int, default=DEFAULT_LEVEL, choices=range(1, 10),
+                        metavar="1-9", help="zlib compression level")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Compression threads")
+    parser.add_argument("--no-object-streams", action="store_true",
+                        help="Keep objects out of object streams")
+    args = parser.parse_args()
+
+    if args.output and len(args.pdfs) > 1:
+        parser.error("--output needs a single input file")
+
+    if args.output:
+        optimize_pdf(args.pdfs[0], args.output, level=args.level, workers=args.workers,
+                     object_streams=not args.no_object_streams)
+    else:
+        optimize_pdfs(args.pdfs, level=args.level, workers=args.workers,
+                      object_streams=not args.no_object_streams)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Tests for resumable directory conversion in batch_convert
+"""
+
+import os
+
+import pandas as pd
+
+from batch_convert import JobManifest, convert_directory
+
+
+def test_failed_sheet_is_retried_on_rerun(tmp_path):
+    input_dir = tmp_path / 'in'
+    input_dir.mkdir()
+    workbook = str(input_dir / 'book.xlsx')
+    with pd.ExcelWriter(workbook) as writer:
+        pd.DataFrame({'a': [1]}).to_excel(writer, sheet_name='Good', index=False)
+        pd.DataFrame({'a': [2]}).to_excel(writer, sheet_name='Bad', index=False)
+
+    # A directory in the way of one sheet's PDF makes that sheet fail
+    output_dir = tmp_path / 'out'
+    blocked = output_dir / 'book' / 'Bad.pdf'
+    blocked.mkdir(parents=True)
+
+    summary = convert_directory([str(input_dir)], str(output_dir), workers=1)
+    assert (summary['files'], summary['failed']) == (0, 1)
+    assert not JobManifest(str(output_dir / 'batch_manifest.json')).is_done(workbook)
+
+    blocked.rmdir()
+    summary = convert_directory([str(input_dir)], str(output_dir), workers=1)
+    assert (summary['files'], summary['failed']) == (1, 0)
+    assert os.path.isfile(blocked)
+    assert JobManifest(str(output_dir / 'batch_manifest.json')).is_done(workbook)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-hash conversion cache used by excel_to_pdf
+"""
+
+import json
+import os
+
+import pandas as pd
+
+from conversion_cache import ConversionCache
+from excel_to_pdf import excel_to_pdf_reportlab
+
+
+def write_workbook(path, scores):
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        pd.DataFrame({'Name': ['Ann', 'Bob'], 'Score': scores}).to_excel(writer, sheet_name='Scores', index=False)
+        pd.DataFrame({'Item': ['Pen', 'Ink'], 'Price': [1.5, 2.25]}).to_excel(writer, sheet_name='Prices', index=False)
+
+
+def manifest(cache_dir, workbook):
+    with open(ConversionCache(cache_dir).manifest_path(workbook), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_rerun_reuses_cached_sheets(tmp_path):
+    workbook = str(tmp_path / 'book.xlsx')
+    cache_dir = str(tmp_path / 'cache')
+    output_dir = str(tmp_path / 'out')
+    write_workbook(workbook, [90, 75])
+
+    first = excel_to_pdf_reportlab(workbook, output_dir, cache_dir=cache_dir)
+    assert manifest(cache_dir, workbook)['misses'] == 2
+    contents = {}
+    for path in first:
+        with open(path, 'rb') as f:
+            contents[path] = f.read()
+
+    second = excel_to_pdf_reportlab(workbook, output_dir, cache_dir=cache_dir)
+    assert sorted(second) == sorted(first)
+    assert (manifest(cache_dir, workbook)['hits'], manifest(cache_dir, workbook)['misses']) == (2, 0)
+    for path in second:
+        with open(path, 'rb') as f:
+            assert f.read() == contents[path]
+
+
+def test_changed_sheet_is_converted_again(tmp_path):
+    workbook = str(tmp_path / 'book.xlsx')
+    cache_dir = str(tmp_path / 'cache')
+    output_dir = str(tmp_path / 'out')
+    write_workbook(workbook, [90, 75])
+    excel_to_pdf_reportlab(workbook, output_dir, cache_dir=cache_dir)
+
+    write_workbook(workbook, [90, 80])
+    excel_to_pdf_reportlab(workbook, output_dir, cache_dir=cache_dir)
+    statuses = {entry['sheet']: entry['status'] for entry in manifest(cache_dir, workbook)['sheets']}
+    assert statuses == {'Scores': 'miss', 'Prices': 'hit'}
+
+
+def test_same_named_workbooks_keep_separate_manifests(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    workbooks = []
+    for folder, scores in (('north', [90, 75]), ('south', [60, 70])):
+        (tmp_path / folder).mkdir()
+        workbook = str(tmp_path / folder / 'book.xlsx')
+        write_workbook(workbook, scores)
+        excel_to_pdf_reportlab(workbook, str(tmp_path / folder / 'out'), cache_dir=cache_dir)
+        workbooks.append(workbook)
+
+    assert len(os.listdir(os.path.join(cache_dir, 'manifests'))) == 2
+    for workbook in workbooks:
+        assert manifest(cache_dir, workbook)['workbook'] == os.path.realpath(workbook)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for the Excel to PDF converters in excel_to_pdf
+"""
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+from PyPDF2 import PdfReader
+
+from excel_to_pdf import _max_text_width, _text_width, excel_to_pdf_reportlab_streaming, iter_excel_rows
+
+
+def write_ragged_workbook(path):
+    """One sheet whose last row has a blank trailing cell, which read-only mode drops"""
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = 'S'
+    for row in (['a', 'b', 'c'], [1, 2, 3], [1, 2, None]):
+        worksheet.append(row)
+    workbook.save(path)
+
+
+def test_streamed_rows_match_the_header_width(tmp_path):
+    path = str(tmp_path / 'ragged.xlsx')
+    write_ragged_workbook(path)
+
+    sheets = [(name, header, list(rows)) for name, header, rows in iter_excel_rows(path)]
+    assert sheets == [('S', ['a', 'b', 'c'], [[1, 2, 3], [1, 2, ""]])]
+
+
+def test_streaming_converts_a_sheet_with_a_short_trailing_row(tmp_path):
+    path = str(tmp_path / 'ragged.xlsx')
+    write_ragged_workbook(path)
+
+    pdfs = excel_to_pdf_reportlab_streaming(path, str(tmp_path / 'out'))
+    assert len(pdfs) == 1
+    assert 'a' in PdfReader(pdfs[0]).pages[0].extract_text()
+
+
+def test_column_width_is_the_widest_cell_across_lengths():
+    texts = pd.Series([f"note {i}" for i in range(5000)] + ["W" * 32767, "Ärger €", "", "Mittel" * 40])
+
+    expected = max(_text_width(text, 'Helvetica', 10) for text in texts)
+    assert _max_text_width(texts, 'Helvetica', 10) == pytest.approx(expected)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the TableStyle commands built by excel_to_pdf_advanced
+"""
+
+import numpy as np
+
+from excel_to_pdf_advanced import _style_commands
+
+RED = '#FF0000'
+THIN = (0.5, '#000000')
+
+
+def style(background=None, left=None, right=None):
+    """A style tuple in _PROPERTIES order with Helvetica text"""
+    return (background, '#000000', 'Helvetica', 10, 'LEFT', 'MIDDLE', None, None, left, right)
+
+
+def commands_for(name, commands):
+    return [command[1:3] for command in commands if command[0] == name]
+
+
+def test_unfilled_cell_gets_no_background():
+    styles = [style(RED), style()]
+    grid = np.zeros((3, 3), dtype=np.int32)
+    grid[1, 1] = 1
+
+    backgrounds = commands_for('BACKGROUND', _style_commands(grid, styles))
+    painted = set()
+    for (first_col, first_row), (last_col, last_row) in backgrounds:
+        painted.update((row, col) for row in range(first_row, last_row + 1)
+                       for col in range(first_col, last_col + 1))
+    assert (1, 1) not in painted
+    assert len(painted) == 8
+
+
+def test_unbordered_cells_get_no_lines():
+    styles = [style(left=THIN, right=THIN), style()]
+    grid = np.zeros((4, 2), dtype=np.int32)
+    grid[2:, 1] = 1
+
+    commands = _style_commands(grid, styles)
+    for name in ('LINEBEFORE', 'LINEAFTER'):
+        for (first_col, first_row), (last_col, last_row) in commands_for(name, commands):
+            assert not (last_col >= 1 and last_row >= 2)
+
+
+def test_fully_styled_block_uses_one_base_command():
+    grid = np.zeros((3, 3), dtype=np.int32)
+    grid[0, :] = 1
+
+    backgrounds = commands_for('BACKGROUND', _style_commands(grid, [style(RED), style('#00FF00')]))
+    assert backgrounds[0] == ((0, 0), (2, 2))
+    assert len(backgrounds) == 2
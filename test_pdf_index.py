@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for page fingerprints and duplicate detection in pdf_index
+"""
+
+import os
+import sqlite3
+
+from PyPDF2 import PdfReader
+
+import pdf_index
+from pdf_index import PdfIndex, find_duplicates, page_fingerprints
+from pdf_operations import merge_pdfs
+
+
+def write_plain_pdf(path, texts, annotate=()):
+    """
+    Write a PDF with uncompressed content streams and resources inherited
+    from the page tree, one page per text
+
+    Args:
+        path (str): Output path
+        texts (list): Text shown on each page
+        annotate (tuple): Indexes of pages that get a link annotation
+    """
+    objects = {1: "<< /Type /Catalog /Pages 2 0 R >>",
+               3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    number = 4
+    for page_index, text in enumerate(texts):
+        content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects[number] = f"<< /Length {len(content)} >>\nstream\n{content}\nendstream"
+        annots = ""
+        if page_index in annotate:
+            annots = (" /Annots [ << /Type /Annot /Subtype /Link /Rect [ 0 0 10 10 ] "
+                      "/A << /S /URI /URI (http://example.com) >> >> ]")
+        objects[number + 1] = f"<< /Type /Page /Parent 2 0 R /Contents {number} 0 R{annots} >>"
+        kids.append(f"{number + 1} 0 R")
+        number += 2
+    objects[2] = (f"<< /Type /Pages /Kids [ {' '.join(kids)} ] /Count {len(texts)} "
+                  f"/Resources << /Font << /F1 3 0 R >> >> /MediaBox [ 0 0 612 792 ] >>")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for key in sorted(objects):
+        offsets[key] = len(output)
+        output += f"{key} 0 obj\n{objects[key]}\nendobj\n".encode('latin-1')
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('ascii')
+    for key in sorted(objects):
+        output += f"{offsets[key]:010d} 00000 n \n".encode('ascii')
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('ascii')
+    with open(path, 'wb') as f:
+        f.write(output)
+
+
+def test_uncompressed_pages_get_different_fingerprints(tmp_path):
+    path = str(tmp_path / 'inh.pdf')
+    write_plain_pdf(path, ["Inherited page 1", "Inherited page 2"])
+
+    fingerprints, = page_fingerprints([path])
+    assert len(fingerprints) == 2
+    assert fingerprints[0] != fingerprints[1]
+
+
+def test_identical_pages_get_the_same_fingerprint(tmp_path):
+    first, second = str(tmp_path / 'a.pdf'), str(tmp_path / 'b.pdf')
+    write_plain_pdf(first, ["Cover", "Body A"])
+    write_plain_pdf(second, ["Cover", "Body B"])
+
+    a, b = page_fingerprints([first, second])
+    assert a[0] == b[0]
+    assert a[1] != b[1]
+
+
+def test_annotations_are_part_of_the_fingerprint(tmp_path):
+    path = str(tmp_path / 'links.pdf')
+    write_plain_pdf(path, ["Same", "Same"], annotate=(1,))
+
+    fingerprints, = page_fingerprints([path])
+    assert fingerprints[0] != fingerprints[1]
+
+
+def test_merging_a_file_with_itself_keeps_distinct_pages(tmp_path):
+    path = str(tmp_path / 'inh.pdf')
+    write_plain_pdf(path, ["Inherited page 1", "Inherited page 2"])
+    output_dir = tmp_path / 'out'
+    output_dir.mkdir()
+
+    output = merge_pdfs([path, path], str(output_dir), skip_duplicates=True)
+    assert len(PdfReader(output).pages) == 2
+
+
+def test_pages_repeated_within_a_file_are_kept_unless_requested(tmp_path):
+    path = str(tmp_path / 'repeat.pdf')
+    write_plain_pdf(path, ["Page", "Page", "Other"])
+    output_dir = tmp_path / 'out'
+    output_dir.mkdir()
+
+    assert find_duplicates([path], page_fingerprints([path]))['pages'] == []
+    assert find_duplicates([path], page_fingerprints([path]), within_files=True)['pages'] == [(0, 1, 0, 0)]
+
+    output = merge_pdfs([path], str(output_dir), skip_duplicates=True)
+    assert len(PdfReader(output).pages) == 3
+    output = merge_pdfs([path], str(output_dir), skip_duplicates=True, skip_repeated_pages=True)
+    assert len(PdfReader(output).pages) == 2
+
+
+def test_fingerprints_are_cached_by_content_hash(tmp_path):
+    path = str(tmp_path / 'doc.pdf')
+    write_plain_pdf(path, ["One", "Two"])
+
+    with PdfIndex(str(tmp_path / 'index.sqlite')) as index:
+        expected = index.fingerprints([path])
+        cached = index.connection.execute("SELECT COUNT(*) FROM page_fingerprints").fetchone()[0]
+        assert cached == 1
+        # A touched file keeps its content hash and its cached fingerprints
+        os.utime(path, ns=(0, 0))
+        assert index.fingerprints([path]) == expected
+
+
+def test_fingerprints_of_another_version_are_recomputed(tmp_path, monkeypatch):
+    path = str(tmp_path / 'doc.pdf')
+    write_plain_pdf(path, ["One", "Two"])
+    index_path = str(tmp_path / 'index.sqlite')
+
+    with PdfIndex(index_path) as index:
+        expected = index.fingerprints([path])
+        index.connection.execute("UPDATE page_fingerprints SET fingerprints = '[\"stale\", \"stale\"]'")
+        index.connection.commit()
+
+    monkeypatch.setattr(pdf_index, 'FINGERPRINT_VERSION', pdf_index.FINGERPRINT_VERSION + 1)
+    with PdfIndex(index_path) as index:
+        assert index.fingerprints([path]) == expected
+        versions = index.connection.execute("SELECT version FROM page_fingerprints").fetchall()
+        assert versions == [(pdf_index.FINGERPRINT_VERSION,)]
+
+
+def test_unversioned_fingerprint_table_is_replaced(tmp_path):
+    path = str(tmp_path / 'doc.pdf')
+    write_plain_pdf(path, ["One", "Two"])
+    index_path = str(tmp_path / 'index.sqlite')
+    connection = sqlite3.connect(index_path)
+    connection.execute("CREATE TABLE page_fingerprints (sha256 TEXT PRIMARY KEY, fingerprints TEXT NOT NULL)")
+    connection.execute("INSERT INTO page_fingerprints VALUES (?, ?)", (pdf_index.file_sha256(path), '["stale"]'))
+    connection.commit()
+    connection.close()
+
+    with PdfIndex(index_path) as index:
+        assert index.fingerprints([path]) == page_fingerprints([path])
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming PDF merge: output pages must render exactly like
+the input pages they were copied from
+"""
+
+import pytest
+from PyPDF2 import PdfReader
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from pdf_operations import PAGE_TREE_FANOUT, merge_pdfs
+
+
+def write_report(path, title, pages, logo):
+    """Write a small report: a shared logo image and one line of text per page"""
+    pdf_canvas = canvas.Canvas(path)
+    for page in range(pages):
+        pdf_canvas.drawImage(logo, 50, 700, 64, 64)
+        pdf_canvas.setFont('Helvetica-Bold' if page % 2 else 'Times-Roman', 14)
+        pdf_canvas.drawString(150, 720, f"{title} page {page + 1}")
+        pdf_canvas.rect(50, 100, 200 + page, 300, fill=page % 2)
+        pdf_canvas.showPage()
+    pdf_canvas.save()
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    """Three reports sharing a logo; together they need more than one page tree leaf"""
+    from PIL import Image
+    logo_path = tmp_path / 'logo.png'
+    Image.new('RGB', (16, 16), (200, 30, 30)).save(logo_path)
+    logo = ImageReader(str(logo_path))
+
+    paths = []
+    for title, pages in (("Alpha", 3), ("Beta", PAGE_TREE_FANOUT + 5), ("Gamma", 2)):
+        path = str(tmp_path / f"{title.lower()}.pdf")
+        write_report(path, title, pages, logo)
+        paths.append(path)
+    return paths
+
+
+def rendered_pages(paths):
+    """Pixels of every page of some PDFs, in order"""
+    # PyMuPDF is only needed for these render checks, so it is not a requirement
+    fitz = pytest.importorskip('fitz')
+    pages = []
+    for path in paths:
+        with fitz.open(path) as document:
+            assert not document.is_repaired
+            pages.extend(page.get_pixmap(dpi=36).samples for page in document)
+    return pages
+
+
+def merged(inputs, tmp_path, **options):
+    output_dir = tmp_path / 'merged'
+    output_dir.mkdir(exist_ok=True)
+    output = merge_pdfs(inputs, str(output_dir), **options)
+    assert output is not None
+    return output
+
+
+def test_merge_renders_like_its_inputs(inputs, tmp_path):
+    output = merged(inputs, tmp_path)
+
+    assert len(PdfReader(output, strict=True).pages) == 3 + PAGE_TREE_FANOUT + 5 + 2
+    assert rendered_pages([output]) == rendered_pages(inputs)
+
+
+def test_merge_shares_identical_streams(inputs, tmp_path):
+    shared = merged(inputs, tmp_path)
+    copied = merged(inputs, tmp_path, deduplicate=False)
+
+    assert PdfReader(shared).trailer['/Size'] < PdfReader(copied).trailer['/Size']
+    assert rendered_pages([shared]) == rendered_pages([copied])
+
+
+def test_memory_mapped_merge_renders_like_its_inputs(inputs, tmp_path):
+    output = merged(inputs, tmp_path, mmap_input=True)
+
+    assert rendered_pages([output]) == rendered_pages(inputs)
+
+
+def test_optimized_merge_renders_like_its_inputs(inputs, tmp_path):
+    output = merged(inputs, tmp_path, optimize=True, compression_level=9)
+
+    with open(output, 'rb') as f:
+        data = f.read()
+    assert b'/ObjStm' in data and b'/XRef' in data
+    assert rendered_pages([output]) == rendered_pages(inputs)
+
+
+@pytest.mark.parametrize('optimize', [False, True])
+def test_linearized_merge_renders_like_its_inputs(inputs, tmp_path, optimize):
+    from pdf_linearize import check_linearized
+    output = merged(inputs, tmp_path, linearize=True, optimize=optimize)
+
+    assert check_linearized(output) == []
+    assert rendered_pages([output]) == rendered_pages(inputs)
+    with pytest.importorskip('fitz').open(output) as document:
+        assert document.is_fast_webaccess